@@ -0,0 +1,10 @@
+"""
+Performance benchmark suite for the ADN v2 engine and the v3 contract gate.
+
+    python -m benchmarks                       # run everything, print a table
+    python -m benchmarks --json out.json       # also write machine-readable results
+    python -m benchmarks --baseline base.json  # fail (exit 1) on regressions
+
+See `benchmarks.harness` for the result format and comparison rules and
+`benchmarks.cases` for the registered workloads.
+"""
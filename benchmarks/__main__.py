@@ -0,0 +1,79 @@
+"""
+Command line entry point: `python -m benchmarks --help`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from . import cases  # noqa: E402,F401  (registers the benchmarks)
+from .harness import (  # noqa: E402
+    REGISTRY,
+    compare,
+    format_comparison,
+    format_result,
+    load_results,
+    run_benchmarks,
+    write_results,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="ADN benchmark suite")
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="glob on benchmark names (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    parser.add_argument("--quick", action="store_true", help="smaller workloads (smoke run)")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--repeat", type=int, default=5, help="best-of-N timing")
+    parser.add_argument("--json", metavar="PATH", help="write results to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against saved results")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown vs baseline before failing (0.25 = 25%%)")
+    ns = parser.parse_args(argv)
+
+    names = [
+        n for n in REGISTRY
+        if not ns.filter or any(fnmatch.fnmatchcase(n, pat) for pat in ns.filter)
+    ]
+    if ns.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        print("no benchmarks match", file=sys.stderr)
+        return 2
+
+    report = run_benchmarks(
+        names,
+        seed=ns.seed,
+        quick=ns.quick,
+        repeat=ns.repeat,
+        on_result=lambda name, r: print(format_result(name, r), flush=True),
+    )
+    if ns.json:
+        write_results(report, ns.json)
+
+    if ns.baseline:
+        baseline = load_results(ns.baseline)
+        if baseline["meta"].get("quick") != report["meta"]["quick"]:
+            print("warning: baseline and run differ in --quick", file=sys.stderr)
+        rows, regressions = compare(report, baseline, ns.tolerance)
+        print(f"\n{'benchmark':<44}{'base us':>10}{'now us':>10}{'ratio':>8}")
+        for row in rows:
+            print(format_comparison(row, ns.tolerance))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {ns.tolerance:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
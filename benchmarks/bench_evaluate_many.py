@@ -0,0 +1,90 @@
+"""
+Micro-benchmark: ADNv3.evaluate in a loop vs ADNv3.evaluate_many.
+
+Run from the repository root:
+
+    python benchmarks/bench_evaluate_many.py --requests 2000 --events 10
+
+Prints per-request cost for both paths and verifies the responses are
+byte-identical.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from adn_v3 import ADNv3  # noqa: E402
+
+
+def _make_requests(n: int, events_per_request: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    sources = ["local", "sentinel", "dqsn", "wallet_guard"]
+    types = ["rpc_abuse", "withdrawal_spike", "sentinel_alert", "dqsn_critical"]
+    return [
+        {
+            "contract_version": 3,
+            "component": "adn",
+            "request_id": f"bench-{i}",
+            "events": [
+                {
+                    "event_type": rng.choice(types),
+                    "severity": round(rng.random(), 3),
+                    "source": rng.choice(sources),
+                    "metadata": {"seq": j},
+                }
+                for j in range(events_per_request)
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--repeat", type=int, default=15, help="best-of-N timing")
+    ns = parser.parse_args(argv)
+
+    gate = ADNv3()
+    requests = _make_requests(ns.requests, ns.events, ns.seed)
+
+    looped = [gate.evaluate(r) for r in requests]
+    batched = gate.evaluate_many(requests)
+    if json.dumps(looped, sort_keys=True) != json.dumps(batched, sort_keys=True):
+        print("MISMATCH: evaluate_many differs from evaluate loop", file=sys.stderr)
+        return 1
+
+    loop_best = many_best = float("inf")
+    for _ in range(ns.repeat):
+        t0 = time.perf_counter()
+        for r in requests:
+            gate.evaluate(r)
+        t1 = time.perf_counter()
+        gate.evaluate_many(requests)
+        t2 = time.perf_counter()
+        loop_best = min(loop_best, t1 - t0)
+        many_best = min(many_best, t2 - t1)
+
+    loop_us = loop_best / ns.requests * 1e6
+    many_us = many_best / ns.requests * 1e6
+    print(f"requests={ns.requests} events/request={ns.events}")
+    print(f"evaluate loop : {loop_us:8.2f} us/request")
+    print(f"evaluate_many : {many_us:8.2f} us/request")
+    print(f"saved         : {loop_us - many_us:8.2f} us/request ({(1 - many_us / loop_us) * 100:.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""
+Memory benchmark: bytes retained per defense event.
+
+Compares three representations of the same event history:
+
+    legacy   – the pre-slots DefenseEvent (per-instance __dict__ plus an
+               empty metadata dict per event), reproduced here
+    slotted  – the current DefenseEvent (slots, still one dict per event)
+    compact  – CompactDefenseEvent (frozen, slots, shared EMPTY_METADATA)
+
+Run from the repository root:
+
+    python benchmarks/bench_event_memory.py --events 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from adn_v2.engine import evaluate_defense  # noqa: E402
+from adn_v2.models import CompactDefenseEvent, DefenseEvent, NodeDefenseState  # noqa: E402
+
+
+@dataclass
+class LegacyDefenseEvent:
+    event_type: str
+    severity: float
+    source: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+_TYPES = ["rpc_abuse", "withdrawal_spike", "sentinel_alert", "dqsn_critical"]
+_SOURCES = ["local", "sentinel", "dqsn", "wallet_guard"]
+
+
+def _measure(factory: Callable[[str, float, str], Any], n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    state = NodeDefenseState()
+    batch: List[Any] = []
+    for i in range(n):
+        batch.append(factory(_TYPES[i % 4], (i % 100) / 100, _SOURCES[i % 4]))
+        if len(batch) == 1000:
+            evaluate_defense(batch, state=state, now=0.0)
+            batch = []
+    if batch:
+        evaluate_defense(batch, state=state, now=0.0)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(state.active_events) == n
+    return (after - before) / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = [
+        ("legacy", LegacyDefenseEvent),
+        ("slotted", DefenseEvent),
+        ("compact", CompactDefenseEvent),
+    ]
+    baseline = None
+    print(f"{'representation':<16}{'bytes/event':>12}{'vs legacy':>12}")
+    for name, factory in rows:
+        per_event = _measure(factory, args.events)
+        baseline = baseline or per_event
+        print(f"{name:<16}{per_event:>12.1f}{per_event / baseline:>11.0%}")
+
+
+if __name__ == "__main__":
+    main()
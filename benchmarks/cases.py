@@ -0,0 +1,188 @@
+"""
+Registered benchmark cases (hot paths of the v2 engine and v3 gate).
+
+Names are `<area>.<path>[<params>]` and are stable: they key the JSON
+results and baselines, so renaming one drops it from comparisons.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+from typing import Any, Callable, List, Tuple
+
+from adn_v2.client import PooledADNClient
+from adn_v2.engine import ADNEngine, evaluate_defense
+from adn_v2.http_server import ADNHTTPServer
+from adn_v2.models import NodeDefenseConfig, NodeDefenseState
+from adn_v2.ratelimit import RpcRateLimiter
+from adn_v2.server import ADNServer
+from adn_v3 import ADNv3
+from adn_v3.contracts.v3_hash import canonical_sha256
+
+from . import workloads
+from .harness import benchmark
+
+Run = Tuple[Callable[[], Any], int]
+
+# -------------------------
+# v2 defense engine
+# -------------------------
+
+
+def _evaluate_defense_case(history: int) -> Callable[[random.Random, bool], Run]:
+    def setup(rng: random.Random, quick: bool) -> Run:
+        # The window is capped at `history`, so every timed call runs
+        # against a full window of that size (steady-state eviction).
+        config = NodeDefenseConfig(max_active_events=history)
+        state = NodeDefenseState()
+        evaluate_defense(workloads.defense_events(rng, history), config=config, state=state, now=0.0)
+        batches = [workloads.defense_events(rng, 10) for _ in range(100 if quick else 1000)]
+
+        def run() -> None:
+            for batch in batches:
+                evaluate_defense(batch, config=config, state=state, now=0.0)
+
+        return run, len(batches)
+
+    return setup
+
+
+for _history in (100, 1_000, 10_000, 100_000):
+    benchmark(f"v2.evaluate_defense[history={_history}]")(_evaluate_defense_case(_history))
+
+
+@benchmark("v2.process_raw_telemetry")
+def _process_raw_telemetry(rng: random.Random, quick: bool) -> Run:
+    engine = ADNEngine(node_id="bench-node")
+    samples = workloads.telemetry_samples(rng, 500 if quick else 5000)
+
+    def run() -> None:
+        for raw in samples:
+            engine.process_raw_telemetry(raw)
+
+    return run, len(samples)
+
+
+@benchmark("v2.process_raw_batch")
+def _process_raw_batch(rng: random.Random, quick: bool) -> Run:
+    engine = ADNEngine(node_id="bench-node")
+    samples = workloads.telemetry_samples(rng, 500 if quick else 5000)
+    return (lambda: engine.process_raw_batch(samples)), len(samples)
+
+
+@benchmark("v2.rpc_rate_limiter[clients=100000]")
+def _rpc_rate_limiter(rng: random.Random, quick: bool) -> Run:
+    # LRU smaller than the client population, so misses also evict.
+    limiter = RpcRateLimiter(max_clients=50_000)
+    clients = [f"10.{i >> 16}.{(i >> 8) & 255}.{i & 255}" for i in range(100_000)]
+    calls = [rng.choice(clients) for _ in range(20_000 if quick else 200_000)]
+    allow = limiter.allow
+
+    def run() -> None:
+        for c in calls:
+            allow(c)
+
+    return run, len(calls)
+
+
+# -------------------------
+# v3 contract gate
+# -------------------------
+
+
+def _v3_evaluate_case(events: int, meta_bytes: int) -> Callable[[random.Random, bool], Run]:
+    def setup(rng: random.Random, quick: bool) -> Run:
+        gate = ADNv3()
+        n = max(5, (2000 if not quick else 200) // events)
+        requests = [workloads.v3_request(rng, i, events, meta_bytes) for i in range(n)]
+
+        def run() -> None:
+            for r in requests:
+                gate.evaluate(r)
+
+        return run, n
+
+    return setup
+
+
+for _events in (1, 50, 200):
+    for _meta in (0, 256, 4096):
+        benchmark(f"v3.evaluate[events={_events},meta={_meta}]")(_v3_evaluate_case(_events, _meta))
+
+
+@benchmark("v3.evaluate_many[events=10]")
+def _v3_evaluate_many(rng: random.Random, quick: bool) -> Run:
+    gate = ADNv3()
+    requests = [workloads.v3_request(rng, i, 10, 0) for i in range(200 if quick else 2000)]
+    return (lambda: gate.evaluate_many(requests)), len(requests)
+
+
+def _canonical_sha256_case(size: int) -> Callable[[random.Random, bool], Run]:
+    def setup(rng: random.Random, quick: bool) -> Run:
+        payload = workloads.nested_payload(rng, size)
+        reps = 3 if quick else 20
+
+        def run() -> None:
+            for _ in range(reps):
+                canonical_sha256(payload)
+
+        return run, reps
+
+    return setup
+
+
+for _size in (64 * 1024, 1024 * 1024):
+    benchmark(f"v3.canonical_sha256[bytes={_size}]")(_canonical_sha256_case(_size))
+
+
+# -------------------------
+# Server round-trips
+# -------------------------
+
+
+@benchmark("server.handle_raw_request[telemetry]")
+def _server_in_process(rng: random.Random, quick: bool) -> Run:
+    server = ADNServer(ADNEngine(node_id="bench-node"))
+    bodies = [
+        json.dumps({"type": "telemetry", "data": s})
+        for s in workloads.telemetry_samples(rng, 500 if quick else 5000)
+    ]
+
+    def run() -> None:
+        for body in bodies:
+            server.handle_raw_request(body)
+
+    return run, len(bodies)
+
+
+class _HTTPRoundTrip:
+    """Loopback ADNHTTPServer on a background loop + a pooled client."""
+
+    def __init__(self, samples: List[dict]) -> None:
+        self.samples = samples
+        self.http = ADNHTTPServer(ADNServer(ADNEngine(node_id="bench-node")), host="127.0.0.1", port=0)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.http.start(), self.loop).result(5)
+        self.client = PooledADNClient(f"http://127.0.0.1:{self.http.port}", pool_size=1)
+
+    def __call__(self) -> None:
+        for s in self.samples:
+            self.client.send_telemetry(s)
+
+    def close(self) -> None:
+        self.client.close()
+        asyncio.run_coroutine_threadsafe(self.http.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+
+@benchmark("server.http_round_trip[telemetry]")
+def _server_http(rng: random.Random, quick: bool) -> Run:
+    samples = workloads.telemetry_samples(rng, 50 if quick else 500)
+    return _HTTPRoundTrip(samples), len(samples)
@@ -0,0 +1,178 @@
+"""
+Benchmark harness: registry, timing loop, JSON results, baseline comparison.
+
+A benchmark is a setup function registered with `@benchmark(name)`. It
+receives a seeded `random.Random` and the `quick` flag, builds its
+workload, and returns `(run, ops)`: `run()` performs `ops` operations of
+the measured hot path. Setup cost is never timed.
+
+Results are reported per operation (best of `repeat` runs, plus median)
+so numbers stay comparable when a workload size changes with `quick`.
+
+Result file format (also used for baselines):
+
+    {
+      "meta":    {"python": ..., "platform": ..., "seed": ..., "quick": ...},
+      "results": {"<name>": {"ops": N, "best_s": ..., "median_s": ..., "us_per_op": ...}}
+    }
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+Setup = Callable[[random.Random, bool], Tuple[Callable[[], Any], int]]
+
+REGISTRY: Dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Register a benchmark setup function under `name`."""
+
+    def register(setup: Setup) -> Setup:
+        if name in REGISTRY:
+            raise ValueError(f"duplicate benchmark name: {name!r}")
+        REGISTRY[name] = setup
+        return setup
+
+    return register
+
+
+@dataclass
+class BenchResult:
+    ops: int
+    best_s: float
+    median_s: float
+
+    @property
+    def us_per_op(self) -> float:
+        return self.best_s / self.ops * 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["us_per_op"] = self.us_per_op
+        return d
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_us: float
+    current_us: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_us / self.baseline_us if self.baseline_us else float("inf")
+
+
+def measure(run: Callable[[], Any], ops: int, repeat: int = 5, warmup: int = 1) -> BenchResult:
+    """Time `run()` `repeat` times (GC disabled while timing)."""
+    if repeat < 1:
+        raise ValueError("repeat must be >= 1")
+    for _ in range(warmup):
+        run()
+    timings: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            t0 = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - t0)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return BenchResult(ops=ops, best_s=min(timings), median_s=statistics.median(timings))
+
+
+def run_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    *,
+    seed: int = 1337,
+    quick: bool = False,
+    repeat: int = 5,
+    on_result: Optional[Callable[[str, BenchResult], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the selected benchmarks (all registered ones by default).
+
+    Every benchmark gets its own `random.Random(seed)`, so workloads do
+    not depend on which other benchmarks were selected.
+    """
+    selected = list(REGISTRY) if names is None else list(names)
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in selected:
+        setup = REGISTRY[name]
+        run, ops = setup(random.Random(seed), quick)
+        try:
+            result = measure(run, ops, repeat=repeat)
+        finally:
+            close = getattr(run, "close", None)
+            if close is not None:
+                close()
+        results[name] = result.to_dict()
+        if on_result is not None:
+            on_result(name, result)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "quick": quick,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def write_results(report: Dict[str, Any], path: Union[str, Path]) -> None:
+    Path(path).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, Any]:
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if "results" not in report:
+        raise ValueError(f"{path}: not a benchmark result file")
+    return report
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25
+) -> Tuple[List[Comparison], List[Comparison]]:
+    """
+    Compare per-op times of `report` against `baseline`.
+
+    Returns (all comparisons, regressions); a benchmark regresses when it
+    is more than `tolerance` (fractional) slower than the baseline.
+    Benchmarks missing from either side are ignored.
+    """
+    if tolerance < 0:
+        raise ValueError("tolerance must be >= 0")
+    rows: List[Comparison] = []
+    for name, current in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        rows.append(Comparison(name, base["us_per_op"], current["us_per_op"]))
+    regressions = [c for c in rows if c.ratio > 1.0 + tolerance]
+    return rows, regressions
+
+
+def format_result(name: str, result: BenchResult) -> str:
+    return f"{name:<44}{result.us_per_op:>12.2f} us/op{result.ops:>9} ops"
+
+
+def format_comparison(c: Comparison, tolerance: float) -> str:
+    flag = "REGRESSION" if c.ratio > 1.0 + tolerance else ""
+    return f"{c.name:<44}{c.baseline_us:>10.2f}{c.current_us:>10.2f}{c.ratio:>8.2f}x  {flag}"
+
@@ -0,0 +1,156 @@
+"""
+Load test: throughput and latency of the asyncio HTTP front end.
+
+Starts a local ADNHTTPServer (or targets an existing one with --host /
+--port) and drives it with keep-alive connections:
+
+    python benchmarks/load_test_http.py --connections 32 --requests 200
+    python benchmarks/load_test_http.py --route evaluate --pipeline 8
+
+Each connection sends `--requests` requests, keeping up to `--pipeline`
+of them in flight. Prints requests/second and p50/p99/max latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from adn_v2.engine import ADNEngine  # noqa: E402
+from adn_v2.http_server import ADNHTTPServer  # noqa: E402
+from adn_v2.server import ADNServer  # noqa: E402
+
+
+def _payload(route: str, i: int, rng: random.Random) -> Tuple[str, bytes]:
+    if route == "telemetry":
+        body = {
+            "type": "telemetry",
+            "data": {
+                "height": 1_000_000 + i,
+                "mempool_size": rng.randint(0, 40_000),
+                "peer_count": rng.randint(0, 16),
+            },
+        }
+        return "/telemetry", json.dumps(body).encode()
+    body = {
+        "contract_version": 3,
+        "component": "adn",
+        "request_id": f"load-{i}",
+        "events": [
+            {"event_type": "rpc_abuse", "severity": round(rng.random(), 3), "source": "local"}
+            for _ in range(10)
+        ],
+    }
+    return "/evaluate", json.dumps(body).encode()
+
+
+def _encode(path: str, body: bytes) -> bytes:
+    return (
+        f"POST {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+
+async def _read_status(reader: asyncio.StreamReader) -> int:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(lines[0].split(" ")[1])
+
+
+async def _connection(
+    host: str, port: int, route: str, n: int, depth: int, seed: int, latencies: List[float]
+) -> int:
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at: "asyncio.Queue[float]" = asyncio.Queue(maxsize=depth)
+    errors = 0
+
+    async def send() -> None:
+        for i in range(n):
+            path, body = _payload(route, i, rng)
+            await sent_at.put(time.perf_counter())
+            writer.write(_encode(path, body))
+            await writer.drain()
+
+    sender = asyncio.ensure_future(send())
+    for _ in range(n):
+        status = await _read_status(reader)
+        latencies.append(time.perf_counter() - await sent_at.get())
+        if status != 200:
+            errors += 1
+    await sender
+    writer.close()
+    return errors
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+async def _run(args: argparse.Namespace) -> None:
+    http = None
+    host, port = args.host, args.port
+    if port is None:
+        http = ADNHTTPServer(ADNServer(ADNEngine(node_id="load-test")), port=0)
+        await http.start()
+        host, port = "127.0.0.1", http.port
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(
+        *(
+            _connection(host, port, args.route, args.requests, args.pipeline, args.seed + c, latencies)
+            for c in range(args.connections)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    if http is not None:
+        await http.close()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"route:        /{args.route}")
+    print(f"connections:  {args.connections} (pipeline depth {args.pipeline})")
+    print(f"requests:     {total} in {elapsed:.2f}s, non-200: {sum(errors)}")
+    print(f"throughput:   {total / elapsed:,.0f} req/s")
+    print(
+        "latency ms:   "
+        f"p50 {_percentile(latencies, 0.50) * 1e3:.2f}  "
+        f"p99 {_percentile(latencies, 0.99) * 1e3:.2f}  "
+        f"max {latencies[-1] * 1e3:.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--route", choices=["telemetry", "evaluate"], default="telemetry")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="per connection")
+    parser.add_argument("--pipeline", type=int, default=1, help="in-flight requests per connection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="target an existing server")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
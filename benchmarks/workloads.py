@@ -0,0 +1,85 @@
+"""
+Seeded workload generators shared by the benchmark cases.
+
+Everything here takes an explicit `random.Random`, so the same seed
+always produces byte-identical inputs.
+"""
+
+from __future__ import annotations
+
+import random
+import string
+from typing import Any, Dict, List
+
+from adn_v2.models import DefenseEvent
+
+EVENT_TYPES = ["rpc_abuse", "withdrawal_spike", "sentinel_alert", "dqsn_critical"]
+SOURCES = ["local", "sentinel", "dqsn", "wallet_guard"]
+
+
+def metadata(rng: random.Random, approx_bytes: int) -> Dict[str, Any]:
+    """Flat metadata dict whose canonical JSON is roughly `approx_bytes` long."""
+    meta: Dict[str, Any] = {}
+    size = 2
+    i = 0
+    while size < approx_bytes:
+        value = "".join(rng.choices(string.ascii_lowercase, k=24))
+        meta[f"k{i:04d}"] = value
+        size += len(value) + 12
+        i += 1
+    return meta
+
+
+def defense_events(rng: random.Random, n: int) -> List[DefenseEvent]:
+    return [
+        DefenseEvent(rng.choice(EVENT_TYPES), round(rng.random(), 3), rng.choice(SOURCES))
+        for _ in range(n)
+    ]
+
+
+def v3_request(rng: random.Random, i: int, events: int, meta_bytes: int) -> Dict[str, Any]:
+    return {
+        "contract_version": 3,
+        "component": "adn",
+        "request_id": f"bench-{i}",
+        "events": [
+            {
+                "event_type": rng.choice(EVENT_TYPES),
+                "severity": round(rng.random(), 3),
+                "source": rng.choice(SOURCES),
+                "metadata": metadata(rng, meta_bytes) if meta_bytes else {},
+            }
+            for _ in range(events)
+        ],
+    }
+
+
+def nested_payload(rng: random.Random, approx_bytes: int) -> Dict[str, Any]:
+    """Nested dict/list payload (mixed types) for canonical hashing."""
+    payload: Dict[str, Any] = {"version": 3, "items": []}
+    size = 0
+    i = 0
+    while size < approx_bytes:
+        item = {
+            "id": i,
+            "score": rng.random(),
+            "label": "".join(rng.choices(string.ascii_letters, k=16)),
+            "tags": [rng.choice(SOURCES) for _ in range(4)],
+            "nested": {"ok": rng.random() < 0.5, "n": rng.randint(0, 1 << 30), "note": None},
+        }
+        payload["items"].append(item)
+        size += 190
+        i += 1
+    return payload
+
+
+def telemetry_samples(rng: random.Random, n: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "height": 18_000_000 + i,
+            "mempool_size": rng.choice([rng.randint(0, 15_000), rng.randint(20_001, 60_000)]),
+            "peer_count": rng.randint(0, 16),
+            "timestamp": 1_700_000_000 + i,
+        }
+        for i in range(n)
+    ]
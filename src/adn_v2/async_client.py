@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import weakref
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+
+from .client import ADNClient
+from .models import PolicyDecision
+
+
+"""
+Async ADN client – concurrent notifications over asyncio
+
+ADNClient talks to the central ADN service, DQSN and Sentinel one call
+at a time. When ADN escalates it usually notifies both DQSN and
+Sentinel, and sequential calls put the *sum* of their latencies on the
+alerting path. AsyncADNClient keeps the same surface as coroutines and
+adds `notify_all`, which fans out to several targets concurrently so
+the alert costs the *slowest* target, not the total.
+"""
+
+# Target name → path, mirroring ADNClient.
+TARGET_PATHS: Dict[str, str] = {
+    "telemetry": "/telemetry",
+    "dqsn": "/dqsn",
+    "sentinel": "/sentinel",
+}
+
+# Statuses worth retrying: the server declined the request without acting
+# on it, so it may succeed a moment later.
+_RETRY_STATUSES = frozenset({429, 503})
+
+# Largest response body accepted (Content-Length or decoded chunked size).
+_MAX_BODY = 16 * 1024 * 1024
+
+
+class MalformedResponseError(URLError):
+    """The server's reply could not be parsed as an HTTP/1.1 JSON response."""
+
+
+class AsyncADNClient:
+    """
+    Asyncio counterpart of ADNClient (stdlib only).
+
+    - `timeout` applies to each attempt; `target_timeouts` overrides it
+      per target ("telemetry", "dqsn", "sentinel").
+    - At most `max_in_flight` requests are outstanding at once, per event
+      loop.
+    - Failures to connect and 429/503 replies are retried up to `retries`
+      times with full-jitter exponential backoff
+      (sleep uniform(0, min(max_backoff, backoff * 2**attempt))).
+      Once the request bytes have been sent, a timeout or dropped
+      connection is raised instead of retried: the POST may already
+      have been acted on. Other non-2xx replies raise urllib's HTTPError
+      and unparseable replies raise MalformedResponseError (a URLError).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout: float = 10.0,
+        target_timeouts: Optional[Dict[str, float]] = None,
+        max_in_flight: int = 8,
+        retries: int = 2,
+        backoff: float = 0.05,
+        max_backoff: float = 1.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if retries < 0:
+            raise ValueError("retries must be >= 0")
+
+        self.base_url = base_url.rstrip("/")
+        parts = urlsplit(self.base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {parts.scheme!r}")
+        self._ssl = parts.scheme == "https"
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port or (443 if self._ssl else 80)
+        self._netloc = parts.netloc
+        self._path_prefix = parts.path
+
+        self.timeout = timeout
+        self.target_timeouts = dict(target_timeouts or {})
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._rng = rng or random.Random()
+        # asyncio primitives bind to one loop, so keep a semaphore per loop.
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    # -------------------------
+    # Public surface
+    # -------------------------
+
+    async def send_telemetry(self, telemetry: Dict[str, Any]) -> PolicyDecision:
+        response = await self._call("telemetry", {"type": "telemetry", "data": telemetry})
+        return ADNClient._decision(response)
+
+    async def notify_dqsn(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return await self._call("dqsn", message)
+
+    async def notify_sentinel(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return await self._call("sentinel", message)
+
+    async def notify_all(
+        self,
+        message: Dict[str, Any],
+        targets: Iterable[str] = ("dqsn", "sentinel"),
+    ) -> Dict[str, Union[Dict[str, Any], BaseException]]:
+        """
+        Send `message` to every target concurrently.
+
+        Returns a dict target → response. A target that still fails after
+        its retries maps to the exception instead, so one unreachable
+        target never hides the others' results.
+        """
+        names = list(targets)
+        results = await asyncio.gather(
+            *(self._call(name, message) for name in names), return_exceptions=True
+        )
+        return dict(zip(names, results, strict=True))
+
+    # -------------------------
+    # Transport
+    # -------------------------
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        return semaphore
+
+    async def _call(self, target: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        path = TARGET_PATHS[target]
+        url = f"{self.base_url}{path}"
+        timeout = self.target_timeouts.get(target, self.timeout)
+        body = json.dumps(payload).encode("utf-8")
+        semaphore = self._semaphore()
+        loop = asyncio.get_running_loop()
+
+        attempt = 0
+        while True:
+            async with semaphore:
+                deadline = loop.time() + timeout
+                try:
+                    reader, writer = await asyncio.wait_for(self._connect(), timeout)
+                except (asyncio.TimeoutError, OSError) as e:
+                    # Nothing was sent yet, so the attempt is safe to repeat.
+                    error: BaseException = e
+                else:
+                    try:
+                        status, reason, raw = await asyncio.wait_for(
+                            self._exchange(reader, writer, path, body), deadline - loop.time()
+                        )
+                    finally:
+                        writer.close()
+                    if 200 <= status < 300:
+                        return _json_body(raw, url)
+                    error = HTTPError(url, status, reason, None, None)  # type: ignore[arg-type]
+                    if status not in _RETRY_STATUSES:
+                        raise error
+
+            if attempt >= self.retries:
+                raise error
+            cap = min(self.max_backoff, self.backoff * (2 ** attempt))
+            # Sleep outside the semaphore so waiting retries don't hold slots.
+            await asyncio.sleep(self._rng.uniform(0, cap))
+            attempt += 1
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(self._host, self._port, ssl=self._ssl or None)
+
+    async def _exchange(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str, body: bytes
+    ) -> Tuple[int, str, bytes]:
+        url = f"{self.base_url}{path}"
+        writer.write(
+            (
+                f"POST {self._path_prefix}{path} HTTP/1.1\r\n"
+                f"Host: {self._netloc}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError as e:
+            raise MalformedResponseError(f"response headers too large from {url}") from e
+        lines = head.decode("latin-1").split("\r\n")
+        version, _, rest = lines[0].partition(" ")
+        status_text, _, reason = rest.partition(" ")
+        if not version.startswith("HTTP/") or not (status_text.isdigit() and len(status_text) == 3):
+            raise MalformedResponseError(f"bad status line from {url}: {lines[0]!r}")
+
+        length: Optional[int] = None
+        chunked = False
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                value = value.strip()
+                if not value.isdigit() or int(value) > _MAX_BODY:
+                    raise MalformedResponseError(f"bad Content-Length from {url}: {value!r}")
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = value.strip().lower() == "chunked"
+
+        # Transfer-Encoding wins over Content-Length (RFC 9112 §6.3).
+        if chunked:
+            raw = await _read_chunked(reader, url)
+        elif length is not None:
+            raw = await reader.readexactly(length)
+        else:
+            raw = await reader.read(_MAX_BODY + 1)  # Connection: close → body ends at EOF
+            if len(raw) > _MAX_BODY:
+                raise MalformedResponseError(f"response body too large from {url}")
+        return int(status_text), reason, raw
+
+
+async def _read_chunked(reader: asyncio.StreamReader, url: str) -> bytes:
+    body = bytearray()
+    while True:
+        size_line = await reader.readline()
+        size_text = size_line.split(b";", 1)[0].strip()
+        try:
+            size = int(size_text, 16)
+        except ValueError:
+            size = -1
+        if size < 0 or len(body) + size > _MAX_BODY or not size_line.endswith(b"\n"):
+            raise MalformedResponseError(f"bad chunk size from {url}: {size_line[:32]!r}")
+        if size == 0:
+            # Skip trailer fields up to the terminating blank line.
+            while (await reader.readline()).strip():
+                pass
+            return bytes(body)
+        body += await reader.readexactly(size)
+        if (await reader.readexactly(2)) != b"\r\n":
+            raise MalformedResponseError(f"bad chunk framing from {url}")
+
+
+def _json_body(raw: bytes, url: str) -> Dict[str, Any]:
+    try:
+        result: Dict[str, Any] = json.loads(raw.decode("utf-8"))
+    except ValueError as e:  # includes UnicodeDecodeError
+        raise MalformedResponseError(f"response from {url} is not JSON") from e
+    return result
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import http.client
 import json
+import queue
+import select
+import threading
 from dataclasses import asdict
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
 from urllib.request import Request, urlopen
 
 from .models import PolicyDecision
@@ -33,6 +39,10 @@ class ADNClient:
 
     def send_telemetry(self, telemetry: Dict[str, Any]) -> PolicyDecision:
         response = self._post("/telemetry", {"type": "telemetry", "data": telemetry})
+        return self._decision(response)
+
+    @staticmethod
+    def _decision(response: Dict[str, Any]) -> PolicyDecision:
         return PolicyDecision(
             level=response["level"],
             score=response["score"],
@@ -45,3 +55,233 @@ class ADNClient:
 
     def notify_sentinel(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         return self._post("/sentinel", message)
+
+
+# Errors raised while *sending* on a reused keep-alive connection the peer
+# already closed: the request never got through, so it is retried once on a
+# fresh connection. Failures after the request was sent (e.g.
+# RemoteDisconnected while waiting for the response) are never retried,
+# since the server may already have acted on the POST.
+_UNSENT_ERRORS = (
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def _is_dropped(conn: http.client.HTTPConnection) -> bool:
+    # An idle keep-alive socket that is readable has either been closed by
+    # the peer (EOF) or holds unsolicited data; neither is safe to reuse.
+    sock = conn.sock
+    if sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class PooledADNClient(ADNClient):
+    """
+    ADNClient variant that keeps persistent HTTP/1.1 connections.
+
+    Connections are pooled per host (scheme + netloc) and reused across
+    `send_telemetry`, `notify_dqsn` and `notify_sentinel`, so steady-state
+    traffic pays no TCP handshake per call. Up to `pool_size` idle
+    connections are kept per host; extra concurrent callers open
+    short-lived connections instead of blocking. Safe to share between
+    threads.
+
+    Idle connections the server has closed are discarded at checkout. A
+    POST is only retried when it failed before reaching the server; once
+    the request bytes are sent, errors propagate to the caller rather than
+    risk delivering a sample twice.
+
+    Batching mode (`batch_size > 1`) lets callers `queue_telemetry`
+    samples; every `batch_size` samples are coalesced into one POST to
+    /telemetry/batch. `flush()` sends whatever is still buffered. If the
+    batch could not be sent at all (connection refused, stale socket),
+    the samples stay buffered for the next full batch or `flush()`; at
+    most `max_buffered` are kept, the oldest are dropped first and counted
+    in `dropped_samples`. Once the request has gone out, the batch leaves
+    the buffer whatever the outcome (timeout, disconnect, HTTP error), so
+    a sample is never delivered twice.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        pool_size: int = 4,
+        timeout: Optional[float] = 10.0,
+        batch_size: int = 1,
+        max_buffered: int = 10_000,
+    ) -> None:
+        super().__init__(base_url)
+        if pool_size < 1:
+            raise ValueError("pool_size must be >= 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if max_buffered < batch_size:
+            raise ValueError("max_buffered must be >= batch_size")
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.max_buffered = max_buffered
+        self.dropped_samples = 0
+
+        parts = urlsplit(self.base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {parts.scheme!r}")
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._path_prefix = parts.path
+
+        self._pools: Dict[Tuple[str, str], "queue.LifoQueue[http.client.HTTPConnection]"] = {}
+        self._pools_lock = threading.Lock()
+        self._batch: List[Dict[str, Any]] = []
+        self._batch_lock = threading.Lock()
+
+    # -------------------------
+    # Connection pool
+    # -------------------------
+
+    def _pool(self, key: Tuple[str, str]) -> "queue.LifoQueue[http.client.HTTPConnection]":
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._pools_lock:
+                pool = self._pools.setdefault(key, queue.LifoQueue(maxsize=self.pool_size))
+        return pool
+
+    def _new_connection(self, key: Tuple[str, str]) -> http.client.HTTPConnection:
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _checkout(self, key: Tuple[str, str]) -> Tuple[http.client.HTTPConnection, bool]:
+        pool = self._pool(key)
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                return self._new_connection(key), False
+            if not _is_dropped(conn):
+                return conn, True
+            conn.close()
+
+    def _checkin(self, key: Tuple[str, str], conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool(key).put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        """Close every idle pooled connection."""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def __enter__(self) -> "PooledADNClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -------------------------
+    # Transport
+    # -------------------------
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._receive(self._send(path, payload), path)
+
+    def _send(self, path: str, payload: Dict[str, Any]) -> http.client.HTTPConnection:
+        # Connect and write the request. An error raised here means the
+        # server never received a complete request.
+        key = (self._scheme, self._netloc)
+        url = f"{self._path_prefix}{path}"
+        data = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        conn, reused = self._checkout(key)
+        try:
+            try:
+                conn.request("POST", url, body=data, headers=headers)
+            except _UNSENT_ERRORS:
+                if not reused:
+                    raise
+                conn.close()
+                conn = self._new_connection(key)
+                conn.request("POST", url, body=data, headers=headers)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _receive(self, conn: http.client.HTTPConnection, path: str) -> Dict[str, Any]:
+        # Read the answer to a request `_send` wrote; never retried.
+        try:
+            resp = conn.getresponse()
+            raw = resp.read()
+        except BaseException:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin((self._scheme, self._netloc), conn)
+
+        if not 200 <= resp.status < 300:
+            raise HTTPError(f"{self.base_url}{path}", resp.status, resp.reason, resp.headers, None)
+        result: Dict[str, Any] = json.loads(raw.decode("utf-8"))
+        return result
+
+    # -------------------------
+    # Batching
+    # -------------------------
+
+    def send_telemetry_batch(self, samples: List[Dict[str, Any]]) -> List[PolicyDecision]:
+        """Send several samples in one request; decisions come back in order."""
+        if not samples:
+            return []
+        response = self._post("/telemetry/batch", {"type": "telemetry_batch", "data": samples})
+        return [self._decision(r) for r in response["results"]]
+
+    def queue_telemetry(self, telemetry: Dict[str, Any]) -> List[PolicyDecision]:
+        """
+        Buffer a sample. When the buffer reaches `batch_size` it is sent
+        and the decisions for the whole buffer are returned; otherwise the
+        result is an empty list.
+        """
+        with self._batch_lock:
+            if len(self._batch) >= self.max_buffered:
+                del self._batch[0]
+                self.dropped_samples += 1
+            self._batch.append(telemetry)
+            if len(self._batch) < self.batch_size:
+                return []
+            return self._send_buffered()
+
+    def flush(self) -> List[PolicyDecision]:
+        """Send any buffered samples now."""
+        with self._batch_lock:
+            return self._send_buffered()
+
+    def _send_buffered(self) -> List[PolicyDecision]:
+        # Caller holds _batch_lock, so batches go out one at a time. The
+        # buffer survives only failures that prove nothing was sent.
+        if not self._batch:
+            return []
+        path = "/telemetry/batch"
+        conn = self._send(path, {"type": "telemetry_batch", "data": self._batch})
+        self._batch = []
+        response = self._receive(conn, path)
+        return [self._decision(r) for r in response["results"]]
@@ -1,23 +1,26 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
 from .actions import ActionExecutor
 from .models import (
     NodeState,
     PolicyDecision,
     RiskSignal,
+    TelemetryBatch,
     TelemetryPacket,
-    DefenseEvent,
+    AnyDefenseEvent,
     DefenseAction,
     NodeDefenseConfig,
     NodeDefenseState,
     LockdownState,
     RiskLevel,
+    EventGroupStats,
 )
 from .policy import PolicyEngine
 from .telemetry import TelemetryAdapter
-from .validator import RiskValidator
+from .validator import RiskValidator, signals_from_code
 
 
 class ADNEngine:
@@ -85,11 +88,112 @@ class ADNEngine:
         self.state.last_decision = decision
         return decision
 
+    def process_raw_batch(self, raws: Iterable[Dict[str, object]]) -> List[PolicyDecision]:
+        """
+        Batch counterpart of `process_raw_telemetry` for a burst of samples.
+        """
+        batch = self.telemetry_adapter.from_raw_batch(self.state.node_id, raws)
+        return self.process_batch(batch)
+
+    def process_batch(self, batch: TelemetryBatch) -> List[PolicyDecision]:
+        """
+        Run the pipeline for every row of a TelemetryBatch, in order.
+
+        Signals come from the validator's columnar `derive_signal_codes`
+        path, so no TelemetryPacket is built per row. The executor context
+        therefore carries {"batch": batch, "row": i} instead of "packet";
+        executors that need the packet can call `batch.packet(row)`.
+
+        Decisions and the final NodeState match calling `process_packet`
+        on each row's packet.
+        """
+        decisions: List[PolicyDecision] = []
+        for row, signals in enumerate(iter_batch_signals(self.validator, batch)):
+            decision = self.policy_engine.decide(signals)
+
+            context: Dict[str, Any] = {"batch": batch, "row": row, "node_state": {}}
+            self.action_executor.execute(decision, context)
+
+            if context["node_state"].get("hardened"):
+                self.state.hardened_mode = True
+
+            self.state.last_decision = decision
+            decisions.append(decision)
+        return decisions
+
+
+def iter_batch_signals(validator: RiskValidator, batch: TelemetryBatch) -> Iterator[List[RiskSignal]]:
+    """
+    Yield the RiskSignal list for each row of `batch`.
+
+    Rows are classified in one vectorized pass; signal lists are built
+    once per distinct code and shared between rows, so callers must not
+    mutate them. Validators whose scalar heuristics the codes cannot
+    reproduce (see `_codes_match_scalar`) are evaluated row by row.
+    """
+    if not _codes_match_scalar(validator):
+        for row in range(len(batch)):
+            yield validator.derive_signals(batch.packet(row))
+        return
+
+    codes = validator.derive_signal_codes(batch.peer_count, batch.mempool_size, batch.height)
+    memo: Dict[int, List[RiskSignal]] = {}
+    for code in codes:
+        code = int(code)
+        signals = memo.get(code)
+        if signals is None:
+            signals = memo[code] = signals_from_code(code)
+        yield signals
+
+
+def _codes_match_scalar(validator: RiskValidator) -> bool:
+    # derive_signals overridden: its signals are not expressible as codes.
+    # signal_code overridden: only trusted if derive_signal_codes is too.
+    cls = type(validator)
+    if getattr(cls, "derive_signals", None) is not RiskValidator.derive_signals:
+        return False
+    return (
+        getattr(cls, "signal_code", None) is RiskValidator.signal_code
+        or getattr(cls, "derive_signal_codes", None) is not RiskValidator.derive_signal_codes
+    )
+
+
+def _evict_expired(state: NodeDefenseState, config: NodeDefenseConfig, now: float) -> bool:
+    """
+    Apply the config's sliding-window bounds to `state`.
+
+    Returns True when at least one event was evicted. Each eviction is
+    O(1) and updates the running aggregates incrementally.
+    """
+    evicted = False
+
+    max_count = config.max_active_events
+    if max_count is not None:
+        excess = len(state.active_events) - max_count
+        if excess > 0:
+            state.evict(excess)
+            evicted = True
+
+    max_age = config.max_event_age
+    if max_age is not None:
+        cutoff = now - max_age
+        expired = 0
+        for t in state.event_times:
+            if t >= cutoff:
+                break
+            expired += 1
+        if expired:
+            state.evict(expired)
+            evicted = True
+
+    return evicted
+
 
 def evaluate_defense(
-    events: List[DefenseEvent],
+    events: Sequence[AnyDefenseEvent],
     config: Optional[NodeDefenseConfig] = None,
     state: Optional[NodeDefenseState] = None,
+    now: Optional[float] = None,
 ) -> NodeDefenseState:
     """
     v2 defense decision engine for lockdown behaviour.
@@ -104,6 +208,10 @@ def evaluate_defense(
 
     The logic is intentionally simple and transparent so DigiByte devs,
     node operators and exchanges can audit and tune it.
+
+    `now` is the arrival time (seconds, wall clock) stamped on the batch
+    and used for age-based eviction when `config.max_event_age` is set.
+    It defaults to time.time(); replays should pass recorded timestamps.
     """
     if config is None:
         config = NodeDefenseConfig()
@@ -111,18 +219,108 @@ def evaluate_defense(
     if state is None:
         state = NodeDefenseState()
 
-    if not events:
+    if now is None:
+        now = time.time()
+
+    # Decayed scores move with time alone, so every call re-evaluates.
+    if not _ingest(events, config, state, now) and config.scoring != "decay":
         # Nothing new: keep existing state, clear last_actions.
         state.last_actions = []
         return state
 
-    # Merge new events into active list.
-    state.active_events.extend(events)
+    state.last_actions = _apply_thresholds(state, config, risk_score(state, config, now))
+    return state
+
+
+def risk_score(state: NodeDefenseState, config: NodeDefenseConfig, now: float) -> float:
+    """
+    Score compared against the lockdown thresholds.
+
+    "mean": mean severity of the active window, source-weighted when
+    `config.source_weights` is set. "decay": the time-decayed mean at
+    `now` (source weights are applied as events are folded in).
+    """
+    if config.scoring == "decay":
+        return state.decayed_score(now, config.decay_half_life)
+    if config.source_weights:
+        return state.weighted_avg_severity(config.source_weights)
+    return state.avg_severity
+
+
+def _ingest(
+    events: Sequence[AnyDefenseEvent],
+    config: NodeDefenseConfig,
+    state: NodeDefenseState,
+    now: float,
+) -> bool:
+    """
+    Fold `events` into the active window and apply the window bounds.
+
+    Returns False when the call changes nothing (no events, no
+    evictions). Only the window and scoring settings of `config` are
+    used, so the result is shared by every config with the same window.
+    """
+    # Merge new events into active window and fold them into the running
+    # aggregates: O(len(events)) per call, independent of history size.
+    if events:
+        state.active_events.extend(events)
+        state.event_times.extend([now] * len(events))
+        sources = state.source_stats
+        event_types = state.event_type_stats
+        total = state.severity_sum
+        sq_total = state.severity_sq_sum
+        for e in events:
+            sev = e.severity
+            total += sev
+            sq_total += sev * sev
+            # Per-source / per-event_type tables, inlined (hot path).
+            g = sources.get(e.source)
+            if g is None:
+                g = sources[e.source] = EventGroupStats()
+            g.count += 1
+            g.severity_sum += sev
+            if now > g.last_seen:
+                g.last_seen = now
+            g = event_types.get(e.event_type)
+            if g is None:
+                g = event_types[e.event_type] = EventGroupStats()
+            g.count += 1
+            g.severity_sum += sev
+            if now > g.last_seen:
+                g.last_seen = now
+        state.event_count += len(events)
+        state.severity_sum = total
+        state.severity_sq_sum = sq_total
+
+        if config.scoring == "decay":
+            _fold_decayed(events, config, state, now)
+
+    evicted = _evict_expired(state, config, now)
+    return bool(events) or evicted
 
-    # Compute a simple aggregate severity.
-    severities = [e.severity for e in state.active_events]
-    avg_severity = sum(severities) / len(severities)
 
+def _fold_decayed(
+    events: Sequence[AnyDefenseEvent], config: NodeDefenseConfig, state: NodeDefenseState, now: float
+) -> None:
+    # O(1) state: decay the totals to `now`, then add the batch at full weight.
+    state.decay_to(now, config.decay_half_life)
+    weights = config.source_weights
+    if weights:
+        for e in events:
+            w = weights.get(e.source, 1.0)
+            state.decay_sum += w * e.severity
+            state.decay_weight += w
+    else:
+        state.decay_sum += sum(e.severity for e in events)
+        state.decay_weight += len(events)
+
+
+def _apply_thresholds(
+    state: NodeDefenseState, config: NodeDefenseConfig, avg_severity: float
+) -> List[DefenseAction]:
+    """
+    Set risk level and lockdown state from `avg_severity`; return actions.
+    """
     actions: List[DefenseAction] = []
 
     # Decide risk level from average severity.
@@ -163,5 +361,4 @@ def evaluate_defense(
             )
         state.lockdown_state = LockdownState.NONE
 
-    state.last_actions = actions
-    return state
+    return actions
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .engine import evaluate_defense
+from .models import (
+    EMPTY_METADATA,
+    AnyDefenseEvent,
+    CompactDefenseEvent,
+    DefenseAction,
+    NodeDefenseConfig,
+    NodeDefenseState,
+)
+
+
+"""
+Binary event log – compact on-disk DefenseEvent streams for replay
+
+Incident replays push millions of historical DefenseEvents through
+`evaluate_defense`. JSON lines cost a dict per event plus a dataclass;
+this module defines a fixed-width binary format that an mmap-backed
+reader can walk without materializing anything it does not need.
+
+File layout (little endian):
+
+    header    16 bytes   magic "ADNEVLG1", u32 version, u32 record size
+    records   N × 40     f64 timestamp, f64 severity, u32 type id,
+                         u32 source id, u64 metadata offset,
+                         u32 metadata length, u32 batch number
+    metadata  blob       canonical JSON per event that has metadata,
+                         addressed by (offset, length) from the record
+    strings   blob       JSON list of interned event_type / source strings
+    footer    48 bytes   u64 record count, u64 metadata offset/length,
+                         u64 strings offset/length, magic "ADNEVEND"
+
+`timestamp` is the arrival time the batch was applied at (the `now`
+passed to evaluate_defense), so a replay reproduces age-based eviction.
+
+Every record carries the (wrapping) number of the `append_batch` call
+that wrote it, so replay applies exactly the batches of the live run:
+consecutive batches with equal timestamps stay separate and a large
+batch is never split. An empty batch (an evaluate_defense call with no
+events, which still evicts and re-scores) is stored as one marker record
+whose type and source ids are 0xFFFFFFFF.
+"""
+
+MAGIC = b"ADNEVLG1"
+END_MAGIC = b"ADNEVEND"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sII")
+_RECORD = struct.Struct("<ddIIQII")
+_FOOTER = struct.Struct("<QQQQQ8s")
+
+RECORD_SIZE = _RECORD.size
+
+Record = Tuple[float, float, int, int, int, int, int]
+
+# Type / source id of the marker record that stands for an empty batch.
+_NO_EVENT = 0xFFFFFFFF
+
+# Records decoded per column pass in iter_batches. Reader memory is
+# bounded by this plus the largest single batch.
+_CHUNK_RECORDS = 16_384
+
+
+class EventLogError(ValueError):
+    """Raised for files that are not valid (or are truncated) event logs."""
+
+
+class EventLogWriter:
+    """
+    Streaming writer for the binary event log.
+
+    Records are written straight to `path`; metadata goes to a spill file
+    and is appended on `close()`, so memory stays constant apart from the
+    string table (one entry per distinct event_type / source).
+
+        with EventLogWriter("incident.adnlog") as log:
+            log.append_batch(now, events)
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = os.fspath(path)
+        self._f = open(self.path, "wb")
+        self._f.write(_HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+        self._meta = tempfile.TemporaryFile()
+        self._meta_len = 0
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self._count = 0
+        self._batches = 0
+
+    def _intern(self, s: str) -> int:
+        sid = self._string_ids.get(s)
+        if sid is None:
+            sid = self._string_ids[s] = len(self._strings)
+            self._strings.append(s)
+        return sid
+
+    def append(self, event: AnyDefenseEvent, timestamp: float) -> None:
+        """Append a single event as a batch of its own."""
+        self.append_batch(timestamp, (event,))
+
+    def append_batch(self, timestamp: float, events: Iterable[AnyDefenseEvent]) -> None:
+        """Append events that arrived together (one evaluate_defense call)."""
+        batch = self._batches & 0xFFFFFFFF
+        self._batches += 1
+        empty = True
+        for e in events:
+            self._write(e, timestamp, batch)
+            empty = False
+        if empty:
+            self._f.write(_RECORD.pack(timestamp, 0.0, _NO_EVENT, _NO_EVENT, 0, 0, batch))
+            self._count += 1
+
+    def _write(self, event: AnyDefenseEvent, timestamp: float, batch: int) -> None:
+        meta_offset = meta_len = 0
+        if event.metadata:
+            blob = json.dumps(
+                dict(event.metadata), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+            meta_offset, meta_len = self._meta_len, len(blob)
+            self._meta.write(blob)
+            self._meta_len += meta_len
+
+        self._f.write(
+            _RECORD.pack(
+                timestamp,
+                event.severity,
+                self._intern(event.event_type),
+                self._intern(event.source),
+                meta_offset,
+                meta_len,
+                batch,
+            )
+        )
+        self._count += 1
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        meta_offset = self._f.tell()
+        self._meta.seek(0)
+        while True:
+            chunk = self._meta.read(1 << 20)
+            if not chunk:
+                break
+            self._f.write(chunk)
+        self._meta.close()
+
+        strings_offset = self._f.tell()
+        strings = json.dumps(self._strings, ensure_ascii=False).encode("utf-8")
+        self._f.write(strings)
+        self._f.write(
+            _FOOTER.pack(
+                self._count, meta_offset, self._meta_len, strings_offset, len(strings), END_MAGIC
+            )
+        )
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+
+    def __enter__(self) -> "EventLogWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class EventLogReader:
+    """
+    mmap-backed reader for the binary event log.
+
+    Nothing is decoded up front except the footer and string table.
+    `iter_records` unpacks fixed-width records straight from the mapping
+    (no intermediate copies); `iter_batches` groups them into the
+    batches they were written as.
+    Event types and sources come from the interned string table, so
+    equal strings share a single object across all events.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = os.fspath(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _HEADER.size + _FOOTER.size:
+            self._file.close()
+            raise EventLogError("file too small to be an event log")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+
+        magic, version, record_size = _HEADER.unpack_from(self._mm, 0)
+        count, meta_off, meta_len, str_off, str_len, end = _FOOTER.unpack_from(
+            self._mm, size - _FOOTER.size
+        )
+        if magic != MAGIC or end != END_MAGIC:
+            self.close()
+            raise EventLogError("bad magic (not an ADN event log, or truncated)")
+        if version != VERSION or record_size != RECORD_SIZE:
+            self.close()
+            raise EventLogError(f"unsupported event log version {version}")
+
+        self._count: int = count
+        self._records_end = _HEADER.size + count * RECORD_SIZE
+        self._meta_off = meta_off
+        self.strings: List[str] = json.loads(bytes(self._view[str_off : str_off + str_len]))
+
+    def __len__(self) -> int:
+        return self._count
+
+    # -------------------------
+    # Raw access
+    # -------------------------
+
+    def record(self, i: int) -> Record:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return _RECORD.unpack_from(self._mm, _HEADER.size + i * RECORD_SIZE)
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Record]:
+        """Unpack records [start, stop) directly from the mapped file."""
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return iter(())
+        lo = _HEADER.size + start * RECORD_SIZE
+        hi = _HEADER.size + stop * RECORD_SIZE
+        return _RECORD.iter_unpack(self._view[lo:hi])
+
+    def metadata(self, offset: int, length: int) -> Mapping[str, Any]:
+        if not length:
+            return EMPTY_METADATA
+        lo = self._meta_off + offset
+        meta: Mapping[str, Any] = json.loads(bytes(self._view[lo : lo + length]))
+        return meta
+
+    # -------------------------
+    # Event access
+    # -------------------------
+
+    def iter_batches(
+        self, with_metadata: bool = False
+    ) -> Iterator[Tuple[float, List[CompactDefenseEvent]]]:
+        """
+        Yield (timestamp, events) per written batch, in file order.
+
+        Each group is exactly one `append_batch` call: batches are never
+        split or merged, and empty batches come back as (timestamp, []).
+        Metadata is only decoded when asked for; otherwise events carry
+        EMPTY_METADATA.
+        """
+        strings = self.strings
+        key: Optional[int] = None
+        ts = 0.0
+        batch: List[CompactDefenseEvent] = []
+        for lo in range(0, self._count, _CHUNK_RECORDS):
+            hi = min(lo + _CHUNK_RECORDS, self._count)
+            cols = self._columns(lo, hi)
+            ts_col, sev_col, type_col, src_col, moff_col, mlen_col, batch_col = cols
+            metas: Sequence[Mapping[str, Any]]
+            if with_metadata:
+                metas = [self.metadata(o, n) for o, n in zip(moff_col, mlen_col, strict=True)]
+            else:
+                metas = [EMPTY_METADATA] * (hi - lo)
+            # Walk runs of equal batch numbers; the open run carries over to
+            # the next chunk so a batch spanning a chunk edge stays whole.
+            start, n = 0, hi - lo
+            while start < n:
+                if batch_col[start] != key:
+                    if key is not None:
+                        yield ts, batch
+                    key, ts, batch = batch_col[start], ts_col[start], []
+                end = start + 1
+                while end < n and batch_col[end] == key:
+                    end += 1
+                if type_col[start] != _NO_EVENT:
+                    batch.extend(
+                        CompactDefenseEvent(
+                            strings[type_col[i]], sev_col[i], strings[src_col[i]], metas[i]
+                        )
+                        for i in range(start, end)
+                    )
+                start = end
+        if key is not None:
+            yield ts, batch
+
+    def _columns(self, lo: int, hi: int) -> Tuple[List[Any], ...]:
+        # Fixed-width records let each field be read as a strided column
+        # straight from the mapping instead of unpacking record by record.
+        # Native casts assume a little-endian host; otherwise unpack.
+        if sys.byteorder != "little":
+            rows = list(self.iter_records(lo, hi))
+            return tuple([r[k] for r in rows] for k in range(7))
+        region = self._view[_HEADER.size + lo * RECORD_SIZE : _HEADER.size + hi * RECORD_SIZE]
+        doubles = region.cast("d")
+        words = region.cast("I")
+        quads = region.cast("Q")
+        try:
+            return (
+                doubles[0::5].tolist(),
+                doubles[1::5].tolist(),
+                words[4::10].tolist(),
+                words[5::10].tolist(),
+                quads[3::5].tolist(),
+                words[8::10].tolist(),
+                words[9::10].tolist(),
+            )
+        finally:
+            for v in (doubles, words, quads, region):
+                v.release()
+
+    def close(self) -> None:
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None  # type: ignore[assignment]
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None  # type: ignore[assignment]
+        self._file.close()
+
+    def __enter__(self) -> "EventLogReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def replay(
+    reader: EventLogReader,
+    config: Optional[NodeDefenseConfig] = None,
+    state: Optional[NodeDefenseState] = None,
+    *,
+    on_actions: Optional[Callable[[float, List[DefenseAction]], None]] = None,
+) -> NodeDefenseState:
+    """
+    Stream an event log through `evaluate_defense`.
+
+    Each batch is applied with `now` set to its timestamp, one
+    evaluate_defense call per `append_batch` call of the writer, so the
+    result and the transitions match the live run that wrote the log.
+    `on_actions` is called for every batch that produced actions (e.g. to
+    collect lockdown transitions).
+
+    Memory is bounded by the read chunk, the largest batch and the
+    engine's active window; set `config.max_active_events` /
+    `max_event_age` for constant memory on unbounded logs.
+    """
+    if config is None:
+        config = NodeDefenseConfig()
+    if state is None:
+        state = NodeDefenseState()
+    for ts, events in reader.iter_batches():
+        evaluate_defense(events, config=config, state=state, now=ts)
+        if on_actions is not None and state.last_actions:
+            on_actions(ts, state.last_actions)
+    return state
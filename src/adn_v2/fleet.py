@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .actions import ActionExecutor
+from .engine import iter_batch_signals
+from .models import NodeState, PolicyDecision, RiskSignal, TelemetryBatch
+from .policy import PolicyEngine
+from .telemetry import TelemetryAdapter
+from .validator import RiskValidator
+
+
+"""
+FleetEngine – one ADN v2 pipeline for many nodes
+
+ADNEngine is bound to a single node_id, so a monitoring service that
+watches thousands of DigiByte nodes would otherwise create one engine,
+ActionExecutor, RiskValidator and TelemetryAdapter per node.
+
+FleetEngine shares those stateless components across the whole fleet
+and keeps only a small slotted record per node, stored in a sharded
+map keyed by node_id.
+"""
+
+
+class _NodeRecord:
+    """Per-node state kept by FleetEngine (the NodeState fields minus node_id)."""
+
+    __slots__ = ("hardened_mode", "last_decision")
+
+    def __init__(self) -> None:
+        self.hardened_mode = False
+        self.last_decision: Optional[PolicyDecision] = None
+
+
+class _Shard:
+    __slots__ = ("lock", "nodes")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.nodes: Dict[str, _NodeRecord] = {}
+
+
+class FleetEngine:
+    """
+    Multi-node ADN v2 engine.
+
+    `process_raw_telemetry(node_id, raw)` runs the same pipeline as
+    ADNEngine (adapter → validator → policy → executor) and records the
+    decision for `node_id`, creating the node on first sight.
+
+    Concurrency: node records are spread over `shards` independent maps.
+    Adapter, validator, policy and executor work runs without any lock;
+    only the final record update takes the owning shard's lock, so
+    threads working on different shards never contend and threads on the
+    same shard hold the lock for a few attribute writes. (CPython offers
+    no lock-free dict update with read-modify-write semantics, so this is
+    the cheapest correct option.)
+
+    The shared ActionExecutor must be stateless across nodes, as the
+    reference implementation is: it only writes into the per-call context.
+    """
+
+    def __init__(
+        self,
+        policy_engine: Optional[PolicyEngine] = None,
+        action_executor: Optional[ActionExecutor] = None,
+        validator: Optional[RiskValidator] = None,
+        telemetry_adapter: Optional[TelemetryAdapter] = None,
+        shards: int = 64,
+    ) -> None:
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self.policy_engine = policy_engine or PolicyEngine()
+        self.action_executor = action_executor or ActionExecutor(node_id="fleet")
+        self.validator = validator or RiskValidator()
+        self.telemetry_adapter = telemetry_adapter or TelemetryAdapter()
+        self._shards: Tuple[_Shard, ...] = tuple(_Shard() for _ in range(shards))
+
+    def _shard(self, node_id: str) -> _Shard:
+        return self._shards[hash(node_id) % len(self._shards)]
+
+    # -------------------------
+    # Pipeline
+    # -------------------------
+
+    def process_raw_telemetry(self, node_id: str, raw: Dict[str, object]) -> PolicyDecision:
+        packet = self.telemetry_adapter.from_raw(node_id, raw)
+        signals: List[RiskSignal] = self.validator.derive_signals(packet)
+        decision = self.policy_engine.decide(signals)
+
+        context: Dict[str, Any] = {"packet": packet, "node_state": {}}
+        self.action_executor.execute(decision, context)
+        self._record(node_id, decision, bool(context["node_state"].get("hardened")))
+        return decision
+
+    def process_telemetry_batch(self, batch: TelemetryBatch) -> List[PolicyDecision]:
+        """
+        Process a columnar TelemetryBatch (see ADNEngine.process_batch);
+        each row is routed by its node id.
+        """
+        decisions: List[PolicyDecision] = []
+        for row, signals in enumerate(iter_batch_signals(self.validator, batch)):
+            decision = self.policy_engine.decide(signals)
+            context: Dict[str, Any] = {"batch": batch, "row": row, "node_state": {}}
+            self.action_executor.execute(decision, context)
+            self._record(batch.node_id(row), decision, bool(context["node_state"].get("hardened")))
+            decisions.append(decision)
+        return decisions
+
+    def _record(self, node_id: str, decision: PolicyDecision, hardened: bool) -> None:
+        shard = self._shard(node_id)
+        with shard.lock:
+            record = shard.nodes.get(node_id)
+            if record is None:
+                record = shard.nodes[node_id] = _NodeRecord()
+            if hardened:
+                record.hardened_mode = True
+            record.last_decision = decision
+
+    def process_batch(
+        self, samples: Iterable[Tuple[str, Dict[str, object]]]
+    ) -> List[PolicyDecision]:
+        """Process (node_id, raw) pairs in order."""
+        return [self.process_raw_telemetry(node_id, raw) for node_id, raw in samples]
+
+    # -------------------------
+    # Node state access
+    # -------------------------
+
+    def state(self, node_id: str) -> Optional[NodeState]:
+        """Snapshot of one node as a NodeState (None if never seen)."""
+        shard = self._shard(node_id)
+        with shard.lock:
+            record = shard.nodes.get(node_id)
+            if record is None:
+                return None
+            return NodeState(
+                node_id=node_id,
+                hardened_mode=record.hardened_mode,
+                last_decision=record.last_decision,
+            )
+
+    def forget(self, node_id: str) -> bool:
+        """Stop tracking `node_id`; returns False if it was unknown."""
+        shard = self._shard(node_id)
+        with shard.lock:
+            return shard.nodes.pop(node_id, None) is not None
+
+    def node_ids(self) -> Iterator[str]:
+        for shard in self._shards:
+            with shard.lock:
+                ids = list(shard.nodes)
+            yield from ids
+
+    def __len__(self) -> int:
+        return sum(len(shard.nodes) for shard in self._shards)
+
+    def __contains__(self, node_id: object) -> bool:
+        return isinstance(node_id, str) and node_id in self._shard(node_id).nodes
+
+    # -------------------------
+    # Memory accounting
+    # -------------------------
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """
+        Approximate memory held for tracked nodes (CPython sys.getsizeof).
+
+        Counts the shard dict tables, node_id keys, node records and the
+        retained decisions (each distinct decision object counted once).
+        Shared components are not included since they do not grow with
+        the fleet.
+        """
+        nodes = 0
+        table_bytes = 0
+        key_bytes = 0
+        record_bytes = 0
+        decision_bytes = 0
+        seen: set = set()
+
+        for shard in self._shards:
+            with shard.lock:
+                items = list(shard.nodes.items())
+                table_bytes += sys.getsizeof(shard.nodes)
+            nodes += len(items)
+            for node_id, record in items:
+                key_bytes += sys.getsizeof(node_id)
+                record_bytes += sys.getsizeof(record)
+                d = record.last_decision
+                if d is not None and id(d) not in seen:
+                    seen.add(id(d))
+                    decision_bytes += _decision_size(d)
+
+        total = table_bytes + key_bytes + record_bytes + decision_bytes
+        return {
+            "nodes": nodes,
+            "shards": len(self._shards),
+            "table_bytes": table_bytes,
+            "key_bytes": key_bytes,
+            "record_bytes": record_bytes,
+            "decision_bytes": decision_bytes,
+            "total_bytes": total,
+            "bytes_per_node": total / nodes if nodes else 0.0,
+        }
+
+
+def _decision_size(d: PolicyDecision) -> int:
+    size = sys.getsizeof(d)
+    attrs = getattr(d, "__dict__", None)
+    if attrs is not None:
+        size += sys.getsizeof(attrs)
+    # Reason strings are usually shared literals from the validator.
+    return size + sys.getsizeof(d.actions)
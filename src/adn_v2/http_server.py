@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set, Tuple
+
+from .server import ADNServer
+
+
+"""
+HTTP front end – stdlib asyncio HTTP/1.1 server for ADNServer
+
+ADNServer only defines dict-in / dict-out handlers. This module wires
+them to a small HTTP/1.1 server with persistent connections, so
+integrations do not have to write their own blocking glue:
+
+    POST /telemetry   raw telemetry dict, or {"type": "telemetry", "data": {...}}
+    POST /telemetry/batch
+                      {"type": "telemetry_batch", "data": [{...}, ...]}
+    GET  /health      node health summary
+    POST /evaluate    Shield Contract v3 request (ADNv3 gate)
+
+Connections are keep-alive by default and requests may be pipelined:
+they are read as they arrive and answered in request order. Evaluation
+runs on an executor so the event loop only does I/O. Requests that
+update engine state (/telemetry, /telemetry/batch) are applied one
+after another in the order they arrived on their connection; stateless
+/evaluate requests run concurrently.
+
+Backpressure is applied at two levels:
+
+    • per connection, at most `pipeline_depth` requests are queued
+      before the server stops reading from that socket;
+    • across the server, at most `max_inflight` evaluations are queued
+      on the executor; beyond that new requests get 503 + Retry-After.
+"""
+
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+    503: "Service Unavailable",
+}
+
+Reply = Tuple[int, bytes]
+
+# Routes that update engine state; per connection they run in order.
+_ORDERED_ROUTES = frozenset({("POST", "/telemetry"), ("POST", "/telemetry/batch")})
+
+
+class HTTPRequest(NamedTuple):
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _json_reply(status: int, payload: Dict[str, Any]) -> Reply:
+    return status, json.dumps(payload).encode("utf-8")
+
+
+def _error_reply(status: int, message: str) -> Reply:
+    return _json_reply(status, {"error": message})
+
+
+def _format_response(status: int, body: bytes, keep_alive: bool) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+    )
+    if status == 503:
+        head += "Retry-After: 1\r\n"
+    return head.encode("latin-1") + b"\r\n" + body
+
+
+async def _read_request(reader: asyncio.StreamReader, max_body_bytes: int) -> Optional[HTTPRequest]:
+    """
+    Read one request from `reader`. Returns None on a clean EOF between
+    requests; raises _HTTPError for malformed or oversized input.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise _HTTPError(400, "truncated request head") from None
+    except asyncio.LimitOverrunError:
+        raise _HTTPError(431, "request head too large") from None
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise _HTTPError(400, "malformed request line") from None
+    if not version.startswith("HTTP/1."):
+        raise _HTTPError(400, "unsupported HTTP version")
+
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise _HTTPError(400, "malformed header")
+        headers[name.strip().lower()] = value.strip()
+
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        keep_alive = connection == "keep-alive"
+    else:
+        keep_alive = connection != "close"
+
+    if "transfer-encoding" in headers:
+        raise _HTTPError(501, "transfer-encoding is not supported")
+
+    body = b""
+    length_header = headers.get("content-length")
+    if length_header is not None:
+        try:
+            length = int(length_header)
+        except ValueError:
+            raise _HTTPError(400, "invalid content-length") from None
+        if length < 0:
+            raise _HTTPError(400, "invalid content-length")
+        if length > max_body_bytes:
+            raise _HTTPError(413, "request body too large")
+        if length:
+            try:
+                body = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                raise _HTTPError(400, "truncated request body") from None
+    elif method == "POST":
+        raise _HTTPError(411, "content-length required")
+
+    path = target.split("?", 1)[0]
+    return HTTPRequest(method, path, headers, body, keep_alive)
+
+
+class ADNHTTPServer:
+    """
+    Asyncio HTTP/1.1 server exposing an ADNServer.
+
+    Typical use:
+
+        http = ADNHTTPServer(ADNServer(ADNEngine("node-1")), port=8080)
+        asyncio.run(http.serve_forever())
+
+    or, inside a running loop, `await http.start()` / `await http.close()`
+    (the server is also an async context manager).
+
+    ADNEngine keeps mutable per-node state, so /telemetry evaluations are
+    serialized with a lock; /evaluate requests are independent and run
+    concurrently on the executor. Pass your own `executor` to control
+    the worker count; otherwise a thread pool owned by the server is used.
+    """
+
+    def __init__(
+        self,
+        server: ADNServer,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        *,
+        executor: Optional[Executor] = None,
+        max_inflight: int = 256,
+        pipeline_depth: int = 16,
+        max_body_bytes: int = 1_048_576,
+        idle_timeout: float = 30.0,
+    ) -> None:
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be >= 1")
+        if pipeline_depth < 1:
+            raise ValueError("pipeline_depth must be >= 1")
+
+        self.server = server
+        self.host = host
+        self.port = port
+        self.max_inflight = max_inflight
+        self.pipeline_depth = pipeline_depth
+        self.max_body_bytes = max_body_bytes
+        self.idle_timeout = idle_timeout
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._engine_lock = threading.Lock()
+        self._inflight = 0
+        self._aio_server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set["asyncio.Task[None]"] = set()
+
+        self.stats: Dict[str, int] = {"connections": 0, "requests": 0, "rejected": 0, "errors": 0}
+
+        self._routes: Dict[Tuple[str, str], Callable[[bytes], Reply]] = {
+            ("POST", "/telemetry"): self._telemetry,
+            ("POST", "/telemetry/batch"): self._telemetry_batch,
+            ("POST", "/evaluate"): self._evaluate,
+        }
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    async def start(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="adn-http")
+        self._aio_server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Reflect the bound port when port=0 was requested.
+        self.port = self._aio_server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._aio_server is None:
+            await self.start()
+        assert self._aio_server is not None
+        try:
+            await self._aio_server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._aio_server is not None:
+            self._aio_server.close()
+            # Idle keep-alive connections would otherwise hold shutdown open.
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._aio_server.wait_closed()
+            self._aio_server = None
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "ADNHTTPServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    # -------------------------
+    # Connection handling
+    # -------------------------
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        self.stats["connections"] += 1
+        # Replies are queued in request order; the sender awaits each one
+        # in turn, so pipelined requests are answered in order even though
+        # they are evaluated concurrently.
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_depth)
+        sender = asyncio.ensure_future(self._send_replies(pending, writer))
+        try:
+            await self._read_loop(reader, pending)
+            await pending.put(None)
+            await sender
+        except asyncio.CancelledError:
+            # Server shutdown: drop the connection without a traceback.
+            sender.cancel()
+        finally:
+            if task is not None:
+                self._connections.discard(task)
+            writer.close()
+
+    async def _read_loop(self, reader: asyncio.StreamReader, pending: asyncio.Queue) -> None:
+        # Last engine-updating reply on this connection; the next one waits
+        # for it, since the engine lock does not grant in arrival order.
+        engine_tail: Optional["asyncio.Future[Reply]"] = None
+        while True:
+            try:
+                req = await asyncio.wait_for(
+                    _read_request(reader, self.max_body_bytes), self.idle_timeout
+                )
+            except _HTTPError as e:
+                self.stats["errors"] += 1
+                await pending.put((self._ready(_error_reply(e.status, str(e))), False))
+                return
+            except (asyncio.TimeoutError, ConnectionError):
+                return
+            if req is None:
+                return
+
+            self.stats["requests"] += 1
+            ordered = (req.method, req.path) in _ORDERED_ROUTES
+            reply = self._dispatch(req, engine_tail if ordered else None)
+            if ordered:
+                engine_tail = reply
+            await pending.put((reply, req.keep_alive))
+            if not req.keep_alive:
+                return
+
+    async def _send_replies(self, pending: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        broken = False
+        while True:
+            item = await pending.get()
+            if item is None:
+                return
+            reply, keep_alive = item
+            status, body = await reply
+            if broken:
+                continue
+            try:
+                writer.write(_format_response(status, body, keep_alive))
+                await writer.drain()
+            except ConnectionError:
+                # Keep draining so the reader never blocks on a full queue.
+                broken = True
+
+    def _ready(self, reply: Reply) -> "asyncio.Future[Reply]":
+        fut: asyncio.Future[Reply] = asyncio.get_running_loop().create_future()
+        fut.set_result(reply)
+        return fut
+
+    def _dispatch(
+        self, req: HTTPRequest, after: Optional["asyncio.Future[Reply]"] = None
+    ) -> "asyncio.Future[Reply]":
+        if req.method == "GET" and req.path == "/health":
+            # Cheap read of engine state; answered on the loop.
+            return self._ready(_json_reply(200, self.server.handle_health()))
+
+        handler = self._routes.get((req.method, req.path))
+        if handler is None:
+            if any(path == req.path for _, path in self._routes):
+                return self._ready(_error_reply(405, "method not allowed"))
+            return self._ready(_error_reply(404, "not found"))
+
+        if self._inflight >= self.max_inflight:
+            self.stats["rejected"] += 1
+            return self._ready(_error_reply(503, "server busy"))
+
+        self._inflight += 1
+        fut: asyncio.Future[Reply]
+        if after is None or after.done():
+            fut = asyncio.get_running_loop().run_in_executor(self._executor, handler, req.body)
+        else:
+            fut = asyncio.ensure_future(self._run_after(after, handler, req.body))
+        fut.add_done_callback(self._release)
+        return fut
+
+    async def _run_after(
+        self, after: "asyncio.Future[Reply]", handler: Callable[[bytes], Reply], body: bytes
+    ) -> Reply:
+        await asyncio.wait({after})
+        return await asyncio.get_running_loop().run_in_executor(self._executor, handler, body)
+
+    def _release(self, _fut: "asyncio.Future[Reply]") -> None:
+        self._inflight -= 1
+
+    # -------------------------
+    # Route handlers (executor threads)
+    # -------------------------
+
+    @staticmethod
+    def _load_json(body: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def _telemetry(self, body: bytes) -> Reply:
+        payload = self._load_json(body)
+        if payload is None:
+            return _error_reply(400, "body must be a JSON object")
+        # Accept the ADNClient envelope as well as a bare telemetry dict.
+        if payload.get("type") == "telemetry" and isinstance(payload.get("data"), dict):
+            payload = payload["data"]
+        try:
+            with self._engine_lock:
+                response = self.server.handle_telemetry(payload)
+        except (TypeError, ValueError) as e:
+            return _error_reply(400, f"invalid telemetry: {e}")
+        except Exception:
+            return _error_reply(500, "telemetry processing failed")
+        return _json_reply(200, response)
+
+    def _telemetry_batch(self, body: bytes) -> Reply:
+        payload = self._load_json(body)
+        samples = payload.get("data") if payload is not None else None
+        if not isinstance(samples, list) or not all(isinstance(x, dict) for x in samples):
+            return _error_reply(400, "data must be a list of telemetry objects")
+        try:
+            # One lock acquisition for the whole batch keeps samples contiguous.
+            with self._engine_lock:
+                results = self.server.handle_telemetry_batch(samples)
+        except (TypeError, ValueError) as e:
+            return _error_reply(400, f"invalid telemetry: {e}")
+        except Exception:
+            return _error_reply(500, "telemetry processing failed")
+        return _json_reply(200, {"results": results})
+
+    def _evaluate(self, body: bytes) -> Reply:
+        # The v3 gate is fail-closed: any JSON value is handed over and
+        # malformed requests come back as contract ERROR responses.
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return _error_reply(400, "body must be JSON")
+        try:
+            response = self.server.handle_evaluate(payload)
+        except Exception:
+            return _error_reply(500, "evaluation failed")
+        return _json_reply(200, response)
+
+
+def serve(server: ADNServer, host: str = "127.0.0.1", port: int = 8080, **kwargs: Any) -> None:
+    """
+    Run an ADNHTTPServer until interrupted (blocking helper for scripts).
+    """
+    http = ADNHTTPServer(server, host, port, **kwargs)
+    try:
+        asyncio.run(http.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -1,8 +1,18 @@
 from __future__ import annotations
 
+import heapq
+import time
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+
+# Shared, read-only empty metadata for compact events: one object for all
+# events without metadata instead of one empty dict each.
+EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
 
 
 class RiskLevel(str, Enum):
@@ -28,7 +38,7 @@ class RiskLevel(str, Enum):
 RiskState = RiskLevel
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskSignal:
     """
     Normalised risk signal derived from raw telemetry.
@@ -44,7 +54,7 @@ class RiskSignal:
     details: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class TelemetryPacket:
     """
     Minimal snapshot of node health used by ADN v2.
@@ -62,6 +72,49 @@ class TelemetryPacket:
 
 
 @dataclass
+class TelemetryBatch:
+    """
+    Columnar batch of telemetry samples.
+
+    Canonical metrics live in contiguous typed arrays (one entry per
+    row) instead of one TelemetryPacket per sample:
+    - node ids are interned: `node_index[i]` points into `node_ids`
+    - `extra` fields are stored sparsely, only for rows that have them
+
+    Build one with TelemetryAdapter.from_raw_batch; `packet(i)` gives
+    the equivalent TelemetryPacket when a per-row object is needed.
+    """
+
+    node_ids: List[str] = field(default_factory=list)
+    node_index: array[int] = field(default_factory=lambda: array("I"))
+    height: array[int] = field(default_factory=lambda: array("q"))
+    mempool_size: array[int] = field(default_factory=lambda: array("q"))
+    peer_count: array[int] = field(default_factory=lambda: array("q"))
+    timestamp: array[float] = field(default_factory=lambda: array("d"))
+    extras: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.height)
+
+    def node_id(self, i: int) -> str:
+        return self.node_ids[self.node_index[i]]
+
+    def packet(self, i: int) -> TelemetryPacket:
+        return TelemetryPacket(
+            node_id=self.node_id(i),
+            height=self.height[i],
+            mempool_size=self.mempool_size[i],
+            peer_count=self.peer_count[i],
+            timestamp=self.timestamp[i],
+            extra=dict(self.extras.get(i, {})),
+        )
+
+    def packets(self) -> Iterator[TelemetryPacket]:
+        for i in range(len(self)):
+            yield self.packet(i)
+
+
+@dataclass(slots=True)
 class PolicyDecision:
     """
     Result of the risk-policy step for classic ADN v2.
@@ -123,7 +176,7 @@ class LockdownState(str, Enum):
     FULL = "FULL"
 
 
-@dataclass
+@dataclass(slots=True)
 class DefenseEvent:
     """
     Single security-related event observed by ADN.
@@ -141,6 +194,33 @@ class DefenseEvent:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(frozen=True, slots=True)
+class CompactDefenseEvent:
+    """
+    Immutable, low-footprint DefenseEvent for long event histories.
+
+    Same fields and engine behaviour as DefenseEvent, but frozen and
+    without a per-instance empty dict: events with no metadata share
+    EMPTY_METADATA. Use `from_event` to convert existing events.
+    """
+
+    event_type: str
+    severity: float
+    source: str
+    # default_factory returns the shared sentinel; no per-event allocation.
+    metadata: Mapping[str, Any] = field(default_factory=lambda: EMPTY_METADATA)
+
+    @classmethod
+    def from_event(cls, e: "DefenseEvent") -> "CompactDefenseEvent":
+        return cls(e.event_type, e.severity, e.source, e.metadata or EMPTY_METADATA)
+
+
+AnyDefenseEvent = Union[DefenseEvent, CompactDefenseEvent]
+
+
+SCORING_MODES = ("mean", "decay")
+
+
 @dataclass
 class NodeDefenseConfig:
     """
@@ -148,15 +228,41 @@ class NodeDefenseConfig:
 
     The thresholds are intentionally simple so node operators and DigiByte
     devs can tune behaviour without touching the core logic.
+
+    `max_event_age` (seconds) and `max_active_events` bound the sliding
+    window of active events the engine averages over. Both default to
+    None (unbounded), which keeps the original v2 behaviour.
+
+    `source_weights` optionally scales each source's contribution to the
+    risk score (a weighted mean; unlisted sources weigh 1.0), so one noisy
+    source can be damped without dropping its events.
+
+    `scoring` selects how the risk score is computed:
+    - "mean"  – mean severity of the active window (original behaviour)
+    - "decay" – exponentially time-decayed mean with `decay_half_life`
+                seconds; recent events dominate and the score fades
+                toward zero once the evidence is stale (see
+                NodeDefenseState.decayed_score)
     """
 
     lockdown_threshold: float = 0.75
     partial_lock_threshold: float = 0.5
     max_withdrawals_per_min: int = 50
     rpc_rate_limit: int = 1000  # requests per minute
+    max_event_age: Optional[float] = None
+    max_active_events: Optional[int] = None
+    source_weights: Optional[Dict[str, float]] = None
+    scoring: str = "mean"
+    decay_half_life: float = 300.0
 
+    def __post_init__(self) -> None:
+        if self.scoring not in SCORING_MODES:
+            raise ValueError(f"scoring must be one of {SCORING_MODES}")
+        if not self.decay_half_life > 0:
+            raise ValueError("decay_half_life must be > 0")
 
-@dataclass
+
+@dataclass(slots=True)
 class DefenseAction:
     """
     Action that ADN decides to take in response to events.
@@ -173,6 +279,30 @@ class DefenseAction:
     metadata: Optional[Dict[str, Any]] = None
 
 
+@dataclass(slots=True)
+class EventGroupStats:
+    """
+    Running aggregates for one source or event_type in the active window.
+    """
+
+    count: int = 0
+    severity_sum: float = 0.0
+    last_seen: float = 0.0  # latest arrival time of an event in this group
+
+    @property
+    def avg_severity(self) -> float:
+        return self.severity_sum / self.count if self.count else 0.0
+
+
+# Orderings accepted by NodeDefenseState.top_sources / top_event_types.
+_GROUP_KEYS = {
+    "severity_sum": lambda item: item[1].severity_sum,
+    "count": lambda item: item[1].count,
+    "avg_severity": lambda item: item[1].avg_severity,
+    "last_seen": lambda item: item[1].last_seen,
+}
+
+
 @dataclass
 class NodeDefenseState:
     """
@@ -180,11 +310,187 @@ class NodeDefenseState:
 
     It tracks:
     - the current RiskLevel,
-    - which LockdownState is active, and
-    - a list of active events and most recent actions.
+    - which LockdownState is active,
+    - a window of active events and most recent actions, and
+    - running severity aggregates over `active_events`, so the engine
+      can update the average in O(batch) instead of re-scanning history.
+
+    `active_events` is a deque ordered oldest → newest; `event_times`
+    holds the matching arrival timestamps used for age-based eviction.
+
+    `source_stats` / `event_type_stats` break the same aggregates down per
+    source and per event_type (groups disappear when their last event is
+    evicted), so per-source views never need a scan of the window.
+
+    `decay_sum` / `decay_weight` are the exponentially decayed severity
+    and event-weight totals as of `decay_time`, maintained only under
+    `scoring="decay"`. They cover every event ever seen (older ones with
+    vanishing weight), independent of the window bounds.
     """
 
     risk_level: RiskLevel = RiskLevel.NORMAL
     lockdown_state: LockdownState = LockdownState.NONE
-    active_events: List[DefenseEvent] = field(default_factory=list)
+    active_events: Deque[AnyDefenseEvent] = field(default_factory=deque)
     last_actions: List[DefenseAction] = field(default_factory=list)
+    event_count: int = 0
+    severity_sum: float = 0.0
+    severity_sq_sum: float = 0.0
+    event_times: Deque[float] = field(default_factory=deque)
+    source_stats: Dict[str, EventGroupStats] = field(default_factory=dict)
+    event_type_stats: Dict[str, EventGroupStats] = field(default_factory=dict)
+    decay_sum: float = 0.0
+    decay_weight: float = 0.0
+    decay_time: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.active_events, deque):
+            self.active_events = deque(self.active_events)
+        if not isinstance(self.event_times, deque):
+            self.event_times = deque(self.event_times)
+        # Events supplied without arrival times are treated as arriving now.
+        missing = len(self.active_events) - len(self.event_times)
+        if missing > 0:
+            self.event_times.extend([time.time()] * missing)
+
+        # States built with a pre-populated event list (older callers,
+        # fixtures) start with aggregates that match that list.
+        if self.active_events and not self.event_count:
+            for e in self.active_events:
+                self.event_count += 1
+                self.severity_sum += e.severity
+                self.severity_sq_sum += e.severity * e.severity
+        if self.active_events and not self.source_stats:
+            for e, t in zip(self.active_events, self.event_times, strict=True):
+                _add_to_group(self.source_stats, e.source, e.severity, t)
+                _add_to_group(self.event_type_stats, e.event_type, e.severity, t)
+
+    @property
+    def avg_severity(self) -> float:
+        """Mean severity of the active events (0.0 when there are none)."""
+        if not self.event_count:
+            return 0.0
+        return self.severity_sum / self.event_count
+
+    @property
+    def severity_variance(self) -> float:
+        """Population variance of active-event severities."""
+        if not self.event_count:
+            return 0.0
+        mean = self.severity_sum / self.event_count
+        return max(0.0, self.severity_sq_sum / self.event_count - mean * mean)
+
+    def decay_to(self, now: float, half_life: float) -> None:
+        """
+        Advance the decayed accumulators to `now` in closed form.
+
+        Out-of-order timestamps never move `decay_time` backwards.
+        """
+        if self.decay_time is None:
+            self.decay_time = now
+        elif now > self.decay_time:
+            factor = 0.5 ** ((now - self.decay_time) / half_life)
+            self.decay_sum *= factor
+            self.decay_weight *= factor
+            self.decay_time = now
+
+    def decayed_score(self, now: float, half_life: float) -> float:
+        """
+        Decayed mean severity at `now`, without mutating the state.
+
+        Normalised by max(weight, 1): with plenty of recent events this is
+        the decay-weighted mean; once less than one fresh event's worth of
+        weight remains, the score itself fades with the half-life.
+        """
+        if self.decay_time is None:
+            return 0.0
+        factor = 0.5 ** ((now - self.decay_time) / half_life) if now > self.decay_time else 1.0
+        return self.decay_sum * factor / max(self.decay_weight * factor, 1.0)
+
+    def weighted_avg_severity(self, weights: Mapping[str, float]) -> float:
+        """
+        Source-weighted mean severity (unlisted sources weigh 1.0).
+
+        O(distinct sources), independent of the window size.
+        """
+        num = den = 0.0
+        for source, stats in self.source_stats.items():
+            w = weights.get(source, 1.0)
+            num += w * stats.severity_sum
+            den += w * stats.count
+        return num / den if den > 0 else 0.0
+
+    def top_sources(
+        self, n: int = 5, by: str = "severity_sum"
+    ) -> List[Tuple[str, EventGroupStats]]:
+        """
+        The `n` sources with the largest `by` value (severity_sum, count,
+        avg_severity or last_seen) in the active window.
+        """
+        return heapq.nlargest(n, self.source_stats.items(), key=_GROUP_KEYS[by])
+
+    def top_event_types(
+        self, n: int = 5, by: str = "severity_sum"
+    ) -> List[Tuple[str, EventGroupStats]]:
+        """Like `top_sources`, grouped by event_type."""
+        return heapq.nlargest(n, self.event_type_stats.items(), key=_GROUP_KEYS[by])
+
+    def evict_oldest(self) -> AnyDefenseEvent:
+        """
+        Drop the oldest active event and remove it from the aggregates.
+        """
+        e = self.active_events[0]
+        self.evict(1)
+        return e
+
+    def evict(self, n: int) -> None:
+        """
+        Drop the `n` oldest active events, updating every aggregate.
+
+        O(n); the batch form of `evict_oldest` used by the engine.
+        """
+        events = self.active_events
+        times = self.event_times
+        sources = self.source_stats
+        event_types = self.event_type_stats
+        count = self.event_count
+        total = self.severity_sum
+        sq_total = self.severity_sq_sum
+        for _ in range(n):
+            e = events.popleft()
+            times.popleft()
+            sev = e.severity
+            count -= 1
+            total -= sev
+            sq_total -= sev * sev
+            g = sources.get(e.source)
+            if g is not None:  # None only after direct deque edits
+                g.count -= 1
+                if g.count:
+                    g.severity_sum -= sev
+                else:
+                    del sources[e.source]
+            g = event_types.get(e.event_type)
+            if g is not None:
+                g.count -= 1
+                if g.count:
+                    g.severity_sum -= sev
+                else:
+                    del event_types[e.event_type]
+        self.event_count = count
+        if count:
+            self.severity_sum = total
+            self.severity_sq_sum = sq_total
+        else:
+            # Reset exactly so subtraction error cannot accumulate.
+            self.severity_sum = 0.0
+            self.severity_sq_sum = 0.0
+
+
+def _add_to_group(groups: Dict[str, EventGroupStats], key: str, severity: float, now: float) -> None:
+    stats = groups.get(key)
+    if stats is None:
+        stats = groups[key] = EventGroupStats()
+    stats.count += 1
+    stats.severity_sum += severity
+    if now > stats.last_seen:
+        stats.last_seen = now
@@ -6,7 +6,9 @@ Full implementation will be added soon.
 """
 
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from . import models
 
 
 @dataclass
@@ -30,3 +32,22 @@ class PolicyEngine:
             reason="placeholder-policy-engine",
             level="normal"
         )
+
+    def decide(self, signals: List[models.RiskSignal]) -> models.PolicyDecision:
+        """
+        Pick the strongest RiskSignal and turn it into a PolicyDecision.
+
+        This is the hook ADNEngine.process_packet calls. The highest score
+        wins (first one on ties); no signals means a NORMAL decision.
+        """
+        if not signals:
+            return models.PolicyDecision(
+                level=models.RiskLevel.NORMAL, score=0.0, reason="no_signals"
+            )
+
+        top = max(signals, key=lambda s: s.score)
+        return models.PolicyDecision(
+            level=top.level,
+            score=top.score,
+            reason=str(top.details.get("reason", top.source)),
+        )
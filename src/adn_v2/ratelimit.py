@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .actions import build_rpc_policy_from_state
+from .models import NodeDefenseConfig, NodeDefenseState
+
+
+"""
+RPC rate limiter – per-client token buckets driven by the lockdown state
+
+`build_rpc_policy_from_state` says how much RPC a node should accept
+(`rpc_rate_limit` requests per minute, 0 = RPC disabled, None = normal
+operation) but nothing enforced it. RpcRateLimiter is the in-process
+enforcement point an RPC gateway calls once per request:
+
+    limiter = RpcRateLimiter(config)
+    ...
+    evaluate_defense(events, config=config, state=state)
+    limiter.update(state)               # after every evaluation
+    ...
+    if not limiter.allow(client_ip):
+        reject(429)
+
+Design notes:
+
+- The active policy is one immutable (rate, capacity) tuple swapped with
+  a single attribute assignment, so a lockdown change takes effect for
+  the next request on every thread without a lock. Existing buckets are
+  not rewritten: refills clamp to the current capacity, so tightening
+  the limit applies at each client's next request.
+- Buckets are refilled lazily from the elapsed time (no timers). A check
+  is one clock read, one dict lookup and a few float operations.
+- Client keys live in an OrderedDict used as an LRU of at most
+  `max_clients` entries; the least recently seen client is evicted when
+  a new one arrives. An evicted client comes back with a full bucket,
+  which only matters for clients idle long enough to be evicted.
+- There is no lock on the hot path. Two threads racing on the *same*
+  client can both spend the last token; the error is bounded by the
+  number of concurrent callers and the GIL keeps the structures intact.
+"""
+
+# (tokens per second, bucket capacity); rate 0 means RPC is disabled.
+_Policy = Tuple[float, float]
+
+_DISABLED: _Policy = (0.0, 0.0)
+
+
+class RpcRateLimiter:
+    """
+    Per-client token-bucket limiter for RPC requests.
+
+    `config.rpc_rate_limit` (requests per minute) is the normal-operation
+    rate; lockdown policies from `build_rpc_policy_from_state` override
+    it. Each bucket holds `burst_seconds` worth of tokens, so with the
+    default 60s a client may spend its whole per-minute allowance at once.
+    """
+
+    def __init__(
+        self,
+        config: Optional[NodeDefenseConfig] = None,
+        *,
+        max_clients: int = 1_000_000,
+        burst_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_clients < 1:
+            raise ValueError("max_clients must be >= 1")
+        if not burst_seconds > 0:
+            raise ValueError("burst_seconds must be > 0")
+        self.config = config or NodeDefenseConfig()
+        self.max_clients = max_clients
+        self.burst_seconds = burst_seconds
+        self._clock = clock
+        # client -> [tokens, last refill time]
+        self._buckets: "OrderedDict[Any, List[float]]" = OrderedDict()
+        self.policy: Dict[str, Any] = {}
+        self._policy: _Policy = _DISABLED
+        self.apply_policy({"rpc_enabled": True, "rpc_rate_limit": None, "notes": ["NORMAL"]})
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    # -------------------------
+    # Policy
+    # -------------------------
+
+    def update(self, state: NodeDefenseState) -> Dict[str, Any]:
+        """Apply the RPC policy for `state`'s lockdown; returns that policy."""
+        policy = build_rpc_policy_from_state(state)
+        self.apply_policy(policy)
+        return policy
+
+    def apply_policy(self, policy: Dict[str, Any]) -> None:
+        """Switch to a policy dict as returned by build_rpc_policy_from_state."""
+        limit = policy.get("rpc_rate_limit")
+        if limit is None:
+            limit = self.config.rpc_rate_limit
+        if not policy.get("rpc_enabled", True) or limit <= 0:
+            compiled = _DISABLED
+        else:
+            rate = limit / 60.0
+            compiled = (rate, max(1.0, rate * self.burst_seconds))
+        self.policy = dict(policy)
+        self._policy = compiled  # single store: atomic for readers
+
+    @property
+    def rate_per_minute(self) -> float:
+        return self._policy[0] * 60.0
+
+    # -------------------------
+    # Hot path
+    # -------------------------
+
+    def allow(self, client: Any, cost: float = 1.0) -> bool:
+        """Spend `cost` (> 0) tokens from `client`'s bucket; False if it cannot."""
+        if not cost > 0:
+            raise ValueError("cost must be > 0")
+        rate, capacity = self._policy
+        if not rate:
+            return False
+        now = self._clock()
+        buckets = self._buckets
+        bucket = buckets.get(client)
+        if bucket is None:
+            if cost > capacity:
+                return False
+            buckets[client] = [capacity - cost, now]
+            if len(buckets) > self.max_clients:
+                self._evict()
+            return True
+        try:
+            buckets.move_to_end(client)
+        except KeyError:  # evicted by another thread; finish on the orphan
+            pass
+        tokens = bucket[0] + (now - bucket[1]) * rate
+        if tokens > capacity:
+            tokens = capacity
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return True
+        bucket[0] = tokens
+        return False
+
+    def retry_after(self, client: Any, cost: float = 1.0) -> Optional[float]:
+        """Seconds until `client` could spend `cost`; None if it never can."""
+        if not cost > 0:
+            raise ValueError("cost must be > 0")
+        rate, capacity = self._policy
+        if not rate or cost > capacity:
+            return None
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            return 0.0
+        tokens = min(capacity, bucket[0] + (self._clock() - bucket[1]) * rate)
+        return max(0.0, (cost - tokens) / rate)
+
+    def _evict(self) -> None:
+        buckets = self._buckets
+        while len(buckets) > self.max_clients:
+            try:
+                buckets.popitem(last=False)
+            except KeyError:  # emptied concurrently
+                break
+
+    def reset(self, client: Any = None) -> None:
+        """Forget one client's bucket, or all buckets."""
+        if client is None:
+            self._buckets.clear()
+        else:
+            self._buckets.pop(client, None)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from .engine import ADNEngine
+from .models import PolicyDecision
+
+if TYPE_CHECKING:
+    from adn_v3 import ADNv3
 
 
 class ADNServer:
@@ -12,13 +16,32 @@ class ADNServer:
 
     Real integrations can plug this into FastAPI, Flask, or a raw HTTP server.
     Here we only define pure-Python handlers that accept dicts and return dicts.
+    `adn_v2.http_server` ships a stdlib asyncio front end for these handlers.
+
+    `gate` is the Shield Contract v3 gate used by `handle_evaluate`; a
+    default ADNv3() is created on first use when none is given.
     """
 
-    def __init__(self, engine: ADNEngine) -> None:
+    def __init__(self, engine: ADNEngine, gate: Optional["ADNv3"] = None) -> None:
         self.engine = engine
+        self.gate = gate
 
     def handle_telemetry(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         decision = self.engine.process_raw_telemetry(payload)
+        return self._decision_response(decision)
+
+    def handle_telemetry_batch(self, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply several telemetry samples in order through the engine's
+        columnar batch path.
+
+        Responses match calling `handle_telemetry` per sample. The whole
+        batch is converted before any sample is applied, so a malformed
+        sample (ValueError / TypeError) leaves the engine untouched.
+        """
+        return [self._decision_response(d) for d in self.engine.process_raw_batch(payloads)]
+
+    def _decision_response(self, decision: PolicyDecision) -> Dict[str, Any]:
         return {
             "node_id": self.engine.state.node_id,
             "level": decision.level.value,
@@ -40,10 +63,19 @@ class ADNServer:
             else None,
         }
 
+    def handle_evaluate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.gate is None:
+            from adn_v3 import ADNv3
+
+            self.gate = ADNv3()
+        return self.gate.evaluate(payload)
+
     def handle_raw_request(self, body: str) -> str:
         payload = json.loads(body)
         if payload.get("type") == "telemetry":
             response = self.handle_telemetry(payload["data"])
+        elif payload.get("type") == "telemetry_batch":
+            response = {"results": self.handle_telemetry_batch(payload["data"])}
         else:
             response = self.handle_health()
         return json.dumps(response)
@@ -0,0 +1,424 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Union
+
+from .engine import evaluate_defense
+from .models import (
+    AnyDefenseEvent,
+    DefenseAction,
+    DefenseEvent,
+    EventGroupStats,
+    LockdownState,
+    NodeDefenseConfig,
+    NodeDefenseState,
+    NodeState,
+    PolicyDecision,
+    RiskLevel,
+)
+
+
+"""
+Durable state store – journal + snapshots for NodeDefenseState
+
+NodeDefenseState (and the classic NodeState) only live in memory, so a
+restart used to drop lockdown state and event history. DefenseStateStore
+keeps them in two plain local files:
+
+    journal.jsonl   append-only; one record per applied event batch
+                    (events, the `now` they were applied at, resulting
+                    actions) or NodeState update
+    snapshot.json   compact full state as of journal record `seq`,
+                    replaced atomically (write temp → fsync → os.replace)
+
+Recovery loads the snapshot and replays only journal records newer than
+it through `evaluate_defense` with their recorded `now`, so the rebuilt
+state — including age-based eviction and lockdown transitions — is the
+same as before the restart. A torn final journal line (crash mid-write)
+is discarded.
+
+Durability is batched: the journal is fsynced every `fsync_every`
+records or `fsync_interval` seconds, whichever comes first, so a power
+loss can drop at most that much of the most recent tail while keeping
+write amplification bounded. The interval is enforced by a one-shot
+timer thread armed by the first unsynced record, so a burst followed by
+silence is still synced on time. `flush()` forces an fsync.
+
+The store is bound to one NodeDefenseConfig: replay uses it, so changing
+thresholds between runs changes how the tail is re-evaluated.
+"""
+
+SNAPSHOT_VERSION = 1
+JOURNAL_NAME = "journal.jsonl"
+SNAPSHOT_NAME = "snapshot.json"
+
+
+# -------------------------
+# (De)serialization helpers
+# -------------------------
+
+
+def _event_to_json(e: AnyDefenseEvent) -> List[Any]:
+    return [e.event_type, e.severity, e.source, dict(e.metadata or {})]
+
+
+def _event_from_json(row: List[Any]) -> DefenseEvent:
+    event_type, severity, source, metadata = row
+    return DefenseEvent(event_type, severity, source, metadata)
+
+
+def _action_to_json(a: DefenseAction) -> List[Any]:
+    return [a.action_type, a.reason, a.metadata]
+
+
+def _action_from_json(row: List[Any]) -> DefenseAction:
+    return DefenseAction(*row)
+
+
+def _groups_to_json(groups: Dict[str, EventGroupStats]) -> Dict[str, List[Any]]:
+    return {k: [g.count, g.severity_sum, g.last_seen] for k, g in groups.items()}
+
+
+def _groups_from_json(d: Dict[str, List[Any]]) -> Dict[str, EventGroupStats]:
+    return {k: EventGroupStats(*row) for k, row in d.items()}
+
+
+def state_to_dict(state: NodeDefenseState) -> Dict[str, Any]:
+    """JSON-friendly NodeDefenseState, including the running aggregates."""
+    return {
+        "risk_level": state.risk_level.value,
+        "lockdown_state": state.lockdown_state.value,
+        "active_events": [_event_to_json(e) for e in state.active_events],
+        "event_times": list(state.event_times),
+        "last_actions": [_action_to_json(a) for a in state.last_actions],
+        # Stored rather than recomputed so float rounding matches exactly.
+        "event_count": state.event_count,
+        "severity_sum": state.severity_sum,
+        "severity_sq_sum": state.severity_sq_sum,
+        "source_stats": _groups_to_json(state.source_stats),
+        "event_type_stats": _groups_to_json(state.event_type_stats),
+        "decay_sum": state.decay_sum,
+        "decay_weight": state.decay_weight,
+        "decay_time": state.decay_time,
+    }
+
+
+def state_from_dict(d: Dict[str, Any]) -> NodeDefenseState:
+    return NodeDefenseState(
+        risk_level=RiskLevel(d["risk_level"]),
+        lockdown_state=LockdownState(d["lockdown_state"]),
+        active_events=deque(_event_from_json(r) for r in d["active_events"]),
+        event_times=deque(d["event_times"]),
+        last_actions=[_action_from_json(r) for r in d["last_actions"]],
+        event_count=d["event_count"],
+        severity_sum=d["severity_sum"],
+        severity_sq_sum=d["severity_sq_sum"],
+        # Older snapshots lack the group tables; they are rebuilt from events.
+        source_stats=_groups_from_json(d.get("source_stats", {})),
+        event_type_stats=_groups_from_json(d.get("event_type_stats", {})),
+        decay_sum=d.get("decay_sum", 0.0),
+        decay_weight=d.get("decay_weight", 0.0),
+        decay_time=d.get("decay_time"),
+    )
+
+
+def _node_state_to_dict(ns: NodeState) -> Dict[str, Any]:
+    d = ns.last_decision
+    return {
+        "node_id": ns.node_id,
+        "hardened_mode": ns.hardened_mode,
+        "last_decision": None
+        if d is None
+        else {
+            "level": RiskLevel(d.level).value,
+            "score": d.score,
+            "reason": d.reason,
+            "actions": list(d.actions),
+        },
+    }
+
+
+def _node_state_from_dict(d: Dict[str, Any]) -> NodeState:
+    decision = d["last_decision"]
+    return NodeState(
+        node_id=d["node_id"],
+        hardened_mode=d["hardened_mode"],
+        last_decision=None
+        if decision is None
+        else PolicyDecision(
+            level=RiskLevel(decision["level"]),
+            score=decision["score"],
+            reason=decision["reason"],
+            actions=decision["actions"],
+        ),
+    )
+
+
+def _fsync_dir(path: Path) -> None:
+    # Make the rename itself durable (no-op where directories can't be opened).
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class DefenseStateStore:
+    """
+    Crash-safe persistence for one node's NodeDefenseState / NodeState.
+
+        store = DefenseStateStore("/var/lib/adn", config=cfg)
+        state = store.recover()          # snapshot + journal tail
+        store.apply(events)              # evaluate_defense + journal
+        store.close()                    # fsync + final snapshot
+
+    `apply` is the write path: it runs evaluate_defense on the recovered
+    state and journals the batch. A snapshot is taken automatically every
+    `snapshot_every` journal records, after which the journal is reset.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        config: Optional[NodeDefenseConfig] = None,
+        *,
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+        snapshot_every: int = 10_000,
+    ) -> None:
+        if fsync_every < 1:
+            raise ValueError("fsync_every must be >= 1")
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be >= 1")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.config = config or NodeDefenseConfig()
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+
+        self.state = NodeDefenseState()
+        self.node_state: Optional[NodeState] = None
+        self.stats: Dict[str, int] = {"replayed": 0, "discarded": 0, "fsyncs": 0, "snapshots": 0}
+
+        self._seq = 0               # last journal record written/applied
+        self._snapshot_seq = 0      # seq covered by the current snapshot
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._journal: Optional[BinaryIO] = None   # opened by recover()
+        # Guards the journal against the fsync timer thread.
+        self._io_lock = threading.RLock()
+        self._sync_timer: Optional[threading.Timer] = None
+
+    @property
+    def journal_path(self) -> Path:
+        return self.directory / JOURNAL_NAME
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / SNAPSHOT_NAME
+
+    # -------------------------
+    # Recovery
+    # -------------------------
+
+    def recover(self) -> NodeDefenseState:
+        """
+        Load the latest snapshot and replay the journal tail after it.
+
+        Must be called once before `apply`; returns the recovered state
+        (a fresh NodeDefenseState for an empty directory).
+        """
+        if self.snapshot_path.exists():
+            snap = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            if snap.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot version: {snap.get('version')!r}")
+            self.state = state_from_dict(snap["state"])
+            ns = snap.get("node_state")
+            self.node_state = _node_state_from_dict(ns) if ns is not None else None
+            self._seq = self._snapshot_seq = snap["seq"]
+
+        valid_bytes = 0
+        if self.journal_path.exists():
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("torn record")
+                        record = json.loads(line)
+                    except ValueError:
+                        # Crash mid-append: everything from here on is unusable.
+                        self.stats["discarded"] += 1
+                        break
+                    valid_bytes += len(line)
+                    if record["seq"] <= self._seq:
+                        continue  # already covered by the snapshot
+                    self._replay(record)
+                    self._seq = record["seq"]
+                    self.stats["replayed"] += 1
+
+        journal = open(self.journal_path, "ab")
+        if journal.tell() != valid_bytes:
+            journal.truncate(valid_bytes)
+        self._journal = journal
+        return self.state
+
+    def _replay(self, record: Dict[str, Any]) -> None:
+        kind = record["kind"]
+        if kind == "events":
+            events = [_event_from_json(r) for r in record["events"]]
+            evaluate_defense(events, config=self.config, state=self.state, now=record["now"])
+        elif kind == "node":
+            self.node_state = _node_state_from_dict(record["node_state"])
+        else:
+            raise ValueError(f"unknown journal record kind: {kind!r}")
+
+    # -------------------------
+    # Write path
+    # -------------------------
+
+    def apply(
+        self, events: Iterable[AnyDefenseEvent], now: Optional[float] = None
+    ) -> NodeDefenseState:
+        """
+        Run `evaluate_defense` for `events` and journal the batch.
+
+        `now` defaults to time.time(); it is recorded so replay applies
+        age-based eviction exactly as it happened.
+        """
+        if self._journal is None:
+            raise RuntimeError("call recover() before apply()")
+        if now is None:
+            now = time.time()
+        batch = list(events)
+        # Encode before touching state: unserializable metadata must fail
+        # the call, not leave memory ahead of the journal.
+        events_json = json.dumps([_event_to_json(e) for e in batch], separators=(",", ":"))
+        evaluate_defense(batch, config=self.config, state=self.state, now=now)
+        self._append(
+            {
+                "kind": "events",
+                "now": now,
+                # Informational: replay re-derives actions from the events.
+                "actions": [a.action_type for a in self.state.last_actions],
+            },
+            events_json=events_json,
+        )
+        return self.state
+
+    def record_node_state(self, node_state: NodeState) -> None:
+        """Journal the classic engine's NodeState (last write wins)."""
+        if self._journal is None:
+            raise RuntimeError("call recover() before record_node_state()")
+        self.node_state = node_state
+        self._append({"kind": "node", "node_state": _node_state_to_dict(node_state)})
+
+    def _append(self, record: Dict[str, Any], events_json: Optional[str] = None) -> None:
+        self._seq += 1
+        record["seq"] = self._seq
+        line = json.dumps(record, separators=(",", ":"))
+        if events_json is not None:
+            line = f'{line[:-1]},"events":{events_json}}}'
+        with self._io_lock:
+            assert self._journal is not None
+            self._journal.write(line.encode("utf-8") + b"\n")
+            self._unsynced += 1
+
+            if (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self.flush()
+            elif self._sync_timer is None:
+                self._arm_sync_timer()
+            if self._seq - self._snapshot_seq >= self.snapshot_every:
+                self.snapshot()
+
+    def _arm_sync_timer(self) -> None:
+        delay = max(0.0, self.fsync_interval - (time.monotonic() - self._last_sync))
+        timer = threading.Timer(delay, self._timed_flush)
+        timer.daemon = True
+        self._sync_timer = timer
+        timer.start()
+
+    def _timed_flush(self) -> None:
+        with self._io_lock:
+            if self._sync_timer is threading.current_thread():
+                self._sync_timer = None
+            self.flush()
+
+    def flush(self) -> None:
+        """Flush and fsync pending journal records."""
+        with self._io_lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if self._journal is None:
+                return
+            self._journal.flush()
+            if self._unsynced:
+                os.fsync(self._journal.fileno())
+                self.stats["fsyncs"] += 1
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def snapshot(self) -> None:
+        """
+        Write a compact snapshot atomically, then reset the journal.
+
+        Crash-safe in either order: if we die after the rename but before
+        the journal reset, recovery skips records the snapshot covers.
+        """
+        with self._io_lock:
+            self.flush()
+            payload = {
+                "version": SNAPSHOT_VERSION,
+                "seq": self._seq,
+                "state": state_to_dict(self.state),
+                "node_state": _node_state_to_dict(self.node_state) if self.node_state else None,
+            }
+            tmp = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.write(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            _fsync_dir(self.directory)
+            self._snapshot_seq = self._seq
+            self.stats["snapshots"] += 1
+
+            if self._journal is not None:
+                self._journal.truncate(0)
+                self._journal.seek(0)
+                os.fsync(self._journal.fileno())
+
+    def close(self, snapshot: bool = True) -> None:
+        """Flush the journal and (by default) take a final snapshot."""
+        with self._io_lock:
+            if self._journal is None:
+                return
+            if snapshot and self._seq != self._snapshot_seq:
+                self.snapshot()
+            else:
+                self.flush()
+            self._journal.close()
+            self._journal = None
+
+    def __enter__(self) -> "DefenseStateStore":
+        if self._journal is None:
+            self.recover()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
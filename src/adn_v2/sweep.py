@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field, replace
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .engine import _ingest, risk_score
+from .models import AnyDefenseEvent, NodeDefenseConfig, NodeDefenseState
+
+try:  # NumPy is optional; thresholds fall back to a per-config scan.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None  # type: ignore[assignment]
+
+
+"""
+Threshold sweep – what-if lockdown analysis over recorded traffic
+
+Tuning `lockdown_threshold` / `partial_lock_threshold` used to mean
+re-running `evaluate_defense` over the whole recording once per
+candidate config. The expensive part of that — maintaining the active
+window and its risk score — does not depend on the thresholds at
+all, only on the window bounds (`max_event_age`, `max_active_events`),
+`source_weights` and the scoring mode.
+
+`sweep` therefore reads the stream once, maintains one window per
+distinct such setting, and records the risk score after every
+batch that changed the window (every batch under decay scoring, where
+the score moves with time alone). The lockdown state machine for each
+config is then evaluated over that series: vectorized across all
+configs of a window group with NumPy when available, or with a tight
+per-config scan otherwise. Results match running `evaluate_defense`
+per config exactly.
+"""
+
+# Lockdown states as small ints for the scan.
+_NONE, _PARTIAL, _FULL = 0, 1, 2
+
+ENTER_FULL = "ENTER_FULL_LOCKDOWN"
+ENTER_PARTIAL = "ENTER_PARTIAL_LOCKDOWN"
+LIFT = "LIFT_LOCKDOWN"
+
+
+@dataclass
+class SweepResult:
+    """
+    Outcome of replaying the stream under one NodeDefenseConfig.
+
+    Times are in the stream's timestamp units (seconds) and cover the
+    span from the first batch to `end_time`.
+    """
+
+    config: NodeDefenseConfig
+    time_in_lockdown: float = 0.0
+    time_in_full: float = 0.0
+    time_in_partial: float = 0.0
+    actions: Dict[str, int] = field(
+        default_factory=lambda: {ENTER_PARTIAL: 0, ENTER_FULL: 0, LIFT: 0}
+    )
+    final_lockdown_state: str = "NONE"
+
+    @property
+    def transitions(self) -> int:
+        return sum(self.actions.values())
+
+
+def config_grid(
+    lockdown_thresholds: Iterable[float],
+    partial_lock_thresholds: Iterable[float],
+    base: Optional[NodeDefenseConfig] = None,
+) -> List[NodeDefenseConfig]:
+    """Cartesian product of thresholds on top of `base` (other knobs kept)."""
+    base = base or NodeDefenseConfig()
+    return [
+        replace(base, lockdown_threshold=lock, partial_lock_threshold=partial)
+        for lock, partial in product(lockdown_thresholds, partial_lock_thresholds)
+    ]
+
+
+def _window_key(cfg: NodeDefenseConfig) -> Tuple[Any, ...]:
+    # Everything the score series depends on; thresholds are not part of it.
+    weights = tuple(sorted(cfg.source_weights.items())) if cfg.source_weights else None
+    decay = cfg.decay_half_life if cfg.scoring == "decay" else None
+    return (cfg.max_event_age, cfg.max_active_events, weights, cfg.scoring, decay)
+
+
+def sweep(
+    stream: Iterable[Tuple[float, Sequence[AnyDefenseEvent]]],
+    configs: Sequence[NodeDefenseConfig],
+    end_time: Optional[float] = None,
+) -> List[SweepResult]:
+    """
+    Evaluate every config in `configs` over one pass of `stream`.
+
+    `stream` yields (now, events) batches in time order, one per
+    `evaluate_defense` call of the run being analysed — for example
+    `EventLogReader.iter_batches()`, which returns the recorded batches
+    unsplit and includes empty ones.
+    Each config starts from a fresh NodeDefenseState. Results are
+    returned in `configs` order; `end_time` (default: the last batch
+    timestamp) closes the final time-in-lockdown interval.
+    """
+    groups: Dict[Tuple[Any, ...], List[int]] = {}
+    for i, cfg in enumerate(configs):
+        groups.setdefault(_window_key(cfg), []).append(i)
+
+    windows = [(configs[idx[0]], NodeDefenseState()) for idx in groups.values()]
+    series = [(array("d"), array("d")) for _ in windows]  # (times, averages)
+
+    last_ts: Optional[float] = None
+    for now, events in stream:
+        batch = events if isinstance(events, list) else list(events)
+        for (cfg, state), (times, avgs) in zip(windows, series, strict=True):
+            # A no-op call leaves lockdown untouched, so only changes are kept.
+            if _ingest(batch, cfg, state, now) or cfg.scoring == "decay":
+                times.append(now)
+                avgs.append(risk_score(state, cfg, now))
+        last_ts = now
+
+    results: List[Optional[SweepResult]] = [None] * len(configs)
+    for (times, avgs), idx in zip(series, groups.values(), strict=True):
+        end = end_time if end_time is not None else (last_ts if last_ts is not None else 0.0)
+        group_cfgs = [configs[i] for i in idx]
+        if np is not None and len(avgs):
+            group_results = _thresholds_numpy(times, avgs, group_cfgs, end)
+        else:
+            group_results = [_thresholds_scan(times, avgs, cfg, end) for cfg in group_cfgs]
+        for i, res in zip(idx, group_results, strict=True):
+            results[i] = res
+    return results  # type: ignore[return-value]
+
+
+def _thresholds_scan(
+    times: Sequence[float], avgs: Sequence[float], cfg: NodeDefenseConfig, end: float
+) -> SweepResult:
+    # Same transitions as engine._apply_thresholds, on ints.
+    lock, partial = cfg.lockdown_threshold, cfg.partial_lock_threshold
+    res = SweepResult(config=cfg)
+    counts = res.actions
+    state = _NONE
+    full_time = partial_time = 0.0
+    n = len(avgs)
+    for k in range(n):
+        avg = avgs[k]
+        if avg >= lock:
+            if state != _FULL:
+                counts[ENTER_FULL] += 1
+                state = _FULL
+        elif avg >= partial:
+            if state == _NONE:
+                counts[ENTER_PARTIAL] += 1
+                state = _PARTIAL
+        else:
+            if state != _NONE:
+                counts[LIFT] += 1
+            state = _NONE
+        if state != _NONE:
+            span = (times[k + 1] if k + 1 < n else end) - times[k]
+            if state == _FULL:
+                full_time += span
+            else:
+                partial_time += span
+
+    res.time_in_full = full_time
+    res.time_in_partial = partial_time
+    res.time_in_lockdown = full_time + partial_time
+    res.final_lockdown_state = ("NONE", "PARTIAL", "FULL")[state]
+    return res
+
+
+def _thresholds_numpy(
+    times: array[float], avgs: array[float], cfgs: List[NodeDefenseConfig], end: float
+) -> List[SweepResult]:
+    # Rows are configs, columns are window changes.
+    avg = np.frombuffer(avgs, dtype=np.float64)[None, :]
+    ts = np.frombuffer(times, dtype=np.float64)
+    lock = np.array([c.lockdown_threshold for c in cfgs], dtype=np.float64)[:, None]
+    partial = np.array([c.partial_lock_threshold for c in cfgs], dtype=np.float64)[:, None]
+
+    # 2 = CRITICAL, 1 = ELEVATED, 0 = NORMAL.
+    level = np.where(avg >= lock, 2, np.where(avg >= partial, 1, 0)).astype(np.int8)
+
+    # ELEVATED only enters PARTIAL from NONE; otherwise it keeps the state
+    # set by the most recent non-ELEVATED step (FULL stays FULL). Forward-fill
+    # the index of that step to resolve the whole series at once.
+    n = level.shape[1]
+    cols = np.arange(n)
+    anchor = np.maximum.accumulate(np.where(level != 1, cols, -1), axis=1)
+    anchor_level = np.where(anchor >= 0, np.take_along_axis(level, np.maximum(anchor, 0), 1), 0)
+    state = np.where(level == 1, np.where(anchor_level == 2, _FULL, _PARTIAL), level).astype(np.int8)
+
+    prev = np.concatenate([np.zeros((len(cfgs), 1), dtype=np.int8), state[:, :-1]], axis=1)
+    enter_full = ((state == _FULL) & (prev != _FULL)).sum(axis=1)
+    enter_partial = ((state == _PARTIAL) & (prev == _NONE)).sum(axis=1)
+    lift = ((level == 0) & (prev != _NONE)).sum(axis=1)
+
+    spans = np.diff(np.append(ts, end))[None, :]
+    full_time = np.where(state == _FULL, spans, 0.0).sum(axis=1)
+    partial_time = np.where(state == _PARTIAL, spans, 0.0).sum(axis=1)
+
+    out: List[SweepResult] = []
+    for i, cfg in enumerate(cfgs):
+        res = SweepResult(config=cfg)
+        res.actions[ENTER_FULL] = int(enter_full[i])
+        res.actions[ENTER_PARTIAL] = int(enter_partial[i])
+        res.actions[LIFT] = int(lift[i])
+        res.time_in_full = float(full_time[i])
+        res.time_in_partial = float(partial_time[i])
+        res.time_in_lockdown = res.time_in_full + res.time_in_partial
+        res.final_lockdown_state = ("NONE", "PARTIAL", "FULL")[int(state[i, -1])]
+        out.append(res)
+    return out
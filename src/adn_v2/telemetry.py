@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional, Tuple
 
-from .models import TelemetryPacket
+from .models import TelemetryBatch, TelemetryPacket
+
+_CANONICAL_KEYS = frozenset({"height", "mempool_size", "peer_count", "timestamp"})
 
 
 """
@@ -64,6 +66,64 @@ class TelemetryAdapter:
             extra={
                 k: v
                 for k, v in raw.items()
-                if k not in {"height", "mempool_size", "peer_count", "timestamp"}
+                if k not in _CANONICAL_KEYS
             },
         )
+
+    def from_raw_batch(
+        self,
+        node_id: str,
+        raws: Iterable[Dict[str, Any]],
+        now: Optional[float] = None,
+    ) -> TelemetryBatch:
+        """
+        Build a columnar TelemetryBatch from raw samples of one node.
+
+        Field handling matches `from_raw` row for row, except that rows
+        without a timestamp all get the same `now` (default: time.time()
+        once per batch).
+        """
+        return self.from_node_samples(((node_id, raw) for raw in raws), now=now)
+
+    def from_node_samples(
+        self,
+        samples: Iterable[Tuple[str, Dict[str, Any]]],
+        now: Optional[float] = None,
+    ) -> TelemetryBatch:
+        """
+        Build a TelemetryBatch from (node_id, raw) pairs in one pass.
+
+        Node ids are interned into `batch.node_ids`; only rows that carry
+        non-canonical keys get an entry in `batch.extras`. Integer fields
+        outside the signed 64-bit range of the columns raise ValueError.
+        """
+        if now is None:
+            now = time.time()
+
+        batch = TelemetryBatch()
+        node_slots: Dict[str, int] = {}
+        add_node = batch.node_index.append
+        add_height = batch.height.append
+        add_mempool = batch.mempool_size.append
+        add_peers = batch.peer_count.append
+        add_ts = batch.timestamp.append
+        extras = batch.extras
+
+        row = 0
+        try:
+            for row, (node_id, raw) in enumerate(samples):
+                slot = node_slots.get(node_id)
+                if slot is None:
+                    slot = node_slots[node_id] = len(batch.node_ids)
+                    batch.node_ids.append(node_id)
+                add_node(slot)
+                add_height(int(raw.get("height", 0)))
+                add_mempool(int(raw.get("mempool_size", 0)))
+                add_peers(int(raw.get("peer_count", 0)))
+                add_ts(float(raw.get("timestamp", now)))
+                if not _CANONICAL_KEYS.issuperset(raw):
+                    extras[row] = {k: v for k, v in raw.items() if k not in _CANONICAL_KEYS}
+        except OverflowError as e:
+            raise ValueError(f"telemetry row {row}: integer field out of 64-bit range") from e
+
+        return batch
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List
+from array import array
+from typing import Any, List, Optional, Sequence
 
 from .models import (
     RiskSignal,
@@ -8,6 +9,11 @@ from .models import (
     RiskLevel,
 )
 
+try:  # NumPy is optional; the batch path falls back to the array module.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None  # type: ignore[assignment]
+
 
 """
 RiskValidator – ADN v2 reference validator
@@ -18,8 +24,18 @@ the ADN v2 pipeline.
 Projects depending on ADN v2 can subclass or replace this validator
 to implement more sophisticated threat scoring without modifying the
 core engine.
+
+For fleet-wide scans, `derive_signal_codes` evaluates the same
+heuristics over columnar batches and returns one bit-flag code per row
+(see SIGNAL_* below); `signals_from_code` expands a code back into the
+RiskSignal list the scalar path would have produced.
 """
 
+# Bit flags used by the batch path. 0 means "no anomaly" (baseline).
+SIGNAL_BASELINE = 0
+SIGNAL_LOW_PEER = 1
+SIGNAL_MEMPOOL_SPIKE = 2
+
 
 class RiskValidator:
     """
@@ -33,46 +49,112 @@ class RiskValidator:
 
     This keeps v2 tests and CI clean while providing a realistic
     entry point for future expansion.
+
+    Changing the thresholds (class attributes) affects both paths. A
+    subclass that overrides `derive_signals` is evaluated row by row in
+    batch scans; override `signal_code` together with
+    `derive_signal_codes` to keep custom heuristics vectorized.
     """
 
+    LOW_PEER_THRESHOLD = 2           # peer_count below this is "low"
+    MEMPOOL_SPIKE_THRESHOLD = 20000  # mempool_size above this is a spike
+
     def derive_signals(self, packet: TelemetryPacket) -> List[RiskSignal]:
-        signals: List[RiskSignal] = []
+        return signals_from_code(self.signal_code(packet))
+
+    def signal_code(self, packet: TelemetryPacket) -> int:
+        """Bit-flag code (SIGNAL_*) for one packet; see signals_from_code."""
+        code = SIGNAL_BASELINE
 
         # ---------------------------
         # Simple heuristics for v2
         # ---------------------------
 
         # Very low peer connectivity → mild/elevated risk
-        if packet.peer_count < 2:
-            signals.append(
-                RiskSignal(
-                    source="telemetry",
-                    level=RiskLevel.ELEVATED,
-                    score=0.6,
-                    details={"reason": "low_peer_count"},
-                )
-            )
+        if packet.peer_count < self.LOW_PEER_THRESHOLD:
+            code |= SIGNAL_LOW_PEER
 
         # Mempool spike → potential congestion / attack pattern
-        if packet.mempool_size > 20000:
-            signals.append(
-                RiskSignal(
-                    source="telemetry",
-                    level=RiskLevel.HIGH,
-                    score=0.8,
-                    details={"reason": "mempool_spike"},
-                )
-            )
+        if packet.mempool_size > self.MEMPOOL_SPIKE_THRESHOLD:
+            code |= SIGNAL_MEMPOOL_SPIKE
+
+        return code
+
+    # ---------------------------
+    # Columnar batch path
+    # ---------------------------
+
+    def derive_signal_codes(
+        self,
+        peer_count: Sequence[int],
+        mempool_size: Sequence[int],
+        height: Optional[Sequence[int]] = None,
+    ) -> Any:
+        """
+        Evaluate the heuristics for a whole batch of rows at once.
+
+        Inputs are equal-length columns (lists, `array.array` or NumPy
+        arrays). `height` is accepted for a uniform telemetry layout but
+        no current heuristic uses it.
+
+        Returns one code per row, OR-ing SIGNAL_LOW_PEER and
+        SIGNAL_MEMPOOL_SPIKE: a NumPy uint8 array when NumPy is installed,
+        otherwise an `array('B')`. The codes match `signal_code` on the
+        same rows exactly.
+        """
+        n = len(peer_count)
+        if len(mempool_size) != n or (height is not None and len(height) != n):
+            raise ValueError("telemetry columns must have equal length")
+
+        low, spike = self.LOW_PEER_THRESHOLD, self.MEMPOOL_SPIKE_THRESHOLD
+
+        if np is not None:
+            peers = np.asarray(peer_count)
+            mempool = np.asarray(mempool_size)
+            codes = (peers < low).astype(np.uint8)
+            codes |= (mempool > spike).astype(np.uint8) << 1
+            return codes
+
+        return array(
+            "B",
+            [(p < low) | ((m > spike) << 1) for p, m in zip(peer_count, mempool_size, strict=True)],
+        )
+
+
+def signals_from_code(code: int) -> List[RiskSignal]:
+    """
+    Expand a signal code into its RiskSignal list (a fresh list per call).
 
-        # No notable anomalies → baseline “normal” signal
-        if not signals:
-            signals.append(
-                RiskSignal(
-                    source="telemetry",
-                    level=RiskLevel.NORMAL,
-                    score=0.1,
-                    details={"reason": "baseline_telemetry"},
-                )
+    This is the only place the signals themselves are defined; both
+    RiskValidator.derive_signals and the batch path go through it.
+    """
+    signals: List[RiskSignal] = []
+    if code & SIGNAL_LOW_PEER:
+        signals.append(
+            RiskSignal(
+                source="telemetry",
+                level=RiskLevel.ELEVATED,
+                score=0.6,
+                details={"reason": "low_peer_count"},
             )
-
-        return signals
+        )
+    if code & SIGNAL_MEMPOOL_SPIKE:
+        signals.append(
+            RiskSignal(
+                source="telemetry",
+                level=RiskLevel.HIGH,
+                score=0.8,
+                details={"reason": "mempool_spike"},
+            )
+        )
+    # No notable anomalies → baseline “normal” signal
+    if not signals:
+        signals.append(
+            RiskSignal(
+                source="telemetry",
+                level=RiskLevel.NORMAL,
+                score=0.1,
+                details={"reason": "baseline_telemetry"},
+            )
+        )
+    return signals
@@ -0,0 +1,265 @@
+"""
+Non-blocking decision audit log for the ADN v3 gate.
+
+Every v3 response carries a deterministic `context_hash`; auditors want
+all of them on disk. Writing synchronously would put file I/O on every
+`ADNv3.evaluate` call, so AuditSink only enqueues a compact record and a
+background thread writes them out in batches:
+
+    <directory>/<prefix>-000001.jsonl.gz
+    <directory>/<prefix>-000002.jsonl.gz  ...
+
+Each line is one JSON record:
+
+    {"context_hash": ..., "decision": ..., "reason_codes": [...],
+     "request_id": ..., "ts": <unix time the decision was submitted>}
+
+Segments rotate once `segment_bytes` of uncompressed JSON have been
+written. The gzip stream is sync-flushed after every batch, so a crash
+loses at most the batch in flight; everything before it can still be
+decompressed (use `read_records`, which tolerates a torn final segment).
+
+Overflow policy when the queue holds `max_queue` records:
+
+    "block"  submit() waits for the writer (back-pressure, nothing lost)
+    "drop"   submit() returns False and increments `stats["dropped"]`
+
+submit() after close() raises RuntimeError and counts the record in
+`stats["rejected"]`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+OVERFLOW_POLICIES = ("block", "drop")
+
+# Wakes the writer for shutdown; never written.
+_CLOSE = object()
+
+
+def audit_record(response: Dict[str, Any], ts: Optional[float] = None) -> Dict[str, Any]:
+    """Compact audit record for one v3 response."""
+    return {
+        "context_hash": response.get("context_hash"),
+        "decision": response.get("decision"),
+        "reason_codes": response.get("reason_codes", []),
+        "request_id": response.get("request_id"),
+        "ts": time.time() if ts is None else ts,
+    }
+
+
+class AuditSink:
+    """
+    Bounded queue + background writer for v3 decision audit records.
+
+        with AuditSink("/var/log/adn-audit", overflow="drop") as audit:
+            gate = ADNv3(audit=audit)
+            ...
+
+    `flush()` waits until everything submitted so far is written and
+    flushed; `close()` drains the queue, closes the segment and stops the
+    writer. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        *,
+        prefix: str = "audit",
+        max_queue: int = 65_536,
+        overflow: str = "block",
+        batch_size: int = 1024,
+        segment_bytes: int = 64 * 1024 * 1024,
+        compresslevel: int = 6,
+        fsync: bool = False,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        if max_queue < 1:
+            raise ValueError("max_queue must be >= 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if segment_bytes < 1:
+            raise ValueError("segment_bytes must be >= 1")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.segment_bytes = segment_bytes
+        self.compresslevel = compresslevel
+        self.fsync = fsync
+        self.stats: Dict[str, int] = {
+            "submitted": 0,
+            "written": 0,
+            "dropped": 0,
+            "rejected": 0,
+            "batches": 0,
+            "segments": 0,
+            "errors": 0,
+        }
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(max_queue)
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self._segment_seq = self._last_segment_seq()
+        self._file: Optional[Any] = None
+        self._gzip: Optional[gzip.GzipFile] = None
+        self._segment_written = 0
+        self._thread = threading.Thread(target=self._run, name="adn-audit-writer", daemon=True)
+        self._thread.start()
+
+    # -------------------------
+    # Producer side
+    # -------------------------
+
+    def submit(self, response: Dict[str, Any]) -> bool:
+        """
+        Queue an audit record for `response`.
+
+        Returns False when the record was dropped (overflow="drop" and the
+        queue is full). Raises RuntimeError after close().
+        """
+        if self._closed:
+            with self._stats_lock:
+                self.stats["rejected"] += 1
+            raise RuntimeError("audit sink is closed")
+        record = audit_record(response)
+        if self.overflow == "block":
+            self._queue.put(record)
+        else:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                with self._stats_lock:
+                    self.stats["dropped"] += 1
+                return False
+        with self._stats_lock:
+            self.stats["submitted"] += 1
+        return True
+
+    def flush(self) -> None:
+        """Block until every record submitted so far is written and flushed."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Drain the queue, close the current segment and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def __enter__(self) -> "AuditSink":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -------------------------
+    # Writer thread
+    # -------------------------
+
+    def _run(self) -> None:
+        q = self._queue
+        while True:
+            batch: List[Any] = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _CLOSE in batch
+            records = [r for r in batch if r is not _CLOSE]
+            try:
+                if records:
+                    self._write(records)
+            except Exception:
+                # Never let an I/O error kill the writer (producers would
+                # block forever); count it and keep going.
+                with self._stats_lock:
+                    self.stats["errors"] += 1
+            finally:
+                for _ in batch:
+                    q.task_done()
+            if stop:
+                self._close_segment()
+                return
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        data = "".join(
+            json.dumps(r, sort_keys=True, separators=(",", ":")) + "\n" for r in records
+        ).encode("utf-8")
+        if self._gzip is None or self._segment_written >= self.segment_bytes:
+            self._open_segment()
+        assert self._gzip is not None and self._file is not None
+        self._gzip.write(data)
+        self._gzip.flush(zlib.Z_SYNC_FLUSH)
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._segment_written += len(data)
+        with self._stats_lock:
+            self.stats["written"] += len(records)
+            self.stats["batches"] += 1
+
+    def _open_segment(self) -> None:
+        self._close_segment()
+        self._segment_seq += 1
+        path = self.directory / f"{self.prefix}-{self._segment_seq:06d}.jsonl.gz"
+        self._file = open(path, "xb")
+        self._gzip = gzip.GzipFile(
+            filename="", mode="wb", fileobj=self._file, compresslevel=self.compresslevel, mtime=0
+        )
+        self._segment_written = 0
+        with self._stats_lock:
+            self.stats["segments"] += 1
+
+    def _close_segment(self) -> None:
+        if self._gzip is not None:
+            self._gzip.close()
+            self._gzip = None
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def _last_segment_seq(self) -> int:
+        # Continue numbering after segments from earlier runs.
+        last = 0
+        for p in self.directory.glob(f"{self.prefix}-*.jsonl.gz"):
+            try:
+                last = max(last, int(p.name[len(self.prefix) + 1 :].split(".", 1)[0]))
+            except ValueError:
+                continue
+        return last
+
+    def segments(self) -> List[Path]:
+        return sorted(self.directory.glob(f"{self.prefix}-*.jsonl.gz"))
+
+
+def read_records(path: Union[str, os.PathLike]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the records of one segment, in order.
+
+    A segment that was still open during a crash has no gzip trailer;
+    every complete line up to the last sync-flush is still returned.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    # A truncated stream decompresses as far as it goes without raising.
+    data = zlib.decompressobj(wbits=31).decompress(raw)
+    # The last element is empty for a clean segment, a partial line otherwise.
+    for line in data.split(b"\n")[:-1]:
+        yield json.loads(line)
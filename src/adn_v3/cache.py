@@ -0,0 +1,98 @@
+"""
+Bounded response cache for the ADN v3 contract gate.
+
+ADNv3.evaluate is deterministic given the parsed request and the
+NodeDefenseConfig, so identical requests (gateway retries, fan-out to
+replicas) can reuse an earlier response. Entries are keyed by a
+canonical hash of the validated request plus the config fingerprint,
+evicted least-recently-used past `maxsize`, and optionally expire after
+`ttl` seconds.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def _clone(obj: Any) -> Any:
+    # Responses are plain JSON-like trees; this is much cheaper than deepcopy.
+    if isinstance(obj, dict):
+        return {k: _clone(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_clone(v) for v in obj]
+    return obj
+
+
+class DecisionCache:
+    """
+    Thread-safe LRU/TTL cache of v3 responses.
+
+    Stored responses are private copies and every hit returns a fresh
+    copy, so callers can mutate what they get back without corrupting
+    the cache.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, response = entry
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        clone: Dict[str, Any] = _clone(response)
+        return clone
+
+    def put(self, key: bytes, response: Dict[str, Any]) -> None:
+        entry = (self._clock(), _clone(response))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -2,15 +2,283 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any, Dict
+from functools import lru_cache
+from json.encoder import c_make_encoder, encode_basestring  # type: ignore[attr-defined]
+from typing import Any, Dict, Mapping, Optional
 
+# One shared encoder: json.dumps() builds a fresh JSONEncoder on every call
+# when non-default options are passed, which is measurable on the hot path.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
-def canonical_sha256(payload: Dict[str, Any]) -> str:
+# JSONEncoder.encode() still builds a C encoder object per call; keep one.
+# markers=None skips the circular-reference bookkeeping (a cycle ends in
+# RecursionError instead of ValueError), which keeps the object stateless
+# and safe to share across threads.
+_C_ENCODER = (
+    c_make_encoder(
+        None,
+        _CANONICAL_ENCODER.default,
+        encode_basestring,
+        None,
+        ":",
+        ",",
+        True,
+        False,
+        True,
+    )
+    if c_make_encoder is not None
+    else None
+)
+
+
+def canonical_json(value: Any) -> str:
+    """
+    Canonical JSON text for `value` (the exact form hashed by canonical_sha256).
+    """
+    if _C_ENCODER is not None and isinstance(value, (dict, list, tuple)):
+        return "".join(_C_ENCODER(value, 0))
+    return _CANONICAL_ENCODER.encode(value)
+
+
+@lru_cache(maxsize=256)
+def _encoded_key(key: str) -> bytes:
+    return (_CANONICAL_ENCODER.encode(key) + ":").encode("utf-8")
+
+
+class CanonicalHasher:
+    """
+    Incremental SHA-256 over the canonical JSON encoding of one object.
+
+    Members are fed in sorted key order, either as plain values or as
+    fragments that are already canonical UTF-8 bytes (for example the
+    event list encoded during validation, or a cached config
+    fingerprint). The digest is bit-identical to canonical_sha256 over
+    the equivalent dict, without building the whole encoded payload.
+    """
+
+    __slots__ = ("_h", "_last_key")
+
+    def __init__(self) -> None:
+        self._h = hashlib.sha256(b"{")
+        self._last_key: Optional[str] = None
+
+    def _check_order(self, first: str, last: str) -> None:
+        if self._last_key is not None:
+            if first <= self._last_key:
+                raise ValueError(f"keys must be fed in sorted order: {first!r} after {self._last_key!r}")
+            self._h.update(b",")
+        self._last_key = last
+
+    def update(self, fields: Dict[str, Any]) -> None:
+        """Feed several plain members at once (encoded as one run)."""
+        if not fields:
+            return
+        self._check_order(min(fields), max(fields))
+        self._h.update(canonical_json(fields)[1:-1].encode("utf-8"))
+
+    def add(self, key: str, value: Any) -> None:
+        """Feed one plain member."""
+        if isinstance(value, str):
+            self._check_order(key, key)
+            self._h.update(_encoded_key(key) + encode_basestring(value).encode("utf-8"))
+        else:
+            self.update({key: value})
+
+    def add_encoded(self, key: str, encoded: bytes) -> None:
+        """Feed one member whose value is already canonical UTF-8 JSON."""
+        self._check_order(key, key)
+        self._h.update(_encoded_key(key))
+        self._h.update(encoded)
+
+    def hexdigest(self) -> str:
+        h = self._h.copy()
+        h.update(b"}")
+        return h.hexdigest()
+
+
+def canonical_sha256(payload: Dict[str, Any], encoded: Optional[Mapping[str, str]] = None) -> str:
     """
     Deterministic hash of a JSON-like payload.
     - stable key ordering
     - stable separators
     - UTF-8 encoding
+
+    `encoded` optionally maps extra top-level keys to values that are
+    already canonical JSON (see canonical_json). They are spliced in at
+    their sorted position, so callers can serialize a fragment once and
+    reuse it; the digest is identical to hashing the decoded value.
+    """
+    if not encoded:
+        text = canonical_json(payload)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    hasher = CanonicalHasher()
+    run: Dict[str, Any] = {}
+    for key in sorted(set(payload) | set(encoded)):
+        if key in encoded:
+            hasher.update(run)
+            run = {}
+            hasher.add_encoded(key, encoded[key].encode("utf-8"))
+        else:
+            run[key] = payload[key]
+    hasher.update(run)
+    return hasher.hexdigest()
+
+
+_INF = float("inf")
+
+
+class NonFiniteNumberError(ValueError):
+    """NaN/Infinity found where canonical_size was asked to reject it."""
+
+
+class _OverBudget(Exception):
+    pass
+
+
+class _CanonicalSizer:
+    """
+    Walks a JSON-like value and sums the UTF-8 length of its canonical
+    encoding, mirroring the stdlib encoder's rules (escaping, key
+    coercion, float/int repr, error cases) without building the text.
+    """
+
+    __slots__ = ("size", "limit", "over", "error", "reject_bad_numbers")
+
+    def __init__(self, budget: Optional[int], reject_bad_numbers: bool) -> None:
+        self.size = 0
+        self.limit = _INF if budget is None else budget
+        self.over = False
+        self.error: Optional[Exception] = None
+        self.reject_bad_numbers = reject_bad_numbers
+
+    def add(self, n: int) -> None:
+        self.size += n
+        if self.size > self.limit and not self.over:
+            self.over = True
+            if not self.reject_bad_numbers:
+                raise _OverBudget()
+
+    def fail(self, exc: Exception) -> None:
+        if self.error is None:
+            self.error = exc
+        if not self.reject_bad_numbers:
+            raise exc
+
+    def add_str(self, s: str) -> None:
+        if self.over:
+            # Past the budget only containers are walked (for bad numbers);
+            # string contents can no longer change the outcome.
+            return
+        if self.size + len(s) + 2 > self.limit:
+            self.add(len(s) + 2)
+            return
+        text = encode_basestring(s)
+        if text.isascii():
+            self.add(len(text))
+        else:
+            try:
+                self.add(len(text.encode("utf-8")))
+            except UnicodeEncodeError as exc:
+                self.fail(exc)
+
+    def add_float(self, x: float, strict: bool) -> None:
+        if x != x:
+            if strict and self.reject_bad_numbers:
+                raise NonFiniteNumberError(x)
+            self.add(3)  # NaN
+        elif x == _INF or x == -_INF:
+            if strict and self.reject_bad_numbers:
+                raise NonFiniteNumberError(x)
+            self.add(8 if x > 0 else 9)  # Infinity / -Infinity
+        else:
+            self.add(len(float.__repr__(x)))
+
+    def walk(self, x: Any, strict: bool) -> None:
+        # `strict` tracks whether NaN/Infinity count as bad numbers here:
+        # like the contract check, only dict/list chains are inspected.
+        if isinstance(x, str):
+            self.add_str(x)
+        elif x is None or x is True:
+            self.add(4)
+        elif x is False:
+            self.add(5)
+        elif isinstance(x, int):
+            try:
+                self.add(len(int.__repr__(x)))
+            except ValueError as exc:  # exceeds int max str digits
+                self.fail(exc)
+        elif isinstance(x, float):
+            self.add_float(x, strict)
+        elif isinstance(x, (list, tuple)):
+            self.add(2 + len(x) - 1 if x else 2)
+            strict = strict and isinstance(x, list)
+            for v in x:
+                self.walk(v, strict)
+        elif isinstance(x, dict):
+            self.add(2 + len(x) - 1 if x else 2)
+            coerced = False
+            for k, v in x.items():
+                if isinstance(k, str):
+                    self.add_str(k)
+                else:
+                    coerced = True
+                    self.add_key(k)
+                self.add(1)  # ':'
+                self.walk(v, strict)
+            if coerced and len(x) > 1:
+                try:
+                    sorted(x)
+                except TypeError as exc:  # sort_keys over mixed key types
+                    self.fail(exc)
+        else:
+            self.fail(TypeError(f"Object of type {type(x).__name__} is not JSON serializable"))
+
+    def add_key(self, k: Any) -> None:
+        # Non-string keys are coerced to strings by the encoder.
+        if isinstance(k, float):
+            if k != k:
+                self.add(5)
+            elif k == _INF or k == -_INF:
+                self.add(10 if k > 0 else 11)
+            else:
+                self.add(len(float.__repr__(k)) + 2)
+        elif k is True or k is None:
+            self.add(6)
+        elif k is False:
+            self.add(7)
+        elif isinstance(k, int):
+            try:
+                self.add(len(int.__repr__(k)) + 2)
+            except ValueError as exc:
+                self.fail(exc)
+        else:
+            self.fail(TypeError(f"keys must be str, int, float, bool or None, not {type(k).__name__}"))
+
+
+def canonical_size(value: Any, budget: Optional[int] = None, reject_bad_numbers: bool = False) -> int:
+    """
+    Exact byte length of canonical_json(value).encode("utf-8"), computed
+    by walking the value instead of serializing it.
+
+    With a `budget`, the walk stops as soon as the size is known to exceed
+    it and some value greater than `budget` is returned, so oversize input
+    costs time proportional to the budget rather than to the input.
+
+    With `reject_bad_numbers=True`, NaN/Infinity reachable through
+    dict/list nesting raise NonFiniteNumberError, which takes precedence
+    over every other outcome: the walk continues over containers past the
+    budget and past encoding errors to find them. Encoding errors
+    (TypeError / ValueError, as the encoder would raise) are then re-raised
+    at the end. In this mode the bail-out only skips string contents, so
+    the cost stays proportional to the number of values in the input
+    (cheap for one huge string, not for a huge container).
     """
-    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-    return hashlib.sha256(encoded).hexdigest()
+    sizer = _CanonicalSizer(budget, reject_bad_numbers)
+    try:
+        sizer.walk(value, True)
+    except _OverBudget:
+        return sizer.size
+    if sizer.error is not None:
+        raise sizer.error
+    return sizer.size
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional
 
+from .v3_hash import NonFiniteNumberError, canonical_json, canonical_size
 from .v3_reason_codes import ReasonCode
 
 
 _ALLOWED_TOP_LEVEL_KEYS = {"contract_version", "component", "request_id", "events"}
+_ALLOWED_EVENT_KEYS = {"event_type", "severity", "source", "metadata"}
+
+_INF = float("inf")
 
 
 def _contains_bad_number(x: Any) -> bool:
@@ -37,39 +41,251 @@ class ADNv3Request:
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "ADNv3Request":
-        if not isinstance(d, dict):
-            raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
+        return parse_request(d).request
+
+
+class ParsedEvent(NamedTuple):
+    """Normalized v3 event, field-compatible with adn_v2 DefenseEvent."""
+
+    event_type: str
+    severity: float
+    source: str
+    metadata: Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class ParsedRequest:
+    """
+    Result of the single-pass v3 validator.
+
+    `event_error` carries an event-level reason code (oversize, unknown
+    event key, bad event schema) that was found during the walk. It is
+    reported by the caller only after the version / component gates, so
+    the reason-code precedence matches the contract.
+
+    `events_json` holds the canonical UTF-8 encoding of the raw event
+    list (only when requested), ready to feed a CanonicalHasher.
+    """
+
+    request: ADNv3Request
+    events: List[ParsedEvent] = field(default_factory=list)
+    event_error: Optional[str] = None
+    events_json: bytes = b""
+
+
+def _parse_event(
+    e: Dict[str, Any],
+    max_metadata_bytes: Optional[int],
+    meta_size: Optional[int] = None,
+    meta_error: Optional[str] = None,
+) -> ParsedEvent:
+    # `meta_size` / `meta_error` carry the result of a metadata walk the
+    # caller already did; they are applied at the size-check step so the
+    # per-event check order is unchanged.
+
+    # Event-level unknown key rejection (fail-closed)
+    if not e.keys() <= _ALLOWED_EVENT_KEYS:
+        raise ValueError(ReasonCode.ADN_ERROR_EVENT_UNKNOWN_KEY.value)
+
+    # Minimal required schema for v3 events (strict enough to be audit-friendly)
+    event_type = e.get("event_type")
+    severity = e.get("severity")
+    source = e.get("source")
+    metadata = e.get("metadata", {})
+
+    if not isinstance(event_type, str) or not event_type.strip():
+        raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
+    if not (isinstance(severity, (int, float)) and 0.0 <= float(severity) <= 1.0):
+        raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
+    if not isinstance(source, str) or not source.strip():
+        raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
+    if metadata is None:
+        metadata = {}
+    if not isinstance(metadata, dict):
+        raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
+
+    # Oversize protection: cap metadata encoded size (deterministic)
+    if meta_error is not None:
+        raise ValueError(meta_error)
+    if max_metadata_bytes is not None:
+        if meta_size is None:
+            meta_size = _metadata_size(metadata, max_metadata_bytes)
+        if meta_size > max_metadata_bytes:
+            raise ValueError(ReasonCode.ADN_ERROR_OVERSIZE.value)
+
+    return ParsedEvent(event_type.strip(), float(severity), source.strip(), metadata)
+
+
+def _metadata_size(metadata: Dict[str, Any], max_metadata_bytes: int) -> int:
+    """
+    Canonical encoded size of `metadata`, bailing out past the budget.
+
+    NaN/Infinity raise BAD_NUMBER; values the canonical encoder cannot
+    serialize raise INVALID_REQUEST. Valid metadata within budget is
+    measured by the C encoder after one scan for bad numbers and string
+    lengths. The pure-Python `canonical_size` walker, which is slower per
+    value but can skip oversized strings, only runs when those string
+    lengths alone exceed the budget, or when the encoder fails and error
+    precedence has to be worked out.
+    """
+    if _string_bytes_floor(metadata) <= max_metadata_bytes:
+        try:
+            return len(canonical_json(metadata).encode("utf-8"))
+        except (TypeError, ValueError):
+            pass
+    try:
+        return canonical_size(metadata, budget=max_metadata_bytes, reject_bad_numbers=True)
+    except NonFiniteNumberError as exc:
+        raise ValueError(ReasonCode.ADN_ERROR_BAD_NUMBER.value) from exc
+    except (TypeError, ValueError) as exc:
+        raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value) from exc
 
-        # strict unknown key rejection
-        unknown = set(d.keys()) - _ALLOWED_TOP_LEVEL_KEYS
-        if unknown:
-            raise ValueError(ReasonCode.ADN_ERROR_UNKNOWN_KEY.value)
 
-        if _contains_bad_number(d):
+def _string_bytes_floor(x: Any) -> int:
+    # Same walk as _contains_bad_number (raising BAD_NUMBER instead of
+    # returning True), also summing the lengths of the strings it meets:
+    # a lower bound on the canonical size.
+    if isinstance(x, str):
+        return len(x)
+    if isinstance(x, float):
+        if x != x or x == _INF or x == -_INF:
             raise ValueError(ReasonCode.ADN_ERROR_BAD_NUMBER.value)
+        return 0
+    total = 0
+    if isinstance(x, dict):
+        for k, v in x.items():
+            if isinstance(k, str):
+                total += len(k)
+            if isinstance(v, str):
+                total += len(v)
+            elif isinstance(v, (dict, list, float)):
+                total += _string_bytes_floor(v)
+    elif isinstance(x, list):
+        for v in x:
+            if isinstance(v, str):
+                total += len(v)
+            elif isinstance(v, (dict, list, float)):
+                total += _string_bytes_floor(v)
+    return total
+
+
+def parse_request(
+    d: Dict[str, Any],
+    max_events: Optional[int] = None,
+    max_metadata_bytes: Optional[int] = None,
+    encode_events: bool = False,
+) -> ParsedRequest:
+    """
+    Validate and normalize a v3 request in a single traversal.
+
+    Unknown keys, NaN/Infinity, types and size caps are all checked while
+    walking the events once. Reason-code precedence is preserved:
+
+      1. not a dict / unknown top-level key
+      2. NaN or Infinity anywhere in the request
+      3. top-level schema errors (including non-dict events)
+      4. event-level errors, first failing event wins (returned in
+         `event_error`, not raised)
+
+    Errors in tiers 1-3 raise ValueError(reason_code). Once a lower-tier
+    error is found, the rest of the request is only scanned for bad
+    numbers, since nothing else can change the outcome.
+
+    With `encode_events=True`, a fully valid request also carries the
+    canonical encoding of its event list, so hashing does not
+    re-serialize it.
+    """
+    if not isinstance(d, dict):
+        raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
+
+    # strict unknown key rejection
+    if not d.keys() <= _ALLOWED_TOP_LEVEL_KEYS:
+        raise ValueError(ReasonCode.ADN_ERROR_UNKNOWN_KEY.value)
+
+    # Untrusted values; `schema_ok` below is what narrows their types.
+    contract_version: Any = d.get("contract_version", None)
+    component: Any = d.get("component", None)
+    request_id: Any = d.get("request_id", None)
+    events: Any = d.get("events", None)
+
+    if (
+        _contains_bad_number(contract_version)
+        or _contains_bad_number(component)
+        or _contains_bad_number(request_id)
+    ):
+        raise ValueError(ReasonCode.ADN_ERROR_BAD_NUMBER.value)
+
+    schema_ok = (
+        isinstance(contract_version, int)
+        and isinstance(component, str)
+        and bool(component.strip())
+        and isinstance(request_id, str)
+        and bool(request_id.strip())
+    )
+
+    if not isinstance(events, list):
+        if _contains_bad_number(events):
+            raise ValueError(ReasonCode.ADN_ERROR_BAD_NUMBER.value)
+        raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
+
+    event_error: Optional[str] = None
+    if max_events is not None and len(events) > max_events:
+        # Oversize protection: cap number of events
+        event_error = ReasonCode.ADN_ERROR_OVERSIZE.value
+
+    parsed: List[ParsedEvent] = []
+    for e in events:
+        if not isinstance(e, dict):
+            # events must be list of dicts (for now)
+            if _contains_bad_number(e):
+                raise ValueError(ReasonCode.ADN_ERROR_BAD_NUMBER.value)
+            schema_ok = False
+            continue
+
+        validate = schema_ok and event_error is None
+        metadata = e.get("metadata")
+
+        # Metadata is sized and scanned for bad numbers in the same walk;
+        # an encoding error is deferred so a later bad number still wins.
+        meta_size: Optional[int] = None
+        meta_error: Optional[str] = None
+        if validate and max_metadata_bytes is not None and isinstance(metadata, dict):
+            try:
+                meta_size = _metadata_size(metadata, max_metadata_bytes)
+            except ValueError as exc:
+                if str(exc) == ReasonCode.ADN_ERROR_BAD_NUMBER.value:
+                    raise
+                meta_error = str(exc)
+            for k, v in e.items():
+                if k != "metadata" and _contains_bad_number(v):
+                    raise ValueError(ReasonCode.ADN_ERROR_BAD_NUMBER.value)
+        else:
+            for v in e.values():
+                if _contains_bad_number(v):
+                    raise ValueError(ReasonCode.ADN_ERROR_BAD_NUMBER.value)
+
+        if validate:
+            try:
+                parsed.append(_parse_event(e, max_metadata_bytes, meta_size, meta_error))
+            except ValueError as exc:
+                event_error = str(exc) or ReasonCode.ADN_ERROR_INVALID_REQUEST.value
+
+    if not schema_ok:
+        raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
 
-        contract_version = d.get("contract_version", None)
-        component = d.get("component", None)
-        request_id = d.get("request_id", None)
-        events = d.get("events", None)
-
-        if not isinstance(contract_version, int):
-            raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-        if not isinstance(component, str) or not component.strip():
-            raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-        if not isinstance(request_id, str) or not request_id.strip():
-            raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-        if not isinstance(events, list):
-            raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-
-        # events must be list of dicts (for now)
-        for e in events:
-            if not isinstance(e, dict):
-                raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-
-        return cls(
-            contract_version=contract_version,
-            component=component.strip(),
-            request_id=request_id.strip(),
-            events=events,
-        )
+    request = ADNv3Request(
+        contract_version=contract_version,
+        component=component.strip(),
+        request_id=request_id.strip(),
+        events=events,
+    )
+    if event_error is not None:
+        return ParsedRequest(request=request, event_error=event_error)
+    if encode_events:
+        try:
+            # One C-level encode of the whole list is cheaper than one per event.
+            events_json = canonical_json(events).encode("utf-8")
+        except (TypeError, ValueError) as exc:
+            raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value) from exc
+        return ParsedRequest(request=request, events=parsed, events_json=events_json)
+    return ParsedRequest(request=request, events=parsed)
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
-import json
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Any, Dict, Iterable, List, Optional
 
 from adn_v2.models import DefenseEvent, NodeDefenseConfig, NodeDefenseState, RiskLevel, LockdownState
 from adn_v2.engine import evaluate_defense
 
-from .contracts.v3_hash import canonical_sha256
+from .contracts.v3_hash import CanonicalHasher, canonical_json, canonical_sha256
 from .contracts.v3_reason_codes import ReasonCode
-from .contracts.v3_types import ADNv3Request
+from .contracts.v3_types import ParsedRequest, parse_request
+from .audit import AuditSink
+from .cache import DecisionCache
+from .metrics import MetricsRegistry, StageTimer
+
+# NodeDefenseConfig fields hashed into every context_hash since v3.0.
+_BASE_CONFIG_FIELDS = frozenset(
+    {"lockdown_threshold", "partial_lock_threshold", "max_withdrawals_per_min", "rpc_rate_limit"}
+)
 
 
 @dataclass(frozen=True)
@@ -25,6 +32,18 @@ class ADNv3:
 
     Glass-box invariant:
     - contract payload must be deterministic (no timestamps / runtime timing)
+
+    An optional DecisionCache short-circuits repeated requests: it is
+    consulted after validation, keyed by the canonical request and the
+    config fingerprint, and skips the engine, hashing and response build.
+
+    An optional MetricsRegistry records per-stage timings (parse,
+    validation, cache, engine, hashing, response) under
+    `adn_v3.evaluate.*`; they never appear in the contract payload.
+    An optional AuditSink receives every response (errors included) for
+    the background audit log. Auditing never fails a decision: a sink
+    that has been closed is skipped, counted in its `stats["rejected"]`
+    and, with metrics attached, in `adn_v3.evaluate.audit_rejected`.
     """
 
     config: Optional[NodeDefenseConfig] = None
@@ -36,13 +55,84 @@ class ADNv3:
     MAX_EVENTS: int = 200
     MAX_METADATA_BYTES: int = 16_384  # 16KB
 
+    # Out-of-band helpers (never part of the contract payload)
+    cache: Optional[DecisionCache] = field(default=None, compare=False, repr=False)
+    metrics: Optional[MetricsRegistry] = field(default=None, compare=False, repr=False)
+    audit: Optional[AuditSink] = field(default=None, compare=False, repr=False)
+
     def evaluate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        cfg = self.config or NodeDefenseConfig()
+        if self.metrics is not None or self.audit is not None:
+            return self._evaluate_observed(request, cfg, self._encoded_config_fingerprint(cfg))
+        return self._evaluate(request, cfg, self._encoded_config_fingerprint(cfg))
+
+    def evaluate_many(self, requests: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Evaluate a batch of requests, in order.
+
+        Responses are identical to calling `evaluate` on each request; the
+        config object and its canonical fingerprint JSON are resolved once
+        per batch instead of once per request.
+        """
+        cfg = self.config or NodeDefenseConfig()
+        fingerprint = self._encoded_config_fingerprint(cfg)
+        if self.metrics is not None or self.audit is not None:
+            return [self._evaluate_observed(r, cfg, fingerprint) for r in requests]
+        return [self._evaluate(r, cfg, fingerprint) for r in requests]
+
+    def evaluate_parallel(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        chunk_size: int = 256,
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate a batch across a process pool (see adn_v3.parallel).
+
+        Output is identical to `evaluate_many`, in the same order, for any
+        worker count.
+        """
+        from .parallel import evaluate_parallel
+
+        return evaluate_parallel(self, requests, max_workers=max_workers, chunk_size=chunk_size)
+
+    def _evaluate_observed(
+        self, request: Dict[str, Any], cfg: NodeDefenseConfig, cfg_fingerprint: bytes
+    ) -> Dict[str, Any]:
+        # Slow path for gates with metrics and/or an audit sink attached.
+        timer = self.metrics.stage_timer("adn_v3.evaluate") if self.metrics is not None else None
+        response = self._evaluate(request, cfg, cfg_fingerprint, timer)
+        if self.audit is not None:
+            self._submit_audit(self.audit, response)
+        if timer is not None:
+            timer.finish(response["decision"])
+        return response
+
+    def _submit_audit(self, audit: AuditSink, response: Dict[str, Any]) -> None:
+        try:
+            audit.submit(response)
+        except RuntimeError:  # sink closed (e.g. during shutdown)
+            if self.metrics is not None:
+                self.metrics.counter("adn_v3.evaluate.audit_rejected").inc()
+
+    def _evaluate(
+        self,
+        request: Dict[str, Any],
+        cfg: NodeDefenseConfig,
+        cfg_fingerprint: bytes,
+        timer: Optional[StageTimer] = None,
+    ) -> Dict[str, Any]:
         # Deterministic contract envelope: no runtime timing inside payload
         latency_ms = 0
 
-        # Strict contract parsing (fail-closed)
+        # Strict contract parsing (fail-closed), single pass over the request
         try:
-            req = ADNv3Request.from_dict(request)
+            parsed = parse_request(
+                request,
+                max_events=self.MAX_EVENTS,
+                max_metadata_bytes=self.MAX_METADATA_BYTES,
+                encode_events=True,
+            )
         except ValueError as e:
             reason = str(e) or ReasonCode.ADN_ERROR_INVALID_REQUEST.value
             return self._error_response(
@@ -59,6 +149,11 @@ class ADNv3:
                 latency_ms=latency_ms,
             )
 
+        if timer is not None:
+            timer.lap("parse")
+
+        req = parsed.request
+
         # Version hard check
         if req.contract_version != self.CONTRACT_VERSION:
             return self._error_response(
@@ -77,19 +172,30 @@ class ADNv3:
                 latency_ms=latency_ms,
             )
 
-        # Map v3 events → v2 DefenseEvent objects (fail-closed)
-        try:
-            events: List[DefenseEvent] = self._parse_events(req.events)
-        except ValueError as e:
-            reason = str(e) or ReasonCode.ADN_ERROR_INVALID_REQUEST.value
+        # Event-level errors found during parsing (fail-closed)
+        if parsed.event_error is not None:
             return self._error_response(
                 request_id=req.request_id,
-                reason_code=reason,
-                details={"error": reason},
+                reason_code=parsed.event_error,
+                details={"error": parsed.event_error},
                 latency_ms=latency_ms,
             )
 
-        cfg = self.config or NodeDefenseConfig()
+        if timer is not None:
+            timer.lap("validation")
+
+        cache_key: Optional[bytes] = None
+        if self.cache is not None:
+            cache_key = self._cache_key(parsed, cfg_fingerprint)
+            cached = self.cache.get(cache_key)
+            if timer is not None:
+                timer.lap("cache")
+            if cached is not None:
+                return cached
+
+        # Map v3 events → v2 DefenseEvent objects
+        events: List[DefenseEvent] = [DefenseEvent(*e) for e in parsed.events]
+
         state_in = NodeDefenseState()
 
         # Existing v2 engine (authoritative behavior for now)
@@ -97,24 +203,36 @@ class ADNv3:
 
         decision = self._decision_from_state(state_out)
         reason_codes = self._reason_codes_from_state(state_out)
-
-        # Deterministic context hash (do NOT include latency_ms or timestamps)
-        context_hash = canonical_sha256(
+        if timer is not None:
+            timer.lap("engine")
+
+        # Deterministic context hash (do NOT include latency_ms or timestamps).
+        # Streamed in canonical key order; events and config fingerprint are
+        # fed as pre-encoded fragments instead of being re-serialized.
+        hasher = CanonicalHasher()
+        hasher.update(
             {
+                "actions": [self._action_to_dict(a) for a in (state_out.last_actions or [])],
                 "component": self.COMPONENT,
                 "contract_version": self.CONTRACT_VERSION,
-                "request_id": req.request_id,
-                "events": req.events,  # stable after contract parsing
-                "node_defense_config": self._config_fingerprint(cfg),
                 "decision": decision,
-                "risk_level": state_out.risk_level.value,
-                "lockdown_state": state_out.lockdown_state.value,
-                "actions": [self._action_to_dict(a) for a in (state_out.last_actions or [])],
+            }
+        )
+        hasher.add_encoded("events", parsed.events_json)  # stable after contract parsing
+        hasher.add("lockdown_state", state_out.lockdown_state.value)
+        hasher.add_encoded("node_defense_config", cfg_fingerprint)
+        hasher.update(
+            {
                 "reason_codes": reason_codes,
+                "request_id": req.request_id,
+                "risk_level": state_out.risk_level.value,
             }
         )
+        context_hash = hasher.hexdigest()
+        if timer is not None:
+            timer.lap("hashing")
 
-        return {
+        response = {
             "contract_version": self.CONTRACT_VERSION,
             "component": self.COMPONENT,
             "request_id": req.request_id,
@@ -135,67 +253,16 @@ class ADNv3:
                 "fail_closed": True,
             },
         }
+        if cache_key is not None and self.cache is not None:
+            self.cache.put(cache_key, response)
+        if timer is not None:
+            timer.lap("response")
+        return response
 
     # -------------------------
     # Parsing / mapping helpers
     # -------------------------
 
-    def _parse_events(self, raw_events: List[Dict[str, Any]]) -> List[DefenseEvent]:
-        # Oversize protection: cap number of events
-        if len(raw_events) > self.MAX_EVENTS:
-            raise ValueError(ReasonCode.ADN_ERROR_OVERSIZE.value)
-
-        events: List[DefenseEvent] = []
-        allowed_event_keys = {"event_type", "severity", "source", "metadata"}
-
-        for e in raw_events:
-            if not isinstance(e, dict):
-                raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-
-            # Event-level unknown key rejection (fail-closed)
-            unknown = set(e.keys()) - allowed_event_keys
-            if unknown:
-                raise ValueError(ReasonCode.ADN_ERROR_EVENT_UNKNOWN_KEY.value)
-
-            # Minimal required schema for v3 events (strict enough to be audit-friendly)
-            event_type = e.get("event_type")
-            severity = e.get("severity")
-            source = e.get("source")
-            metadata = e.get("metadata", {})
-
-            if not isinstance(event_type, str) or not event_type.strip():
-                raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-            if not (isinstance(severity, (int, float)) and 0.0 <= float(severity) <= 1.0):
-                raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-            if not isinstance(source, str) or not source.strip():
-                raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-            if metadata is None:
-                metadata = {}
-            if not isinstance(metadata, dict):
-                raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-
-            # Oversize protection: cap metadata encoded size (deterministic)
-            try:
-                meta_bytes = len(
-                    json.dumps(metadata, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-                )
-            except Exception:
-                raise ValueError(ReasonCode.ADN_ERROR_INVALID_REQUEST.value)
-
-            if meta_bytes > self.MAX_METADATA_BYTES:
-                raise ValueError(ReasonCode.ADN_ERROR_OVERSIZE.value)
-
-            events.append(
-                DefenseEvent(
-                    event_type=event_type.strip(),
-                    severity=float(severity),
-                    source=source.strip(),
-                    metadata=metadata,
-                )
-            )
-
-        return events
-
     @staticmethod
     def _action_to_dict(a: Any) -> Dict[str, Any]:
         # DefenseAction is a dataclass; keep it stable
@@ -232,9 +299,32 @@ class ADNv3:
     @staticmethod
     def _config_fingerprint(cfg: NodeDefenseConfig) -> Dict[str, Any]:
         try:
-            return dict(vars(cfg))
+            fingerprint = dict(vars(cfg))
         except Exception:
             return {"_": "unavailable"}
+        # Knobs added after the original four only enter the fingerprint
+        # when set, so default-config context_hash values stay stable.
+        for f in fields(NodeDefenseConfig):
+            if f.name not in _BASE_CONFIG_FIELDS and fingerprint.get(f.name, MISSING) == f.default:
+                del fingerprint[f.name]
+        if not fingerprint.get("source_weights"):
+            fingerprint.pop("source_weights", None)  # {} weighs like None
+        if fingerprint.get("scoring", "mean") == "mean":
+            fingerprint.pop("decay_half_life", None)  # only read by decay scoring
+        return fingerprint
+
+    def _cache_key(self, parsed: ParsedRequest, cfg_fingerprint: bytes) -> bytes:
+        # Everything the success response depends on, in canonical form.
+        hasher = CanonicalHasher()
+        hasher.update({"component": self.COMPONENT, "contract_version": self.CONTRACT_VERSION})
+        hasher.add_encoded("events", parsed.events_json)
+        hasher.add_encoded("node_defense_config", cfg_fingerprint)
+        hasher.add("request_id", parsed.request.request_id)
+        return hasher.hexdigest().encode("ascii")
+
+    @classmethod
+    def _encoded_config_fingerprint(cls, cfg: NodeDefenseConfig) -> bytes:
+        return canonical_json(cls._config_fingerprint(cfg)).encode("utf-8")
 
     # -------------------------
     # Error response
@@ -0,0 +1,384 @@
+"""
+Tamper-evident ledger of v3 decision hashes.
+
+`context_hash` makes each decision reproducible, but nothing links one
+decision to the next, so a deleted or reordered record goes unnoticed.
+AuditLedger appends every context_hash to a hash chain and, every
+`segment_size` entries, seals the segment with a Merkle root:
+
+    leaf_i   = SHA256(0x00 || context_hash_i)
+    chain_i  = SHA256(0x02 || chain_{i-1} || leaf_i)      chain_{-1} = 32 × 0x00
+    node     = SHA256(0x01 || left || right)              (odd node promoted)
+
+A SegmentRoot records the segment's Merkle root plus the chain value
+before and after it, so:
+
+    verify_roots(roots)                 roots link into one unbroken chain
+    verify_segment(hashes, root)        one segment, O(segment) hashing
+    verify_inclusion(hash, proof, root) one entry, O(log segment) hashing
+
+None of these need the rest of the history. Distinct prefixes for leaves,
+inner nodes and chain links keep the three hash domains separate.
+
+On disk (optional) the ledger is one append-only JSONL file with
+`{"h": context_hash}` entry lines and `{"root": {...}}` seal lines.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+GENESIS = b"\x00" * 32
+
+_LEAF = b"\x00"
+_NODE = b"\x01"
+_LINK = b"\x02"
+
+
+class LedgerError(ValueError):
+    """Raised when a ledger file fails verification or is malformed."""
+
+
+@dataclass(frozen=True)
+class SegmentRoot:
+    segment: int
+    start: int          # index of the segment's first entry
+    count: int
+    prev_chain: str     # chain value before the segment (hex)
+    chain_head: str     # chain value after its last entry (hex)
+    merkle_root: str    # hex
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class InclusionProof:
+    index: int          # global entry index
+    segment: int
+    leaf_index: int     # position inside the segment
+    size: int           # number of leaves in the segment
+    path: Tuple[str, ...]  # sibling hashes, leaf level upwards (hex)
+
+
+# -------------------------
+# Hash primitives
+# -------------------------
+
+
+def leaf_hash(context_hash: str) -> bytes:
+    return hashlib.sha256(_LEAF + context_hash.encode("utf-8")).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE + left + right).digest()
+
+
+def _link(prev: bytes, leaf: bytes) -> bytes:
+    return hashlib.sha256(_LINK + prev + leaf).digest()
+
+
+def _levels(leaves: Sequence[bytes]) -> List[List[bytes]]:
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        cur = levels[-1]
+        nxt = [_node(cur[i], cur[i + 1]) for i in range(0, len(cur) - 1, 2)]
+        if len(cur) % 2:
+            nxt.append(cur[-1])
+        levels.append(nxt)
+    return levels
+
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    return _levels(leaves)[-1][0]
+
+
+def _proof_path(leaves: Sequence[bytes], leaf_index: int) -> Tuple[str, ...]:
+    path: List[str] = []
+    idx = leaf_index
+    for level in _levels(leaves)[:-1]:
+        sibling = idx ^ 1
+        if sibling < len(level):
+            path.append(level[sibling].hex())
+        idx //= 2
+    return tuple(path)
+
+
+def verify_inclusion(context_hash: str, proof: InclusionProof, root: SegmentRoot) -> bool:
+    """Check that `context_hash` is entry `proof.index` under `root`."""
+    if proof.segment != root.segment or proof.size != root.count:
+        return False
+    if proof.index != root.start + proof.leaf_index or not 0 <= proof.leaf_index < proof.size:
+        return False
+    h = leaf_hash(context_hash)
+    idx, n = proof.leaf_index, proof.size
+    path = iter(proof.path)
+    try:
+        while n > 1:
+            if idx ^ 1 < n:
+                sibling = bytes.fromhex(next(path))
+                h = _node(sibling, h) if idx & 1 else _node(h, sibling)
+            idx //= 2
+            n = (n + 1) // 2
+    except (StopIteration, ValueError):
+        return False
+    if next(path, None) is not None:
+        return False
+    return h.hex() == root.merkle_root
+
+
+def _segment_root(segment: int, start: int, prev_chain: bytes, leaves: Sequence[bytes]) -> SegmentRoot:
+    chain = prev_chain
+    for leaf in leaves:
+        chain = _link(chain, leaf)
+    return SegmentRoot(
+        segment=segment,
+        start=start,
+        count=len(leaves),
+        prev_chain=prev_chain.hex(),
+        chain_head=chain.hex(),
+        merkle_root=merkle_root(leaves).hex(),
+    )
+
+
+def verify_segment(context_hashes: Sequence[str], root: SegmentRoot) -> bool:
+    """Recompute one segment's chain and Merkle root and compare with `root`."""
+    if len(context_hashes) != root.count:
+        return False
+    try:
+        prev = bytes.fromhex(root.prev_chain)
+    except ValueError:
+        return False
+    expected = _segment_root(root.segment, root.start, prev, [leaf_hash(h) for h in context_hashes])
+    return expected == root
+
+
+def verify_roots(roots: Sequence[SegmentRoot]) -> bool:
+    """Check that consecutive segment roots link into one chain from GENESIS."""
+    prev_chain = GENESIS.hex()
+    start = 0
+    for i, root in enumerate(roots):
+        if root.segment != i or root.start != start or root.prev_chain != prev_chain:
+            return False
+        prev_chain = root.chain_head
+        start += root.count
+    return True
+
+
+class AuditLedger:
+    """
+    Append-only hash chain of context_hash values with per-segment Merkle
+    roots.
+
+        ledger = AuditLedger("decisions.ledger", segment_size=4096)
+        i = ledger.append_response(gate.evaluate(request))
+        ledger.seal()                       # close a partial segment
+        proof = ledger.prove(i)
+        verify_inclusion(response["context_hash"], proof, ledger.roots[proof.segment])
+
+    Leaf hashes are kept in memory (32 bytes per entry) so proofs for any
+    sealed segment can be built without rereading the file. Opening an
+    existing file replays and verifies it; a mismatch raises LedgerError
+    and a torn final line (crash mid-append) is discarded.
+    """
+
+    def __init__(
+        self, path: Optional[Union[str, os.PathLike]] = None, *, segment_size: int = 4096
+    ) -> None:
+        if segment_size < 1:
+            raise ValueError("segment_size must be >= 1")
+        self.segment_size = segment_size
+        self.path = Path(path) if path is not None else None
+        self.roots: List[SegmentRoot] = []
+
+        self._leaves = bytearray()      # 32 bytes per entry, all segments
+        self._chain = GENESIS
+        self._segment_start = 0         # first entry of the open segment
+        self._file: Optional[IO[str]] = None
+
+        if self.path is not None:
+            if self.path.exists():
+                self._load(self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._leaves) // 32
+
+    @property
+    def chain_head(self) -> str:
+        return self._chain.hex()
+
+    # -------------------------
+    # Write path
+    # -------------------------
+
+    def append(self, context_hash: str) -> int:
+        """Append one decision hash; returns its entry index."""
+        if not isinstance(context_hash, str) or not context_hash:
+            raise ValueError("context_hash must be a non-empty string")
+        index = len(self)
+        self._append_leaf(leaf_hash(context_hash))
+        if self._file is not None:
+            self._file.write('{"h":' + json.dumps(context_hash) + "}\n")
+        if len(self) - self._segment_start >= self.segment_size:
+            self.seal()
+        return index
+
+    def append_response(self, response: Dict[str, Any]) -> int:
+        return self.append(response["context_hash"])
+
+    def extend(self, context_hashes: Iterable[str]) -> None:
+        for h in context_hashes:
+            self.append(h)
+
+    def _append_leaf(self, leaf: bytes) -> None:
+        self._leaves += leaf
+        self._chain = _link(self._chain, leaf)
+
+    def seal(self) -> Optional[SegmentRoot]:
+        """Close the open segment (if non-empty) and record its root."""
+        end = len(self)
+        if end == self._segment_start:
+            return None
+        leaves = self._segment_leaves(self._segment_start, end)
+        prev = bytes.fromhex(self.roots[-1].chain_head) if self.roots else GENESIS
+        root = SegmentRoot(
+            segment=len(self.roots),
+            start=self._segment_start,
+            count=len(leaves),
+            prev_chain=prev.hex(),
+            chain_head=self._chain.hex(),
+            merkle_root=merkle_root(leaves).hex(),
+        )
+        self.roots.append(root)
+        self._segment_start = end
+        if self._file is not None:
+            self._file.write(json.dumps({"root": root.to_dict()}, sort_keys=True) + "\n")
+            self._file.flush()
+        return root
+
+    def close(self, seal: bool = True) -> None:
+        if seal:
+            self.seal()
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "AuditLedger":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -------------------------
+    # Proofs
+    # -------------------------
+
+    def segment_of(self, index: int) -> SegmentRoot:
+        """Root of the sealed segment containing entry `index`."""
+        if not 0 <= index < self._segment_start:
+            raise IndexError(f"entry {index} is not in a sealed segment")
+        lo, hi = 0, len(self.roots)
+        while lo < hi:  # roots are ordered by start
+            mid = (lo + hi) // 2
+            if self.roots[mid].start + self.roots[mid].count <= index:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self.roots[lo]
+
+    def prove(self, index: int) -> InclusionProof:
+        root = self.segment_of(index)
+        leaves = self._segment_leaves(root.start, root.start + root.count)
+        leaf_index = index - root.start
+        return InclusionProof(
+            index=index,
+            segment=root.segment,
+            leaf_index=leaf_index,
+            size=root.count,
+            path=_proof_path(leaves, leaf_index),
+        )
+
+    def _segment_leaves(self, start: int, end: int) -> List[bytes]:
+        view = bytes(self._leaves[start * 32 : end * 32])
+        return [view[i : i + 32] for i in range(0, len(view), 32)]
+
+    # -------------------------
+    # Recovery
+    # -------------------------
+
+
+    def _load(self, path: Path) -> None:
+        valid_bytes = 0
+        with open(path, "rb") as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.endswith(b"\n"):
+                    break  # torn final line from a crash mid-append; dropped below
+                stored = _parse_line(path, lineno, line)
+                if isinstance(stored, str):
+                    self._append_leaf(leaf_hash(stored))
+                elif self.seal() != stored:
+                    raise LedgerError(f"{path}:{lineno}: segment {stored.segment} root mismatch")
+                valid_bytes += len(line)
+        if path.stat().st_size != valid_bytes:
+            with open(path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+
+def _parse_line(
+    path: Union[str, os.PathLike], lineno: int, line: bytes
+) -> Union[str, SegmentRoot]:
+    # One ledger line: an entry's context_hash or a seal's root. Anything
+    # malformed is reported as LedgerError with its position.
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise TypeError("record is not an object")
+        if "h" in record:
+            context_hash = record["h"]
+            if not isinstance(context_hash, str) or not context_hash:
+                raise TypeError("entry hash is not a non-empty string")
+            return context_hash
+        if "root" in record:
+            return SegmentRoot(**record["root"])
+    except (ValueError, TypeError, KeyError) as exc:
+        raise LedgerError(f"{path}:{lineno}: corrupt record: {exc}") from exc
+    raise LedgerError(f"{path}:{lineno}: unknown record")
+
+
+def verify_file(path: Union[str, os.PathLike]) -> List[SegmentRoot]:
+    """
+    Stream-verify a ledger file segment by segment; returns its roots.
+
+    Memory is bounded by one segment. Raises LedgerError on the first
+    mismatch (altered, inserted, removed or reordered entries) or
+    malformed line. Entries
+    after the last seal line are not covered by any root and are ignored.
+    """
+    roots: List[SegmentRoot] = []
+    pending: List[str] = []
+    prev_chain, start = GENESIS.hex(), 0
+    with open(path, "rb") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.endswith(b"\n"):
+                break
+            root = _parse_line(path, lineno, line)
+            if isinstance(root, str):
+                pending.append(root)
+                continue
+            linked = (root.segment, root.start, root.prev_chain) == (len(roots), start, prev_chain)
+            if not linked or not verify_segment(pending, root):
+                raise LedgerError(f"{path}:{lineno}: segment {root.segment} failed verification")
+            roots.append(root)
+            pending = []
+            prev_chain, start = root.chain_head, start + root.count
+    return roots
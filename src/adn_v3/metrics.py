@@ -0,0 +1,224 @@
+"""
+Out-of-band instrumentation for the ADN v3 gate.
+
+The contract payload is deliberately timing-free (`meta.latency_ms` is
+always 0), so timings are recorded here instead: fixed-bucket histograms
+and counters held in a MetricsRegistry, read via `snapshot()`.
+
+Attach a registry to the gate to enable it:
+
+    metrics = MetricsRegistry()
+    gate = ADNv3(metrics=metrics)
+    ...
+    metrics.snapshot()["histograms"]["adn_v3.evaluate.engine"]["p99"]
+
+With no registry attached the gate only pays one attribute check per
+call. Histograms use fixed bucket bounds (no per-sample allocation, O(log
+buckets) per observation), so recording stays cheap and memory constant
+however many requests are measured.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from itertools import pairwise
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# Seconds; 1 µs .. 1 s in a 1-2-5 progression. Larger values land in the
+# overflow bucket.
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    1e-6, 2e-6, 5e-6,
+    1e-5, 2e-5, 5e-5,
+    1e-4, 2e-4, 5e-4,
+    1e-3, 2e-3, 5e-3,
+    1e-2, 2e-2, 5e-2,
+    0.1, 0.2, 0.5,
+    1.0,
+)
+
+
+def _quantile(
+    bounds: Sequence[float], counts: Sequence[int], total: int, largest: float, q: float
+) -> float:
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    # counts has one more slot than bounds (the overflow bucket); values
+    # there fall through to `largest`.
+    for bound, n in zip(bounds, counts, strict=False):
+        seen += n
+        if n and seen >= rank:
+            return bound
+    return largest
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+
+    `counts[i]` holds observations `<= bounds[i]` (and above the previous
+    bound); the final slot counts values above the last bound.
+    """
+
+    __slots__ = ("name", "bounds", "counts", "count", "sum", "max", "_lock")
+
+    def __init__(self, name: str, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        bounds = tuple(float(b) for b in bounds)
+        if not bounds:
+            raise ValueError("histogram needs at least one bucket bound")
+        if any(a >= b for a, b in pairwise(bounds)):
+            raise ValueError("bucket bounds must be strictly increasing")
+        self.name = name
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bucket bound below which a fraction `q` of observations lie.
+
+        Bucket resolution only; the overflow bucket reports the largest
+        observed value. Returns 0.0 for an empty histogram.
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be within [0, 1]")
+        with self._lock:
+            counts, total, largest = list(self.counts), self.count, self.max
+        return _quantile(self.bounds, counts, total, largest, q)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self.counts)
+            count, total, largest = self.count, self.sum, self.max
+        return {
+            "bounds": list(self.bounds),
+            "counts": counts,
+            "count": count,
+            "sum": total,
+            "max": largest,
+            "mean": total / count if count else 0.0,
+            "p50": _quantile(self.bounds, counts, count, largest, 0.5),
+            "p90": _quantile(self.bounds, counts, count, largest, 0.9),
+            "p99": _quantile(self.bounds, counts, count, largest, 0.99),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.sum = 0.0
+            self.max = 0.0
+
+
+class Counter:
+    __slots__ = ("name", "value", "_lock")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n: int = 1) -> None:
+        with self._lock:
+            self.value += n
+
+    def reset(self) -> None:
+        with self._lock:
+            self.value = 0
+
+
+class StageTimer:
+    """
+    Times consecutive stages of one operation.
+
+    `lap(stage)` records the time since the previous lap (or start) into
+    `<prefix>.<stage>`; `finish(outcome)` records the whole operation
+    into `<prefix>.total` and bumps the `<prefix>.outcome.<outcome>`
+    counter.
+    """
+
+    __slots__ = ("_registry", "_prefix", "_start", "_last")
+
+    def __init__(self, registry: "MetricsRegistry", prefix: str) -> None:
+        self._registry = registry
+        self._prefix = prefix
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._registry.histogram(f"{self._prefix}.{stage}").observe(now - self._last)
+        self._last = now
+
+    def finish(self, outcome: str) -> None:
+        now = time.perf_counter()
+        self._registry.histogram(f"{self._prefix}.total").observe(now - self._start)
+        self._registry.counter(f"{self._prefix}.outcome.{outcome}").inc()
+
+
+class MetricsRegistry:
+    """
+    Named histograms and counters, created on first use.
+
+    Safe to share between threads and between gates; `snapshot()` returns
+    a plain JSON-friendly dict.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, buckets: Optional[Sequence[float]] = None) -> Histogram:
+        h = self._histograms.get(name)
+        if h is None:
+            with self._lock:
+                h = self._histograms.get(name)
+                if h is None:
+                    h = self._histograms[name] = Histogram(name, buckets or self.buckets)
+        return h
+
+    def counter(self, name: str) -> Counter:
+        c = self._counters.get(name)
+        if c is None:
+            with self._lock:
+                c = self._counters.get(name)
+                if c is None:
+                    c = self._counters[name] = Counter(name)
+        return c
+
+    def stage_timer(self, prefix: str) -> StageTimer:
+        return StageTimer(self, prefix)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        return {
+            "histograms": {name: h.snapshot() for name, h in sorted(histograms.items())},
+            "counters": {name: c.value for name, c in sorted(counters.items())},
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            histograms = list(self._histograms.values())
+            counters = list(self._counters.values())
+        for h in histograms:
+            h.reset()
+        for c in counters:
+            c.reset()
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from urllib.error import HTTPError
+
+import pytest
+
+from adn_v2.async_client import AsyncADNClient, MalformedResponseError
+
+
+class _StandIn:
+    """Tiny DQSN/Sentinel stand-in: per-path delay and scripted statuses."""
+
+    def __init__(self, delays=None, statuses=None, raw=None):
+        self.delays = delays or {}
+        self.statuses = statuses or {}  # path -> list of statuses, consumed in order
+        self.raw = raw or {}  # path -> canned raw response bytes
+        self.hits = {}
+
+    async def handle(self, reader, writer):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode().split("\r\n")
+        path = lines[0].split(" ")[1]
+        length = next(
+            int(line.split(":")[1]) for line in lines if line.lower().startswith("content-length")
+        )
+        message = json.loads(await reader.readexactly(length))
+        self.hits[path] = self.hits.get(path, 0) + 1
+
+        await asyncio.sleep(self.delays.get(path, 0))
+        if path in self.raw:
+            writer.write(self.raw[path])
+            await writer.drain()
+            writer.close()
+            return
+        scripted = self.statuses.get(path)
+        status = scripted.pop(0) if scripted else 200
+        body = json.dumps({"path": path, "echo": message}).encode()
+        writer.write(
+            f"HTTP/1.1 {status} X\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+
+def test_fan_out_costs_the_slowest_target_not_the_sum():
+    async def run():
+        async with _StandIn(delays={"/dqsn": 0.3, "/sentinel": 0.3}) as srv:
+            client = AsyncADNClient(srv.url)
+            start = time.perf_counter()
+            results = await client.notify_all({"alert": "lockdown"})
+            return time.perf_counter() - start, results
+
+    elapsed, results = asyncio.run(run())
+    assert results["dqsn"] == {"path": "/dqsn", "echo": {"alert": "lockdown"}}
+    assert results["sentinel"]["path"] == "/sentinel"
+    assert elapsed < 0.55
+
+
+def test_retries_transient_status_and_isolates_failing_target():
+    async def run():
+        statuses = {"/dqsn": [503, 503], "/sentinel": [500]}
+        async with _StandIn(statuses=statuses) as srv:
+            client = AsyncADNClient(srv.url, retries=2, backoff=0.01, rng=random.Random(7))
+            return await client.notify_all({"n": 1}), srv.hits
+
+    results, hits = asyncio.run(run())
+    assert results["dqsn"]["path"] == "/dqsn"
+    assert hits["/dqsn"] == 3
+    # 500 is not retried and is reported without hiding the dqsn result.
+    assert isinstance(results["sentinel"], HTTPError)
+    assert results["sentinel"].code == 500
+    assert hits["/sentinel"] == 1
+
+
+def test_per_target_timeout():
+    async def run():
+        async with _StandIn(delays={"/sentinel": 1.0}) as srv:
+            client = AsyncADNClient(srv.url, target_timeouts={"sentinel": 0.1}, retries=0)
+            return await client.notify_all({"n": 1})
+
+    results = asyncio.run(run())
+    assert results["dqsn"]["path"] == "/dqsn"
+    assert isinstance(results["sentinel"], asyncio.TimeoutError)
+
+
+def test_timeout_after_send_is_not_retried():
+    async def run():
+        async with _StandIn(delays={"/dqsn": 0.5}) as srv:
+            client = AsyncADNClient(srv.url, timeout=0.1, retries=3, backoff=0.01)
+            with pytest.raises(asyncio.TimeoutError):
+                await client.notify_dqsn({"n": 1})
+            await asyncio.sleep(0.5)
+            return srv.hits
+
+    assert asyncio.run(run()) == {"/dqsn": 1}
+
+
+def test_chunked_and_malformed_responses():
+    chunked = (
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"7\r\n{\"ok\": \r\n5;ext=1\r\ntrue}\r\n0\r\nX-Trailer: 1\r\n\r\n"
+    )
+    bad_length = b"HTTP/1.1 200 OK\r\nContent-Length: ten\r\n\r\n{}"
+    not_json = b"HTTP/1.1 200 OK\r\nContent-Length: 4\r\n\r\nnope"
+
+    async def run():
+        raw = {"/dqsn": chunked, "/sentinel": bad_length, "/telemetry": not_json}
+        async with _StandIn(raw=raw) as srv:
+            client = AsyncADNClient(srv.url, retries=2)
+            results = await client.notify_all({"n": 1}, targets=("dqsn", "sentinel", "telemetry"))
+            return results, srv.hits
+
+    results, hits = asyncio.run(run())
+    assert results["dqsn"] == {"ok": True}
+    assert isinstance(results["sentinel"], MalformedResponseError)
+    assert isinstance(results["telemetry"], MalformedResponseError)
+    assert hits == {"/dqsn": 1, "/sentinel": 1, "/telemetry": 1}
+
+
+def test_client_can_be_reused_across_event_loops():
+    # Plain-thread server, so it outlives each asyncio.run() loop.
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+
+    def serve():
+        for _ in range(4):
+            conn, _ = listener.accept()
+            conn.recv(65536)
+            time.sleep(0.05)
+            conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+            conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    client = AsyncADNClient(f"http://127.0.0.1:{listener.getsockname()[1]}", max_in_flight=1)
+    for _ in range(2):
+        results = asyncio.run(client.notify_all({"n": 1}))
+        assert results == {"dqsn": {}, "sentinel": {}}
+    listener.close()
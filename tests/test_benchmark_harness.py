@@ -0,0 +1,34 @@
+import pytest
+
+from benchmarks import cases  # noqa: F401  (registers the benchmarks)
+from benchmarks.harness import REGISTRY, compare, load_results, run_benchmarks, write_results
+
+
+def _report(**us):
+    return {"meta": {}, "results": {k: {"ops": 1, "us_per_op": v} for k, v in us.items()}}
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = _report(a=10.0, b=10.0, c=10.0, gone=1.0)
+    current = _report(a=12.0, b=13.0, c=5.0, new=1.0)
+    rows, regressions = compare(current, baseline, tolerance=0.25)
+    assert [r.name for r in rows] == ["a", "b", "c"]
+    assert [r.name for r in regressions] == ["b"]
+    with pytest.raises(ValueError):
+        compare(current, baseline, tolerance=-1)
+
+
+def test_quick_run_is_seeded_and_round_trips_through_json(tmp_path):
+    names = ["v2.evaluate_defense[history=100]", "v3.evaluate[events=1,meta=256]"]
+    assert all(n in REGISTRY for n in names)
+    report = run_benchmarks(names, quick=True, repeat=1, seed=7)
+    assert set(report["results"]) == set(names)
+    assert report["meta"]["seed"] == 7 and report["meta"]["quick"] is True
+    for r in report["results"].values():
+        assert r["ops"] > 0 and r["us_per_op"] > 0
+
+    path = tmp_path / "bench.json"
+    write_results(report, path)
+    assert load_results(path) == report
+    _, regressions = compare(report, load_results(path), tolerance=0.0)
+    assert regressions == []
@@ -0,0 +1,58 @@
+import dataclasses
+
+import pytest
+
+from adn_v2.engine import evaluate_defense
+from adn_v2.models import (
+    EMPTY_METADATA,
+    CompactDefenseEvent,
+    DefenseAction,
+    DefenseEvent,
+    NodeDefenseState,
+    PolicyDecision,
+    RiskLevel,
+    RiskSignal,
+    TelemetryPacket,
+)
+
+
+def test_hot_path_models_are_slotted_and_still_compatible():
+    for obj in (
+        DefenseEvent("rpc_abuse", 0.5, "local"),
+        RiskSignal("telemetry", RiskLevel.NORMAL, 0.1),
+        TelemetryPacket("n", 1, 2, 3, 4.0),
+        DefenseAction("THROTTLE_RPC", "test"),
+        PolicyDecision(RiskLevel.NORMAL, 0.1, "ok"),
+    ):
+        assert not hasattr(obj, "__dict__")
+        assert dataclasses.replace(obj) == obj
+
+    # Mutable defaults stay per-instance for the classic models.
+    a, b = DefenseEvent("x", 0.1, "s"), DefenseEvent("y", 0.2, "s")
+    a.metadata["k"] = 1
+    assert b.metadata == {}
+
+
+def test_compact_events_share_empty_metadata_and_are_frozen():
+    e1 = CompactDefenseEvent("rpc_abuse", 0.9, "local")
+    e2 = CompactDefenseEvent.from_event(DefenseEvent("rpc_abuse", 0.9, "local"))
+    assert e1 == e2
+    assert e1.metadata is EMPTY_METADATA and e2.metadata is EMPTY_METADATA
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        e1.severity = 0.1  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        e1.metadata["k"] = 1  # type: ignore[index]
+
+
+def test_engine_treats_compact_and_classic_events_alike():
+    severities = [0.2, 0.9, 0.8, 0.95]
+    classic = [DefenseEvent("rpc_abuse", s, "local", {"i": i}) for i, s in enumerate(severities)]
+    compact = [CompactDefenseEvent.from_event(e) for e in classic]
+
+    s1 = evaluate_defense(classic, state=NodeDefenseState(), now=0.0)
+    s2 = evaluate_defense(compact, state=NodeDefenseState(), now=0.0)
+    assert (s1.risk_level, s1.lockdown_state, s1.last_actions) == (
+        s2.risk_level,
+        s2.lockdown_state,
+        s2.last_actions,
+    )
@@ -0,0 +1,114 @@
+import random
+
+import pytest
+
+from adn_v2 import sweep as sweep_mod
+from adn_v2.engine import evaluate_defense
+from adn_v2.eventlog import EventLogReader, EventLogWriter
+from adn_v2.models import DefenseEvent, NodeDefenseConfig, NodeDefenseState
+from adn_v2.sweep import ENTER_FULL, ENTER_PARTIAL, LIFT, config_grid, sweep
+
+
+def _stream(seed, n=400):
+    rng = random.Random(seed)
+    t = 1_700_000_000.0
+    out = []
+    for _ in range(n):
+        t += rng.choice([0.5, 1.0, 3.0, 12.0])
+        k = rng.choice([0, 0, 1, 2, 5])
+        hot = rng.random() < 0.3
+        events = [
+            DefenseEvent("rpc_abuse", rng.uniform(0.6, 1.0) if hot else rng.uniform(0.0, 0.5), "local")
+            for _ in range(k)
+        ]
+        out.append((t, events))
+    return out
+
+
+def _reference(stream, cfg, end):
+    state = NodeDefenseState()
+    counts = {ENTER_PARTIAL: 0, ENTER_FULL: 0, LIFT: 0}
+    full = partial = 0.0
+    prev_t = None
+    prev_lock = "NONE"
+    for t, events in stream:
+        if prev_t is not None:
+            if prev_lock == "FULL":
+                full += t - prev_t
+            elif prev_lock == "PARTIAL":
+                partial += t - prev_t
+        evaluate_defense(events, config=cfg, state=state, now=t)
+        for a in state.last_actions:
+            counts[a.action_type] += 1
+        prev_t, prev_lock = t, state.lockdown_state.value
+    if prev_lock == "FULL":
+        full += end - prev_t
+    elif prev_lock == "PARTIAL":
+        partial += end - prev_t
+    return counts, full, partial, prev_lock
+
+
+def _configs():
+    grid = config_grid([0.5, 0.7, 0.9], [0.2, 0.4, 0.6])
+    windowed = config_grid(
+        [0.6, 0.8], [0.3, 0.5], base=NodeDefenseConfig(max_event_age=20.0, max_active_events=16)
+    )
+    return grid + windowed
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_sweep_matches_sequential_evaluate_defense(monkeypatch, seed, vectorized):
+    if not vectorized:
+        monkeypatch.setattr(sweep_mod, "np", None)
+    elif sweep_mod.np is None:
+        pytest.skip("numpy not installed")
+
+    stream = _stream(seed)
+    end = stream[-1][0] + 10.0
+    configs = _configs()
+    results = sweep(stream, configs, end_time=end)
+
+    assert [r.config for r in results] == configs
+    for cfg, res in zip(configs, results, strict=True):
+        counts, full, partial, final = _reference(stream, cfg, end)
+        assert res.actions == counts
+        assert res.time_in_full == pytest.approx(full)
+        assert res.time_in_partial == pytest.approx(partial)
+        assert res.time_in_lockdown == pytest.approx(full + partial)
+        assert res.final_lockdown_state == final
+        assert res.transitions == sum(counts.values())
+
+
+def test_sweep_full_lockdown_holds_through_elevated():
+    cfg = NodeDefenseConfig(lockdown_threshold=0.8, partial_lock_threshold=0.5)
+    stream = [
+        (0.0, [DefenseEvent("x", 0.9, "s")]),   # FULL
+        (1.0, [DefenseEvent("x", 0.4, "s")]),   # avg 0.65: stays FULL
+        (2.0, []),                              # no-op
+        (3.0, [DefenseEvent("x", 0.0, "s")] * 4),  # avg 0.22: lift
+    ]
+    (res,) = sweep(stream, [cfg])
+    assert res.actions == {ENTER_PARTIAL: 0, ENTER_FULL: 1, LIFT: 1}
+    assert res.time_in_full == 3.0
+    assert res.time_in_partial == 0.0
+    assert res.final_lockdown_state == "NONE"
+
+
+def test_sweep_over_event_log_matches_live_stream(tmp_path):
+    # Pairs of batches share a timestamp and many batches are empty; the
+    # log must hand sweep the same calls the live run made.
+    stream = [(float(t // 2), events) for t, (_, events) in enumerate(_stream(5))]
+    configs = _configs() + [NodeDefenseConfig(scoring="decay", decay_half_life=20.0)]
+    with EventLogWriter(tmp_path / "log.adnlog") as log:
+        for ts, events in stream:
+            log.append_batch(ts, events)
+    with EventLogReader(tmp_path / "log.adnlog") as reader:
+        from_log = sweep(reader.iter_batches(), configs)
+    assert from_log == sweep(stream, configs)
+
+
+def test_sweep_empty_inputs():
+    assert sweep([], []) == []
+    (res,) = sweep([], [NodeDefenseConfig()])
+    assert res.transitions == 0 and res.time_in_lockdown == 0.0
@@ -0,0 +1,52 @@
+import pytest
+
+from adn_v3 import ADNv3
+from adn_v3.contracts.v3_reason_codes import ReasonCode
+from adn_v3.contracts.v3_types import ADNv3Request, parse_request
+
+
+def _req(events, **overrides):
+    base = {"contract_version": 3, "component": "adn", "request_id": "fused", "events": events}
+    base.update(overrides)
+    return base
+
+
+GOOD = {"event_type": "rpc_abuse", "severity": 0.4, "source": "local", "metadata": {"k": 1}}
+
+
+@pytest.mark.parametrize(
+    "request_body, expected",
+    [
+        # bad number in a later event beats an unknown key in an earlier one
+        (_req([dict(GOOD, evil=1), dict(GOOD, metadata={"x": [float("nan")]})]), ReasonCode.ADN_ERROR_BAD_NUMBER),
+        # bad number beats a top-level schema error
+        (_req([dict(GOOD, severity=float("inf"))], contract_version="3"), ReasonCode.ADN_ERROR_BAD_NUMBER),
+        # version gate beats event-level errors
+        (_req([dict(GOOD, evil=1)], contract_version=2), ReasonCode.ADN_ERROR_SCHEMA_VERSION),
+        # a non-dict event is a top-level schema error, so it beats the version gate
+        (_req([GOOD, "oops"], contract_version=2), ReasonCode.ADN_ERROR_INVALID_REQUEST),
+        # event-count cap beats per-event errors
+        (_req([dict(GOOD, evil=1)] * 201), ReasonCode.ADN_ERROR_OVERSIZE),
+        # the first failing event decides the event-level code
+        (_req([GOOD, dict(GOOD, evil=1), dict(GOOD, severity=2.0)]), ReasonCode.ADN_ERROR_EVENT_UNKNOWN_KEY),
+        (_req([GOOD, dict(GOOD, severity=2.0), dict(GOOD, evil=1)]), ReasonCode.ADN_ERROR_INVALID_REQUEST),
+    ],
+)
+def test_fused_validator_reason_code_precedence(request_body, expected):
+    response = ADNv3().evaluate(request_body)
+
+    assert response["decision"] == "ERROR"
+    assert response["reason_codes"] == [expected.value]
+
+
+def test_parse_request_normalizes_events_once():
+    parsed = parse_request(
+        _req([dict(GOOD, event_type=" rpc_abuse ", metadata=None)]),
+        max_events=200,
+        max_metadata_bytes=16_384,
+    )
+
+    assert parsed.event_error is None
+    assert parsed.events[0].event_type == "rpc_abuse"
+    assert parsed.events[0].metadata == {}
+    assert isinstance(ADNv3Request.from_dict(_req([GOOD])), ADNv3Request)
@@ -0,0 +1,81 @@
+import pytest
+
+from adn_v3 import ADNv3
+from adn_v3.contracts.v3_hash import NonFiniteNumberError, canonical_json, canonical_size
+from adn_v3.contracts.v3_reason_codes import ReasonCode
+from adn_v3.contracts.v3_types import _metadata_size
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {},
+        {"depth": 2, "lat_ms": 900.5, "ok": True, "none": None},
+        {"quote": 'a"b\\c', "ctrl": "\n\t\x01", "unicode": "é漢字😀"},
+        {1: "int key", 2.5: [1, (2, 3)], 3: False},
+        [float("nan"), (float("inf"),)],
+        {"nested": {"list": [{"a": -0.0}, 10**40, 1e-7]}},
+    ],
+)
+def test_canonical_size_matches_encoded_length(value):
+    assert canonical_size(value) == len(canonical_json(value).encode("utf-8"))
+
+
+def test_canonical_size_bails_out_past_budget():
+    blob = {"blob": "x" * 10_000_000}
+    assert canonical_size(blob, budget=16_384) > 16_384
+
+
+def test_canonical_size_bad_numbers_win_over_budget_and_encoding_errors():
+    value = {"a": "x" * 100, "b": {1, 2}, "c": [float("nan")]}
+    with pytest.raises(NonFiniteNumberError):
+        canonical_size(value, budget=10, reject_bad_numbers=True)
+
+    with pytest.raises(TypeError):
+        canonical_size({"a": "x" * 100, "b": {1, 2}}, budget=10, reject_bad_numbers=True)
+
+
+def test_unencodable_metadata_fails_closed_as_invalid():
+    response = ADNv3().evaluate(
+        {
+            "contract_version": 3,
+            "component": "adn",
+            "request_id": "enc",
+            "events": [{"event_type": "t", "severity": 0.1, "source": "s", "metadata": {"s": {1}}}],
+        }
+    )
+    assert response["reason_codes"] == [ReasonCode.ADN_ERROR_INVALID_REQUEST.value]
+
+
+def _walker_outcome(value, budget):
+    try:
+        return canonical_size(value, budget=budget, reject_bad_numbers=True)
+    except NonFiniteNumberError:
+        return ReasonCode.ADN_ERROR_BAD_NUMBER.value
+    except (TypeError, ValueError):
+        return ReasonCode.ADN_ERROR_INVALID_REQUEST.value
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"k": "v" * 20},
+        {"k": "v" * 40},  # strings fit, encoded size does not
+        {"k": '"' * 30},  # escaping doubles the size
+        {"k": "x" * 200, "s": {1}},  # oversize and unencodable
+        {"k": "x", "s": {1}},
+        {"k": "x" * 200, "n": [float("inf")]},
+        {"n": [1, {"m": 2.5}], "t": (float("nan"),)},
+    ],
+)
+def test_metadata_size_matches_walker(value):
+    budget = 48
+    want = _walker_outcome(value, budget)
+    try:
+        got = _metadata_size(value, budget)
+    except ValueError as exc:
+        got = str(exc)
+    if isinstance(want, int) and want > budget:
+        assert isinstance(got, int) and got > budget
+    else:
+        assert got == want
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from adn_v2.engine import evaluate_defense, risk_score
+from adn_v2.models import DefenseEvent, NodeDefenseConfig, NodeDefenseState
+from adn_v2.store import state_from_dict, state_to_dict
+from adn_v2.sweep import sweep
+
+DECAY = NodeDefenseConfig(scoring="decay", decay_half_life=60.0)
+
+
+def _burst(n, severity=0.95, source="local"):
+    return [DefenseEvent("rpc_abuse", severity, source)] * n
+
+
+def test_recent_burst_outweighs_stale_calm_history():
+    calm = [(float(t), [DefenseEvent("rpc_abuse", 0.1, "local")] * 5) for t in range(0, 300, 10)]
+    cfg_mean = NodeDefenseConfig(max_event_age=3600.0)
+    mean_state, decay_state = NodeDefenseState(), NodeDefenseState()
+    for t, batch in calm + [(600.0, _burst(20))]:
+        evaluate_defense(batch, config=cfg_mean, state=mean_state, now=t)
+        evaluate_defense(batch, config=DECAY, state=decay_state, now=t)
+
+    # 150 calm events drown the burst in the plain mean…
+    assert mean_state.lockdown_state.value == "NONE"
+    # …while under decay the calm minutes have mostly faded.
+    assert decay_state.lockdown_state.value in ("PARTIAL", "FULL")
+    assert risk_score(decay_state, DECAY, 600.0) > mean_state.avg_severity
+
+
+def test_score_fades_and_lockdown_lifts_without_new_events():
+    state = evaluate_defense(_burst(10), config=DECAY, state=NodeDefenseState(), now=0.0)
+    assert state.lockdown_state.value == "FULL"
+    assert risk_score(state, DECAY, 0.0) == pytest.approx(0.95)
+
+    # Weight 10 decays below 1 after ~3.3 half-lives; then the score halves
+    # every half-life.
+    assert risk_score(state, DECAY, 600.0) == pytest.approx(0.95 * 10 * 0.5 ** 10)
+    evaluate_defense([], config=DECAY, state=state, now=600.0)
+    assert state.lockdown_state.value == "NONE"
+    assert [a.action_type for a in state.last_actions] == ["LIFT_LOCKDOWN"]
+
+    # O(1) state, independent of window contents; reading the score is pure.
+    before = (state.decay_sum, state.decay_weight, state.decay_time)
+    risk_score(state, DECAY, 10_000.0)
+    assert (state.decay_sum, state.decay_weight, state.decay_time) == before
+
+
+def test_decay_matches_brute_force_and_survives_store_round_trip():
+    rng = random.Random(11)
+    cfg = NodeDefenseConfig(
+        scoring="decay", decay_half_life=30.0, source_weights={"wallet_guard": 0.5}
+    )
+    state = NodeDefenseState()
+    seen = []
+    t = 0.0
+    for _ in range(200):
+        t += rng.random() * 5
+        batch = [
+            DefenseEvent("rpc_abuse", rng.random(), rng.choice(["local", "wallet_guard"]))
+            for _ in range(rng.randint(0, 4))
+        ]
+        evaluate_defense(batch, config=cfg, state=state, now=t)
+        seen.extend((t, e) for e in batch)
+
+    num = den = 0.0
+    for ts, e in seen:
+        w = cfg.source_weights.get(e.source, 1.0) * 0.5 ** ((t - ts) / cfg.decay_half_life)
+        num += w * e.severity
+        den += w
+    assert risk_score(state, cfg, t) == pytest.approx(num / max(den, 1.0))
+
+    restored = state_from_dict(state_to_dict(state))
+    assert risk_score(restored, cfg, t + 45.0) == risk_score(state, cfg, t + 45.0)
+
+
+def test_sweep_matches_evaluate_defense_under_decay():
+    rng = random.Random(3)
+    stream = []
+    for step in range(300):
+        n = rng.choice([0, 0, 1, 3]) if step % 50 < 40 else 8
+        stream.append((step * 2.0, [DefenseEvent("x", rng.random() ** 0.5, "local")] * n))
+
+    configs = [
+        NodeDefenseConfig(scoring="decay", decay_half_life=h, lockdown_threshold=lock)
+        for h in (10.0, 60.0)
+        for lock in (0.6, 0.8)
+    ] + [NodeDefenseConfig()]
+    for cfg, res in zip(configs, sweep(stream, configs), strict=True):
+        state = NodeDefenseState()
+        lifts = 0
+        for t, batch in stream:
+            evaluate_defense(batch, config=cfg, state=state, now=t)
+            lifts += sum(a.action_type == "LIFT_LOCKDOWN" for a in state.last_actions)
+        assert res.final_lockdown_state == state.lockdown_state.value
+        assert res.actions["LIFT_LOCKDOWN"] == lifts
+
+
+def test_rejects_unknown_scoring_settings():
+    with pytest.raises(ValueError):
+        NodeDefenseConfig(scoring="median")
+    with pytest.raises(ValueError):
+        NodeDefenseConfig(scoring="decay", decay_half_life=0.0)
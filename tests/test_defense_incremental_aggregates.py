@@ -0,0 +1,46 @@
+from adn_v2.engine import evaluate_defense
+from adn_v2.models import DefenseEvent, NodeDefenseConfig, NodeDefenseState
+
+
+def test_running_aggregates_match_full_rescan():
+    cfg = NodeDefenseConfig()
+    state = NodeDefenseState()
+
+    batches = [
+        [DefenseEvent(event_type="rpc_abuse", severity=0.3, source="local")],
+        [
+            DefenseEvent(event_type="sentinel_alert", severity=0.7, source="sentinel"),
+            DefenseEvent(event_type="dqsn_critical", severity=0.95, source="dqsn"),
+        ],
+        [DefenseEvent(event_type="rpc_abuse", severity=0.1, source="local")],
+    ]
+    for batch in batches:
+        state = evaluate_defense(batch, cfg, state)
+
+    severities = [e.severity for e in state.active_events]
+    assert state.event_count == len(severities)
+    assert state.severity_sum == sum(severities)
+    assert state.avg_severity == sum(severities) / len(severities)
+
+    mean = sum(severities) / len(severities)
+    variance = sum((s - mean) ** 2 for s in severities) / len(severities)
+    assert abs(state.severity_variance - variance) < 1e-12
+
+
+def test_prepopulated_state_seeds_aggregates():
+    events = [
+        DefenseEvent(event_type="rpc_abuse", severity=0.9, source="local"),
+        DefenseEvent(event_type="rpc_abuse", severity=0.8, source="local"),
+    ]
+    state = NodeDefenseState(active_events=list(events))
+
+    assert state.event_count == 2
+    assert state.avg_severity == (0.9 + 0.8) / 2
+
+    state = evaluate_defense(
+        [DefenseEvent(event_type="rpc_abuse", severity=0.1, source="local")],
+        NodeDefenseConfig(),
+        state,
+    )
+    assert state.event_count == 3
+    assert state.avg_severity == (0.9 + 0.8 + 0.1) / 3
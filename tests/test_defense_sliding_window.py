@@ -0,0 +1,46 @@
+from adn_v2.engine import evaluate_defense
+from adn_v2.models import DefenseEvent, LockdownState, NodeDefenseConfig, NodeDefenseState
+
+
+def _ev(severity: float) -> DefenseEvent:
+    return DefenseEvent(event_type="rpc_abuse", severity=severity, source="local")
+
+
+def test_count_bound_keeps_newest_events():
+    cfg = NodeDefenseConfig(max_active_events=3)
+    state = NodeDefenseState()
+
+    for i, sev in enumerate([0.9, 0.9, 0.1, 0.1, 0.1]):
+        state = evaluate_defense([_ev(sev)], cfg, state, now=float(i))
+
+    assert len(state.active_events) == 3
+    assert [e.severity for e in state.active_events] == [0.1, 0.1, 0.1]
+    assert state.event_count == 3
+    assert abs(state.avg_severity - 0.1) < 1e-12
+    assert state.lockdown_state is LockdownState.NONE
+
+
+def test_age_bound_expires_events_and_lifts_lockdown():
+    cfg = NodeDefenseConfig(max_event_age=60.0)
+    state = evaluate_defense([_ev(0.9), _ev(0.8)], cfg, NodeDefenseState(), now=1000.0)
+    assert state.lockdown_state is LockdownState.FULL
+
+    # Still inside the window: an empty batch changes nothing.
+    state = evaluate_defense([], cfg, state, now=1030.0)
+    assert state.lockdown_state is LockdownState.FULL
+    assert state.last_actions == []
+
+    # Past the window: events expire and the lockdown is lifted.
+    state = evaluate_defense([], cfg, state, now=1061.0)
+    assert len(state.active_events) == 0
+    assert state.event_count == 0
+    assert state.severity_sum == 0.0
+    assert state.lockdown_state is LockdownState.NONE
+    assert [a.action_type for a in state.last_actions] == ["LIFT_LOCKDOWN"]
+
+
+def test_unbounded_default_keeps_all_events():
+    state = NodeDefenseState()
+    for i in range(10):
+        state = evaluate_defense([_ev(0.2)], NodeDefenseConfig(), state, now=float(i))
+    assert len(state.active_events) == 10
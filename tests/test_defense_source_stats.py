@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from adn_v2.engine import evaluate_defense
+from adn_v2.models import DefenseEvent, NodeDefenseConfig, NodeDefenseState
+from adn_v2.store import state_from_dict, state_to_dict
+from adn_v2.sweep import sweep
+
+SOURCES = ["local", "sentinel", "dqsn", "wallet_guard"]
+TYPES = ["rpc_abuse", "withdrawal_spike", "sentinel_alert"]
+
+
+def _recount(state, attr):
+    out = {}
+    for e, t in zip(state.active_events, state.event_times, strict=True):
+        key = getattr(e, attr)
+        count, total, last = out.get(key, (0, 0.0, 0.0))
+        out[key] = (count + 1, total + e.severity, max(last, t))
+    return out
+
+
+def _as_tuples(groups):
+    return {k: (g.count, g.severity_sum, g.last_seen) for k, g in groups.items()}
+
+
+def test_group_tables_track_the_window_incrementally():
+    rng = random.Random(5)
+    cfg = NodeDefenseConfig(max_event_age=15.0, max_active_events=40)
+    state = NodeDefenseState()
+    for step in range(300):
+        events = [
+            DefenseEvent(rng.choice(TYPES), rng.random(), rng.choice(SOURCES))
+            for _ in range(rng.randint(0, 6))
+        ]
+        evaluate_defense(events, config=cfg, state=state, now=float(step))
+        for attr, table in (("source", state.source_stats), ("event_type", state.event_type_stats)):
+            expected = _recount(state, attr)
+            got = _as_tuples(table)
+            assert got.keys() == expected.keys()
+            for k in expected:
+                assert got[k][0] == expected[k][0]
+                assert got[k][1] == pytest.approx(expected[k][1])
+                assert got[k][2] == expected[k][2]
+    assert sum(g.count for g in state.source_stats.values()) == len(state.active_events)
+
+
+def test_top_sources_and_prebuilt_state():
+    events = [
+        DefenseEvent("rpc_abuse", 0.9, "wallet_guard"),
+        DefenseEvent("rpc_abuse", 0.8, "wallet_guard"),
+        DefenseEvent("sentinel_alert", 0.95, "sentinel"),
+        DefenseEvent("withdrawal_spike", 0.1, "local"),
+    ]
+    state = NodeDefenseState()
+    evaluate_defense(events, state=state, now=10.0)
+    assert [s for s, _ in state.top_sources(2)] == ["wallet_guard", "sentinel"]
+    assert [s for s, _ in state.top_sources(1, by="avg_severity")] == ["sentinel"]
+    assert state.top_event_types(1)[0][0] == "rpc_abuse"
+    assert state.source_stats["wallet_guard"].avg_severity == pytest.approx(0.85)
+
+    # States built from an event list get matching tables.
+    prebuilt = NodeDefenseState(active_events=list(events), event_times=[10.0] * 4)
+    assert _as_tuples(prebuilt.source_stats) == _as_tuples(state.source_stats)
+
+    restored = state_from_dict(state_to_dict(state))
+    assert _as_tuples(restored.source_stats) == _as_tuples(state.source_stats)
+    assert _as_tuples(restored.event_type_stats) == _as_tuples(state.event_type_stats)
+
+
+def test_source_weights_damp_a_noisy_source():
+    noisy = [DefenseEvent("rpc_abuse", 0.95, "wallet_guard")] * 8 + [
+        DefenseEvent("sentinel_alert", 0.2, "sentinel")
+    ] * 2
+    plain = evaluate_defense(noisy, state=NodeDefenseState(), now=0.0)
+    assert plain.lockdown_state.value == "FULL"
+
+    cfg = NodeDefenseConfig(source_weights={"wallet_guard": 0.1})
+    weighted = evaluate_defense(noisy, config=cfg, state=NodeDefenseState(), now=0.0)
+    # (0.1*8*0.95 + 2*0.2) / (0.1*8 + 2) = 0.414
+    assert weighted.lockdown_state.value == "NONE"
+    assert weighted.avg_severity == plain.avg_severity  # raw mean unchanged
+
+    stream = [(0.0, noisy), (1.0, [DefenseEvent("x", 0.9, "sentinel")] * 6)]
+    configs = [NodeDefenseConfig(), cfg]
+    results = sweep(stream, configs)
+    for c, res in zip(configs, results, strict=True):
+        state = NodeDefenseState()
+        for t, batch in stream:
+            evaluate_defense(batch, config=c, state=state, now=t)
+        assert res.final_lockdown_state == state.lockdown_state.value
@@ -0,0 +1,116 @@
+import pytest
+
+from adn_v2 import eventlog
+from adn_v2.engine import evaluate_defense
+from adn_v2.eventlog import EventLogError, EventLogReader, EventLogWriter, replay
+from adn_v2.models import DefenseEvent, NodeDefenseConfig, NodeDefenseState
+from adn_v2.store import state_to_dict
+
+CFG = NodeDefenseConfig(max_event_age=30.0, max_active_events=64)
+
+
+def _batches(n):
+    out = []
+    for i in range(n):
+        events = [
+            DefenseEvent(
+                ["rpc_abuse", "withdrawal_spike", "sentinel_alert"][(i + j) % 3],
+                ((i * 3 + j) % 11) / 10,
+                ["local", "dqsn"][j % 2],
+                {"seq": i, "note": "é"} if j == 0 else {},
+            )
+            for j in range(1 + i % 4)
+        ]
+        out.append((1_700_000_000.0 + i, events))
+    return out
+
+
+def test_round_trip_and_replay_matches_live_run(tmp_path):
+    path = tmp_path / "incident.adnlog"
+    batches = _batches(120)
+    live = NodeDefenseState()
+    transitions = []
+    with EventLogWriter(path) as log:
+        for ts, events in batches:
+            log.append_batch(ts, events)
+            evaluate_defense(events, config=CFG, state=live, now=ts)
+
+    with EventLogReader(path) as reader:
+        flat = [e for _, events in batches for e in events]
+        assert len(reader) == len(flat)
+        assert sorted(reader.strings) == ["dqsn", "local", "rpc_abuse", "sentinel_alert", "withdrawal_spike"]
+
+        decoded = [e for _, evs in reader.iter_batches(with_metadata=True) for e in evs]
+        assert [(e.event_type, e.severity, e.source, dict(e.metadata)) for e in decoded] == [
+            (e.event_type, e.severity, e.source, e.metadata) for e in flat
+        ]
+
+        state = replay(reader, CFG, on_actions=lambda ts, acts: transitions.append(ts))
+    # Replay skips metadata decoding; everything else must match exactly.
+    got, want = state_to_dict(state), state_to_dict(live)
+    assert [row[:3] for row in got.pop("active_events")] == [
+        row[:3] for row in want.pop("active_events")
+    ]
+    assert got == want
+    assert transitions
+
+
+def _live_and_replayed(path, batches, config=None):
+    config = config or NodeDefenseConfig()
+    live_state, live = NodeDefenseState(), []
+    with EventLogWriter(path) as log:
+        for ts, events in batches:
+            log.append_batch(ts, events)
+            evaluate_defense(events, config=config, state=live_state, now=ts)
+            live.extend((ts, a.action_type) for a in live_state.last_actions)
+    replayed = []
+    with EventLogReader(path) as reader:
+        state = replay(reader, config, on_actions=lambda ts, acts: replayed.extend((ts, a.action_type) for a in acts))
+    return live, replayed, live_state, state
+
+
+def test_batches_sharing_a_timestamp_replay_separately(tmp_path):
+    batches = [
+        (1.0, [DefenseEvent("rpc_abuse", 0.95, "local")] * 3),
+        (1.0, [DefenseEvent("rpc_abuse", 0.1, "local")] * 30),
+    ]
+    live, replayed, _, _ = _live_and_replayed(tmp_path / "log.adnlog", batches)
+    assert live == [(1.0, "ENTER_FULL_LOCKDOWN"), (1.0, "LIFT_LOCKDOWN")]
+    assert replayed == live
+
+
+def test_large_batch_is_never_split(tmp_path, monkeypatch):
+    # Force the batch across read-chunk edges too.
+    monkeypatch.setattr(eventlog, "_CHUNK_RECORDS", 3)
+    events = [DefenseEvent("rpc_abuse", 0.95, "local")] * 6 + [DefenseEvent("rpc_abuse", 0.1, "local")] * 2
+    path = tmp_path / "log.adnlog"
+    live, replayed, live_state, state = _live_and_replayed(path, [(1.0, events), (2.0, events[-1:])])
+    assert live_state.lockdown_state.value == "PARTIAL"
+    assert replayed == live
+    assert state.lockdown_state == live_state.lockdown_state
+    with EventLogReader(path) as reader:
+        assert [(ts, len(evs)) for ts, evs in reader.iter_batches()] == [(1.0, 8), (2.0, 1)]
+        # Interned strings are shared objects across events.
+        first, second = next(reader.iter_batches())[1][:2]
+        assert first.source is second.source
+
+
+def test_empty_batches_are_recorded(tmp_path):
+    decay = NodeDefenseConfig(scoring="decay", decay_half_life=10.0)
+    batches = [(0.0, [DefenseEvent("rpc_abuse", 0.95, "local")] * 10), (300.0, []), (301.0, [])]
+    path = tmp_path / "log.adnlog"
+    live, replayed, _, _ = _live_and_replayed(path, batches, decay)
+    assert live == [(0.0, "ENTER_FULL_LOCKDOWN"), (300.0, "LIFT_LOCKDOWN")]
+    assert replayed == live
+    with EventLogReader(path) as reader:
+        assert [(ts, len(evs)) for ts, evs in reader.iter_batches()] == [(0.0, 10), (300.0, 0), (301.0, 0)]
+
+
+def test_rejects_truncated_file(tmp_path):
+    path = tmp_path / "log.adnlog"
+    with EventLogWriter(path) as log:
+        log.append_batch(1.0, [DefenseEvent("a", 0.1, "s")])
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    with pytest.raises(EventLogError):
+        EventLogReader(path)
@@ -0,0 +1,58 @@
+import threading
+
+from adn_v2.engine import ADNEngine
+from adn_v2.fleet import FleetEngine
+from adn_v2.models import RiskLevel
+
+
+def _sample(i):
+    return {"height": i, "peer_count": i % 4, "mempool_size": 25_000 if i % 5 == 0 else 10}
+
+
+def test_fleet_matches_one_engine_per_node():
+    fleet = FleetEngine(shards=4)
+    engines = {f"node-{n}": ADNEngine(node_id=f"node-{n}") for n in range(6)}
+
+    for i in range(60):
+        node_id = f"node-{i % 6}"
+        got = fleet.process_raw_telemetry(node_id, _sample(i))
+        want = engines[node_id].process_raw_telemetry(_sample(i))
+        assert got == want
+
+    assert len(fleet) == 6
+    for node_id, engine in engines.items():
+        assert fleet.state(node_id) == engine.state
+    assert fleet.state("never-seen") is None
+    assert "node-0" in fleet and "never-seen" not in fleet
+
+
+def test_concurrent_updates_across_shards():
+    fleet = FleetEngine(shards=8)
+
+    def worker(t):
+        for i in range(200):
+            fleet.process_raw_telemetry(f"n{(t * 200 + i) % 500}", {"peer_count": 1})
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(fleet) == 500
+    assert sorted(fleet.node_ids()) == sorted(f"n{i}" for i in range(500))
+    assert all(fleet.state(n).last_decision.level is RiskLevel.ELEVATED for n in fleet.node_ids())
+    assert fleet.forget("n0") and not fleet.forget("n0")
+
+
+def test_memory_stats_reports_per_node_cost():
+    fleet = FleetEngine()
+    assert fleet.memory_stats()["bytes_per_node"] == 0.0
+    fleet.process_batch((f"node-{i}", {"peer_count": 8}) for i in range(1000))
+
+    stats = fleet.memory_stats()
+    assert stats["nodes"] == 1000
+    assert stats["total_bytes"] == (
+        stats["table_bytes"] + stats["key_bytes"] + stats["record_bytes"] + stats["decision_bytes"]
+    )
+    assert 0 < stats["bytes_per_node"] < 1000
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from adn_v2.engine import ADNEngine
+from adn_v2.http_server import ADNHTTPServer
+from adn_v2.server import ADNServer
+
+
+def _request(method, path, payload=None, close=False):
+    body = b"" if payload is None else json.dumps(payload).encode()
+    head = f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+    if close:
+        head += "Connection: close\r\n"
+    return head.encode() + b"\r\n" + body
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = dict(line.split(": ", 1) for line in lines[1:] if line)
+    body = await reader.readexactly(int(headers["Content-Length"]))
+    return status, headers, json.loads(body)
+
+
+def _v3_request(rid):
+    return {
+        "contract_version": 3,
+        "component": "adn",
+        "request_id": rid,
+        "events": [{"event_type": "rpc_abuse", "severity": 0.9, "source": "local"}],
+    }
+
+
+def test_keep_alive_pipelining_preserves_order():
+    async def run():
+        server = ADNServer(ADNEngine(node_id="http-node"))
+        async with ADNHTTPServer(server, port=0) as http:
+            reader, writer = await asyncio.open_connection("127.0.0.1", http.port)
+            # Three requests in one write, answered in order on one connection.
+            writer.write(
+                _request("POST", "/telemetry", {"type": "telemetry", "data": {"peer_count": 1}})
+                + _request("POST", "/evaluate", _v3_request("pipe-1"))
+                + _request("GET", "/health")
+            )
+            await writer.drain()
+            replies = [await _read_response(reader) for _ in range(3)]
+
+            writer.write(_request("GET", "/nope", close=True))
+            await writer.drain()
+            missing = await _read_response(reader)
+            assert await reader.read() == b""
+            writer.close()
+            return replies, missing
+
+    replies, missing = asyncio.run(run())
+
+    (s1, h1, telemetry), (s2, _, evaluated), (s3, _, health) = replies
+    assert (s1, s2, s3) == (200, 200, 200)
+    assert h1["Connection"] == "keep-alive"
+    assert telemetry["node_id"] == "http-node"
+    assert telemetry["reason"] == "low_peer_count"
+    assert evaluated["request_id"] == "pipe-1"
+    assert evaluated["decision"] == "BLOCK"
+    assert health["last_decision"]["level"] == "elevated"
+    assert missing[0] == 404
+    assert missing[1]["Connection"] == "close"
+
+
+def test_pipelined_telemetry_reaches_engine_in_request_order():
+    applied = []
+
+    async def run():
+        server = ADNServer(ADNEngine(node_id="n"))
+        real = server.handle_telemetry
+
+        def record(payload):
+            applied.append(payload["seq"])
+            return real({"peer_count": 8})
+
+        server.handle_telemetry = record
+        pool = ThreadPoolExecutor(max_workers=4)
+        async with ADNHTTPServer(server, port=0, executor=pool) as http:
+            handler = http._routes[("POST", "/telemetry")]
+
+            def slow_first(body):
+                # Earlier requests take longer before reaching the engine;
+                # run concurrently they would apply in reverse order.
+                time.sleep(0.02 * (5 - json.loads(body)["seq"]))
+                return handler(body)
+
+            http._routes[("POST", "/telemetry")] = slow_first
+            reader, writer = await asyncio.open_connection("127.0.0.1", http.port)
+            writer.write(b"".join(_request("POST", "/telemetry", {"seq": i}) for i in range(5)))
+            await writer.drain()
+            replies = [await _read_response(reader) for _ in range(5)]
+            writer.close()
+        pool.shutdown()
+        return replies
+
+    replies = asyncio.run(run())
+    assert [status for status, _, _ in replies] == [200] * 5
+    assert applied == [0, 1, 2, 3, 4]
+
+
+def test_evaluate_matches_direct_gate_and_bad_json_is_400():
+    async def run():
+        server = ADNServer(ADNEngine(node_id="n"))
+        async with ADNHTTPServer(server, port=0) as http:
+            reader, writer = await asyncio.open_connection("127.0.0.1", http.port)
+            writer.write(_request("POST", "/evaluate", _v3_request("same")))
+            writer.write(b"POST /evaluate HTTP/1.1\r\nContent-Length: 3\r\n\r\n{x}")
+            await writer.drain()
+            ok = await _read_response(reader)
+            bad = await _read_response(reader)
+            writer.close()
+            return server, ok, bad
+
+    server, ok, bad = asyncio.run(run())
+    assert ok[2] == server.gate.evaluate(_v3_request("same"))
+    assert bad[0] == 400
+
+
+def test_full_executor_queue_returns_503():
+    release = threading.Event()
+
+    def blocking_evaluate(payload):
+        release.wait(5)
+        return {"ok": True}
+
+    async def run():
+        server = ADNServer(ADNEngine(node_id="n"))
+        server.handle_evaluate = blocking_evaluate
+        pool = ThreadPoolExecutor(max_workers=1)
+        http = ADNHTTPServer(server, port=0, executor=pool, max_inflight=1)
+        async with http:
+            r1, w1 = await asyncio.open_connection("127.0.0.1", http.port)
+            w1.write(_request("POST", "/evaluate", {}))
+            await w1.drain()
+            while http._inflight == 0:
+                await asyncio.sleep(0.01)
+
+            r2, w2 = await asyncio.open_connection("127.0.0.1", http.port)
+            w2.write(_request("POST", "/evaluate", {}))
+            await w2.drain()
+            busy = await _read_response(r2)
+
+            release.set()
+            first = await _read_response(r1)
+            w1.close()
+            w2.close()
+        pool.shutdown()
+        return busy, first, http.stats
+
+    busy, first, stats = asyncio.run(run())
+    assert busy[0] == 503
+    assert busy[1]["Retry-After"] == "1"
+    assert first[0] == 200 and first[2] == {"ok": True}
+    assert stats["rejected"] == 1
@@ -0,0 +1,138 @@
+import asyncio
+import http.client
+import socket
+import threading
+import time
+from urllib.error import HTTPError
+
+import pytest
+
+from adn_v2.client import PooledADNClient
+from adn_v2.engine import ADNEngine
+from adn_v2.http_server import ADNHTTPServer
+from adn_v2.server import ADNServer
+
+
+class _BackgroundServer:
+    """Run an ADNHTTPServer on its own loop in a daemon thread."""
+
+    def __init__(self, **kwargs):
+        self.http = ADNHTTPServer(ADNServer(ADNEngine(node_id="pool-node")), port=0, **kwargs)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.http.start(), self.loop).result(5)
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self.http.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(5)
+        self.loop.close()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.http.port}"
+
+
+def test_calls_reuse_one_connection():
+    with _BackgroundServer() as srv, PooledADNClient(srv.url, pool_size=2) as client:
+        levels = [client.send_telemetry({"peer_count": p}).level for p in (8, 1, 8)]
+        assert levels == ["normal", "elevated", "normal"]
+        assert srv.http.stats["connections"] == 1
+        assert srv.http.stats["requests"] == 3
+
+
+def test_batching_coalesces_samples_into_one_post():
+    with _BackgroundServer() as srv, PooledADNClient(srv.url, batch_size=3) as client:
+        assert client.queue_telemetry({"peer_count": 1}) == []
+        assert client.queue_telemetry({"mempool_size": 50_000}) == []
+        decisions = client.queue_telemetry({"peer_count": 8})
+        assert [d.reason for d in decisions] == ["low_peer_count", "mempool_spike", "baseline_telemetry"]
+
+        client.queue_telemetry({"peer_count": 0})
+        assert [d.reason for d in client.flush()] == ["low_peer_count"]
+        assert client.flush() == []
+        assert srv.http.stats["requests"] == 2
+
+
+def test_stale_keep_alive_connection_is_retried():
+    with _BackgroundServer(idle_timeout=0.05) as srv, PooledADNClient(srv.url) as client:
+        client.send_telemetry({"peer_count": 8})
+        time.sleep(0.3)  # server drops the idle connection
+        assert client.send_telemetry({"peer_count": 1}).reason == "low_peer_count"
+        assert srv.http.stats["connections"] == 2
+
+
+def test_post_is_not_retried_once_sent():
+    # Reads one request per connection, then hangs up without answering.
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    seen = []
+
+    def serve():
+        for _ in range(2):
+            conn, _ = listener.accept()
+            seen.append(conn.recv(65536))
+            conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    client = PooledADNClient(f"http://127.0.0.1:{listener.getsockname()[1]}")
+    with pytest.raises(http.client.RemoteDisconnected):
+        client.send_telemetry({"peer_count": 1})
+    time.sleep(0.1)
+    assert len(seen) == 1
+    listener.close()
+
+
+def test_unsent_batch_stays_buffered_up_to_the_cap():
+    with socket.socket() as s:  # a port with nothing listening
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    client = PooledADNClient(f"http://127.0.0.1:{port}", batch_size=2, max_buffered=3, timeout=1.0)
+    assert client.queue_telemetry({"peer_count": 1}) == []
+    with pytest.raises(OSError):
+        client.queue_telemetry({"peer_count": 2})
+    with pytest.raises(OSError):
+        client.flush()
+    assert client._batch == [{"peer_count": 1}, {"peer_count": 2}]
+    with pytest.raises(OSError):
+        client.queue_telemetry({"peer_count": 3})
+    with pytest.raises(OSError):
+        client.queue_telemetry({"peer_count": 4})
+    assert client._batch == [{"peer_count": 2}, {"peer_count": 3}, {"peer_count": 4}]
+    assert client.dropped_samples == 1
+
+
+def test_batch_is_not_resent_after_it_went_out():
+    # Answers every request on its connection with a 400.
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    seen = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            seen.append(conn.recv(65536))
+            conn.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    client = PooledADNClient(f"http://127.0.0.1:{listener.getsockname()[1]}", batch_size=2)
+    client.queue_telemetry({"peer_count": 1})
+    with pytest.raises(HTTPError):
+        client.queue_telemetry({"peer_count": 2})
+    assert client._batch == []
+    assert client.queue_telemetry({"peer_count": 3}) == []
+    with pytest.raises(HTTPError):
+        client.flush()
+    assert client.flush() == []
+    listener.close()
+    assert len(seen) == 2 and b'"peer_count": 1' not in seen[1]
@@ -0,0 +1,80 @@
+import pytest
+
+from adn_v2.engine import evaluate_defense
+from adn_v2.models import DefenseEvent, NodeDefenseConfig, NodeDefenseState
+from adn_v2.ratelimit import RpcRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_token_bucket_refills_at_the_configured_rate():
+    clock = FakeClock()
+    limiter = RpcRateLimiter(NodeDefenseConfig(rpc_rate_limit=120), burst_seconds=5, clock=clock)
+    # 120/min = 2 tokens/s, bucket of 10.
+    assert [limiter.allow("a") for _ in range(11)] == [True] * 10 + [False]
+    assert limiter.allow("b")  # buckets are per client
+    assert limiter.retry_after("a") == pytest.approx(0.5)
+
+    clock.t = 1.0
+    assert [limiter.allow("a") for _ in range(3)] == [True, True, False]
+    clock.t = 100.0
+    assert sum(limiter.allow("a") for _ in range(20)) == 10  # capped at capacity
+
+
+def test_policy_follows_lockdown_state():
+    clock = FakeClock()
+    config = NodeDefenseConfig(rpc_rate_limit=600)
+    limiter = RpcRateLimiter(config, burst_seconds=1, clock=clock)
+    state = NodeDefenseState()
+    assert limiter.rate_per_minute == 600
+    assert sum(limiter.allow("a") for _ in range(20)) == 10
+
+    evaluate_defense([DefenseEvent("rpc_abuse", 0.7, "local")], config=config, state=state, now=0.0)
+    assert limiter.update(state)["notes"] == ["PARTIAL_LOCKDOWN"]
+    assert limiter.rate_per_minute == 100
+    clock.t = 60.0
+    # Old buckets are clamped to the new, smaller capacity on refill.
+    assert sum(limiter.allow("a") for _ in range(20)) == 1
+
+    evaluate_defense([DefenseEvent("rpc_abuse", 0.99, "local")] * 5, config=config, state=state, now=1.0)
+    limiter.update(state)
+    clock.t = 120.0
+    assert not limiter.allow("a") and not limiter.allow("new")
+    assert limiter.retry_after("a") is None
+
+    evaluate_defense([], config=NodeDefenseConfig(max_event_age=1.0), state=state, now=10.0)
+    limiter.update(state)
+    assert limiter.policy["notes"] == ["NORMAL"] and limiter.allow("a")
+
+
+def test_lru_bounds_client_table():
+    clock = FakeClock()
+    limiter = RpcRateLimiter(NodeDefenseConfig(rpc_rate_limit=60), max_clients=3, burst_seconds=1, clock=clock)
+    for c in "abc":
+        assert limiter.allow(c)
+    assert not limiter.allow("a")  # "a" becomes most recently used
+    assert limiter.allow("d")  # evicts "b"
+    assert len(limiter) == 3
+    assert not limiter.allow("a") and not limiter.allow("c") and not limiter.allow("d")
+    assert limiter.allow("b")  # evicted, so it returns with a fresh bucket
+
+    limiter.reset()
+    assert len(limiter) == 0
+    with pytest.raises(ValueError):
+        RpcRateLimiter(max_clients=0)
+
+
+def test_rejects_non_positive_cost():
+    limiter = RpcRateLimiter(NodeDefenseConfig(rpc_rate_limit=60), burst_seconds=1, clock=FakeClock())
+    for cost in (0, -5, float("nan")):
+        with pytest.raises(ValueError):
+            limiter.allow("a", cost=cost)
+        with pytest.raises(ValueError):
+            limiter.retry_after("a", cost=cost)
+    assert limiter.allow("a") and not limiter.allow("a")
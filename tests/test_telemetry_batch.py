@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from adn_v2.engine import ADNEngine
+from adn_v2.fleet import FleetEngine
+from adn_v2.server import ADNServer
+from adn_v2.telemetry import TelemetryAdapter
+
+
+def _raws(seed, n=200):
+    rng = random.Random(seed)
+    raws = []
+    for i in range(n):
+        raw = {
+            "height": 1_000 + i,
+            "mempool_size": rng.choice([0, 20_000, 20_001, rng.randint(0, 50_000)]),
+            "peer_count": rng.randint(0, 5),
+            "timestamp": 1_700_000_000.0 + i,
+        }
+        if i % 7 == 0:
+            raw["region"] = "eu"
+        raws.append(raw)
+    return raws
+
+
+def test_batch_rows_match_from_raw():
+    adapter = TelemetryAdapter()
+    raws = _raws(1) + [{"peer_count": "3"}]
+    batch = adapter.from_raw_batch("node-a", raws, now=42.0)
+
+    assert len(batch) == len(raws)
+    assert batch.node_ids == ["node-a"]
+    assert sorted(batch.extras) == [i for i in range(200) if i % 7 == 0]
+    for i, raw in enumerate(raws):
+        expected = adapter.from_raw("node-a", raw)
+        if "timestamp" not in raw:
+            expected.timestamp = 42.0
+        assert batch.packet(i) == expected
+
+
+def test_engine_batch_matches_per_packet_pipeline():
+    raws = _raws(2)
+    scalar = ADNEngine(node_id="n")
+    batched = ADNEngine(node_id="n")
+
+    expected = [scalar.process_raw_telemetry(r) for r in raws]
+    assert batched.process_raw_batch(raws) == expected
+    assert batched.state == scalar.state
+
+
+def test_fleet_routes_batch_rows_by_node():
+    raws = _raws(3, n=60)
+    samples = [(f"node-{i % 3}", r) for i, r in enumerate(raws)]
+    batch = TelemetryAdapter().from_node_samples(samples)
+    assert batch.node_ids == ["node-0", "node-1", "node-2"]
+
+    fleet, reference = FleetEngine(), FleetEngine()
+    assert fleet.process_telemetry_batch(batch) == reference.process_batch(samples)
+    for node_id in batch.node_ids:
+        assert fleet.state(node_id) == reference.state(node_id)
+
+
+def test_server_batch_uses_columnar_path_and_matches_per_sample():
+    raws = _raws(9, n=50)
+    per_sample = ADNServer(ADNEngine(node_id="srv"))
+    expected = [per_sample.handle_telemetry(r) for r in raws]
+
+    server = ADNServer(ADNEngine(node_id="srv"))
+
+    def no_scalar(raw):
+        raise AssertionError("batch endpoint must not fall back to per-sample processing")
+
+    server.engine.process_raw_telemetry = no_scalar
+    assert server.handle_telemetry_batch(raws) == expected
+
+
+def test_out_of_range_integers_are_rejected_before_processing():
+    server = ADNServer(ADNEngine(node_id="srv"))
+    raws = [{"peer_count": 1}, {"mempool_size": 2**63}]
+    with pytest.raises(ValueError, match="row 1"):
+        server.handle_telemetry_batch(raws)
+    assert server.engine.state.last_decision is None
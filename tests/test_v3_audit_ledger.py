@@ -0,0 +1,107 @@
+import hashlib
+import json
+from dataclasses import replace
+
+import pytest
+
+from adn_v3 import ADNv3
+from adn_v3.ledger import (
+    AuditLedger,
+    LedgerError,
+    verify_file,
+    verify_inclusion,
+    verify_roots,
+    verify_segment,
+)
+
+
+def _hashes(n):
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(n)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 8, 13])
+def test_inclusion_proofs_for_every_position(size):
+    ledger = AuditLedger(segment_size=size)
+    hashes = _hashes(size * 2 + 1)
+    ledger.extend(hashes)
+    ledger.seal()
+    assert verify_roots(ledger.roots)
+    assert [r.count for r in ledger.roots] == [size, size, 1]
+
+    for i, h in enumerate(hashes):
+        proof = ledger.prove(i)
+        root = ledger.roots[proof.segment]
+        assert len(proof.path) <= max(1, size).bit_length()
+        assert verify_inclusion(h, proof, root)
+        assert not verify_inclusion(hashes[i - 1] if i else "x", proof, root)
+
+
+def test_tampering_is_detected():
+    ledger = AuditLedger(segment_size=4)
+    hashes = _hashes(8)
+    ledger.extend(hashes)
+    seg0, seg1 = ledger.roots
+    assert verify_segment(hashes[4:], seg1)
+
+    assert not verify_segment(hashes[4:7], seg1)                        # removed
+    assert not verify_segment(hashes[4:6] + hashes[7:5:-1], seg1)       # reordered
+    assert not verify_segment(hashes[4:7] + ["00" * 32], seg1)          # altered
+    assert not verify_roots([seg1])                                     # segment dropped
+    assert not verify_roots([seg0, replace(seg1, prev_chain="ab" * 32)])
+
+    proof = ledger.prove(5)
+    assert not verify_inclusion(hashes[5], replace(proof, path=proof.path[:-1]), seg1)
+    with pytest.raises(IndexError):
+        AuditLedger().prove(0)
+
+
+def test_file_round_trip_verification_and_torn_tail(tmp_path):
+    path = tmp_path / "decisions.ledger"
+    gate = ADNv3()
+    requests = [
+        {
+            "contract_version": 3,
+            "component": "adn",
+            "request_id": f"r{i}",
+            "events": [{"event_type": "rpc_abuse", "severity": i / 20, "source": "local"}],
+        }
+        for i in range(20)
+    ]
+    with AuditLedger(path, segment_size=8) as ledger:
+        for r in requests:
+            ledger.append_response(gate.evaluate(r))
+        head = ledger.chain_head
+    assert [r.count for r in verify_file(path)] == [8, 8, 4]
+
+    with open(path, "a") as f:
+        f.write('{"h": "torn')
+    reopened = AuditLedger(path, segment_size=8)
+    assert len(reopened) == 20 and reopened.chain_head == head
+    reopened.append("ff" * 32)
+    reopened.close()
+    assert [r.count for r in verify_file(path)] == [8, 8, 4, 1]
+
+    lines = path.read_text().splitlines()
+    lines[3] = json.dumps({"h": "00" * 32})
+    path.write_text("\n".join(lines) + "\n")
+    with pytest.raises(LedgerError):
+        verify_file(path)
+    with pytest.raises(LedgerError):
+        AuditLedger(path)
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    ['{"h": garbage}', '{"h": 5}', '{"h": ""}', "[1, 2]", '{"root": {"segment": 0}}', '{"root": 7}'],
+)
+def test_corrupt_middle_line_raises_ledger_error(tmp_path, corrupt):
+    path = tmp_path / "decisions.ledger"
+    with AuditLedger(path, segment_size=4) as ledger:
+        ledger.extend(_hashes(10))
+    lines = path.read_text().splitlines()
+    lines[5] = corrupt
+    path.write_text("\n".join(lines) + "\n")
+    with pytest.raises(LedgerError, match=r":6: "):
+        verify_file(path)
+    with pytest.raises(LedgerError, match=r":6: "):
+        AuditLedger(path)
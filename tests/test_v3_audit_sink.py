@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from adn_v3 import ADNv3
+from adn_v3.audit import AuditSink, read_records
+from adn_v3.metrics import MetricsRegistry
+
+
+def _req(request_id, severity=0.9):
+    return {
+        "contract_version": 3,
+        "component": "adn",
+        "request_id": request_id,
+        "events": [{"event_type": "rpc_abuse", "severity": severity, "source": "local"}],
+    }
+
+
+def _all_records(sink):
+    return [r for seg in sink.segments() for r in read_records(seg)]
+
+
+def test_every_decision_is_audited_in_order_with_rotation(tmp_path):
+    with AuditSink(tmp_path, batch_size=8, segment_bytes=1024) as sink:
+        gate = ADNv3(audit=sink)
+        requests = [_req(f"r{i}", severity=(i % 10) / 10) for i in range(200)] + [{"bad": 1}]
+        responses = gate.evaluate_many(requests)
+        assert responses == ADNv3().evaluate_many(requests)  # payload untouched
+        sink.flush()
+        # Readable while the segment is still open (sync-flushed, no trailer).
+        assert len(_all_records(sink)) == 201
+
+    records = _all_records(sink)
+    assert [r["context_hash"] for r in records] == [r["context_hash"] for r in responses]
+    assert records[-1]["decision"] == "ERROR"
+    assert len(sink.segments()) > 1
+    assert sink.stats["written"] == sink.stats["submitted"] == 201
+    with pytest.raises(RuntimeError):
+        sink.submit(responses[0])
+
+    # A new sink continues segment numbering instead of overwriting.
+    with AuditSink(tmp_path) as again:
+        again.submit(responses[0])
+    assert len(_all_records(again)) == 202
+
+
+def test_drop_policy_counts_overflow(tmp_path):
+    sink = AuditSink(tmp_path, max_queue=4, overflow="drop")
+    gate = ADNv3()
+    response = gate.evaluate(_req("x"))
+
+    # Stall the writer so the queue fills up.
+    gate_open = threading.Event()
+    real_write = sink._write
+    sink._write = lambda records: (gate_open.wait(5), real_write(records))
+
+    accepted = [sink.submit(response) for _ in range(20)]
+    gate_open.set()
+    sink.close()
+
+    assert accepted.count(False) == sink.stats["dropped"] > 0
+    assert sink.stats["written"] == accepted.count(True)
+    assert len(_all_records(sink)) == accepted.count(True)
+
+
+def test_parallel_results_are_audited_by_the_caller(tmp_path):
+    with AuditSink(tmp_path) as sink:
+        gate = ADNv3(audit=sink)
+        requests = [_req(f"p{i}") for i in range(6)]
+        responses = gate.evaluate_parallel(requests, max_workers=2, chunk_size=2)
+    assert [r["request_id"] for r in _all_records(sink)] == [r["request_id"] for r in responses]
+
+
+def test_rejects_unknown_overflow_policy(tmp_path):
+    with pytest.raises(ValueError):
+        AuditSink(tmp_path, overflow="spill")
+
+
+def test_closed_sink_does_not_fail_decisions(tmp_path):
+    sink = AuditSink(tmp_path)
+    sink.close()
+    metrics = MetricsRegistry()
+    gate = ADNv3(audit=sink, metrics=metrics)
+
+    assert gate.evaluate(_req("late")) == ADNv3().evaluate(_req("late"))
+    assert gate.evaluate_many([_req("a"), {"bad": 1}]) == ADNv3().evaluate_many([_req("a"), {"bad": 1}])
+    assert sink.stats["rejected"] == 3
+    assert metrics.snapshot()["counters"]["adn_v3.evaluate.audit_rejected"] == 3
+    assert ADNv3(audit=sink).evaluate(_req("no-metrics"))["decision"] != "ERROR"
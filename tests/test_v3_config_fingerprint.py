@@ -0,0 +1,55 @@
+from adn_v2.models import NodeDefenseConfig
+from adn_v3 import ADNv3
+
+REQUEST = {
+    "contract_version": 3,
+    "component": "adn",
+    "request_id": "pin-1",
+    "events": [
+        {"event_type": "REORG_WARNING", "severity": 0.6, "source": "dqsn", "metadata": {"depth": 2}},
+        {"event_type": "rpc_abuse", "severity": 0.9, "source": "local"},
+    ],
+}
+
+# context_hash of REQUEST under the default config, as produced by v3.0.
+BASELINE_CONTEXT_HASH = "96929a89cc36bac57806a5c799b1ec639b55582766fac5ac0000d8e943858ed1"
+
+
+def test_default_config_context_hash_is_pinned():
+    assert ADNv3().evaluate(REQUEST)["context_hash"] == BASELINE_CONTEXT_HASH
+    assert ADNv3(config=NodeDefenseConfig()).evaluate(REQUEST)["context_hash"] == BASELINE_CONTEXT_HASH
+
+
+def test_window_bounds_enter_fingerprint_only_when_set():
+    assert "max_event_age" not in ADNv3._config_fingerprint(NodeDefenseConfig())
+
+    cfg = NodeDefenseConfig(max_event_age=60.0, max_active_events=100)
+    fingerprint = ADNv3._config_fingerprint(cfg)
+    assert fingerprint["max_event_age"] == 60.0 and fingerprint["max_active_events"] == 100
+    assert ADNv3(config=cfg).evaluate(REQUEST)["context_hash"] != BASELINE_CONTEXT_HASH
+
+
+def test_source_weights_enter_fingerprint_only_when_non_empty():
+    for weights in (None, {}):
+        cfg = NodeDefenseConfig(source_weights=weights)
+        assert "source_weights" not in ADNv3._config_fingerprint(cfg)
+        assert ADNv3(config=cfg).evaluate(REQUEST)["context_hash"] == BASELINE_CONTEXT_HASH
+
+    cfg = NodeDefenseConfig(source_weights={"dqsn": 0.5})
+    assert ADNv3._config_fingerprint(cfg)["source_weights"] == {"dqsn": 0.5}
+    assert ADNv3(config=cfg).evaluate(REQUEST)["context_hash"] != BASELINE_CONTEXT_HASH
+
+
+def test_decay_settings_enter_fingerprint_only_under_decay_scoring():
+    for cfg in (NodeDefenseConfig(scoring="mean"), NodeDefenseConfig(decay_half_life=10.0)):
+        fingerprint = ADNv3._config_fingerprint(cfg)
+        assert "scoring" not in fingerprint and "decay_half_life" not in fingerprint
+        assert ADNv3(config=cfg).evaluate(REQUEST)["context_hash"] == BASELINE_CONTEXT_HASH
+
+    decay = ADNv3._config_fingerprint(NodeDefenseConfig(scoring="decay"))
+    assert decay["scoring"] == "decay" and "decay_half_life" not in decay
+    hashes = {
+        ADNv3(config=NodeDefenseConfig(scoring="decay", decay_half_life=h)).evaluate(REQUEST)["context_hash"]
+        for h in (60.0, 10.0)
+    }
+    assert len(hashes) == 2 and BASELINE_CONTEXT_HASH not in hashes
@@ -0,0 +1,63 @@
+import json
+
+from adn_v2.models import NodeDefenseConfig
+from adn_v3 import ADNv3
+from adn_v3.cache import DecisionCache
+
+
+def _req(request_id="cache", severity=0.9):
+    return {
+        "contract_version": 3,
+        "component": "adn",
+        "request_id": request_id,
+        "events": [{"event_type": "rpc_abuse", "severity": severity, "source": "local"}],
+    }
+
+
+def test_cached_responses_are_identical_and_isolated():
+    cache = DecisionCache(maxsize=8)
+    v3 = ADNv3(config=NodeDefenseConfig(), cache=cache)
+    uncached = ADNv3(config=NodeDefenseConfig()).evaluate(_req())
+
+    first = v3.evaluate(_req())
+    first["actions"].clear()  # caller mutation must not leak into the cache
+    second = v3.evaluate(_req())
+
+    assert json.dumps(second, sort_keys=True) == json.dumps(uncached, sort_keys=True)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_key_covers_config_and_request():
+    cache = DecisionCache()
+    strict = ADNv3(config=NodeDefenseConfig(lockdown_threshold=0.5), cache=cache)
+    lax = ADNv3(config=NodeDefenseConfig(lockdown_threshold=0.95), cache=cache)
+
+    assert strict.evaluate(_req())["decision"] == "BLOCK"
+    assert lax.evaluate(_req())["decision"] == "WARN"
+    assert strict.evaluate(_req(severity=0.1))["decision"] == "ALLOW"
+    assert cache.stats()["hits"] == 0
+
+
+def test_lru_eviction_and_ttl_expiry():
+    now = [0.0]
+    cache = DecisionCache(maxsize=2, ttl=10.0, clock=lambda: now[0])
+    v3 = ADNv3(cache=cache)
+
+    for rid in ("a", "b", "c"):
+        v3.evaluate(_req(rid))
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+    now[0] = 11.0
+    v3.evaluate(_req("c"))
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 0
+
+
+def test_errors_are_not_cached():
+    cache = DecisionCache()
+    v3 = ADNv3(cache=cache)
+    v3.evaluate(dict(_req(), contract_version=2))
+    assert len(cache) == 0
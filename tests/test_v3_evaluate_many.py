@@ -0,0 +1,42 @@
+import json
+
+from adn_v2.models import NodeDefenseConfig
+from adn_v3 import ADNv3
+from adn_v3.contracts.v3_hash import canonical_json, canonical_sha256
+
+
+def _requests():
+    ok = {
+        "contract_version": 3,
+        "component": "adn",
+        "request_id": "batch-ok",
+        "events": [
+            {"event_type": "rpc_abuse", "severity": 0.8, "source": "local", "metadata": {"n": 1}},
+            {"event_type": "sentinel_alert", "severity": 0.9, "source": "sentinel"},
+        ],
+    }
+    calm = {"contract_version": 3, "component": "adn", "request_id": "batch-calm", "events": []}
+    bad_version = dict(calm, contract_version=2)
+    unknown_key = dict(calm, extra=True)
+    return [ok, calm, bad_version, unknown_key, "not-a-dict"]
+
+
+def test_evaluate_many_matches_evaluate_loop():
+    v3 = ADNv3(config=NodeDefenseConfig(lockdown_threshold=0.7))
+    reqs = _requests()
+
+    looped = [v3.evaluate(r) for r in reqs]
+    batched = v3.evaluate_many(reqs)
+
+    assert json.dumps(batched, sort_keys=True) == json.dumps(looped, sort_keys=True)
+    assert [r["decision"] for r in batched] == ["BLOCK", "ALLOW", "ERROR", "ERROR", "ERROR"]
+
+
+def test_pre_encoded_fragments_hash_identically():
+    fingerprint = {"lockdown_threshold": 0.75, "notes": "ünïcode", "max_event_age": None}
+    payload = {"zeta": [1, 2], "alpha": "a", "node": {"x": 1}}
+
+    expected = canonical_sha256(dict(payload, fingerprint=fingerprint))
+    spliced = canonical_sha256(payload, encoded={"fingerprint": canonical_json(fingerprint)})
+
+    assert spliced == expected
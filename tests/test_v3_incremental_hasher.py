@@ -0,0 +1,58 @@
+import pytest
+
+from adn_v2.models import NodeDefenseConfig
+from adn_v3 import ADNv3
+from adn_v3.contracts.v3_hash import CanonicalHasher, canonical_json, canonical_sha256
+
+
+def test_incremental_hasher_matches_one_shot_hash():
+    events = [{"event_type": "rpc_abuse", "severity": 0.5, "source": "local", "metadata": {"k": "ü"}}]
+    payload = {"a": 1, "events": events, "m": "x", "z": {"nested": [1, 2]}}
+
+    hasher = CanonicalHasher()
+    hasher.update({"a": 1})
+    hasher.add_encoded("events", canonical_json(events).encode("utf-8"))
+    hasher.add("m", "x")
+    hasher.add("z", {"nested": [1, 2]})
+
+    assert hasher.hexdigest() == canonical_sha256(payload)
+
+
+def test_incremental_hasher_rejects_out_of_order_keys():
+    hasher = CanonicalHasher()
+    hasher.add("b", 1)
+    with pytest.raises(ValueError):
+        hasher.add("a", 2)
+
+
+def test_context_hash_is_bit_identical_to_full_payload_hash():
+    cfg = NodeDefenseConfig()
+    events = [
+        {"event_type": " rpc_abuse ", "severity": 0.9, "source": "local", "metadata": {"n": 1}},
+        {"event_type": "sentinel_alert", "severity": 1, "source": "sentinel"},
+    ]
+    resp = ADNv3(config=cfg).evaluate(
+        {"contract_version": 3, "component": "adn", "request_id": "hash", "events": events}
+    )
+
+    expected = canonical_sha256(
+        {
+            "component": "adn",
+            "contract_version": 3,
+            "request_id": "hash",
+            "events": events,
+            # Default config: only the original four knobs are fingerprinted.
+            "node_defense_config": {
+                "lockdown_threshold": cfg.lockdown_threshold,
+                "partial_lock_threshold": cfg.partial_lock_threshold,
+                "max_withdrawals_per_min": cfg.max_withdrawals_per_min,
+                "rpc_rate_limit": cfg.rpc_rate_limit,
+            },
+            "decision": resp["decision"],
+            "risk_level": resp["risk"]["level"],
+            "lockdown_state": resp["risk"]["lockdown_state"],
+            "actions": resp["actions"],
+            "reason_codes": resp["reason_codes"],
+        }
+    )
+    assert resp["context_hash"] == expected
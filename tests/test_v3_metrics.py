@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from adn_v3 import ADNv3
+from adn_v3.cache import DecisionCache
+from adn_v3.metrics import Histogram, MetricsRegistry
+
+
+def _req(request_id="m", severity=0.9):
+    return {
+        "contract_version": 3,
+        "component": "adn",
+        "request_id": request_id,
+        "events": [{"event_type": "rpc_abuse", "severity": severity, "source": "local"}],
+    }
+
+
+def test_histogram_buckets_and_quantiles():
+    h = Histogram("x", bounds=(1.0, 2.0, 5.0))
+    for v in (0.5, 1.0, 1.5, 3.0, 9.0):
+        h.observe(v)
+    snap = h.snapshot()
+    assert snap["counts"] == [2, 1, 1, 1]
+    assert snap["count"] == 5 and snap["sum"] == pytest.approx(15.0) and snap["max"] == 9.0
+    assert h.quantile(0.4) == 1.0
+    assert h.quantile(0.6) == 2.0
+    assert h.quantile(1.0) == 9.0  # overflow bucket reports the max
+    with pytest.raises(ValueError):
+        Histogram("bad", bounds=(2.0, 1.0))
+
+
+def test_stage_timings_recorded_without_touching_payload():
+    metrics = MetricsRegistry()
+    timed = ADNv3(metrics=metrics)
+    plain = ADNv3()
+
+    requests = [_req(f"r{i}", severity=i / 10) for i in range(10)] + [{"bogus": 1}]
+    assert json.dumps(timed.evaluate_many(requests), sort_keys=True) == json.dumps(
+        plain.evaluate_many(requests), sort_keys=True
+    )
+    assert timed == plain  # metrics are out-of-band
+
+    snap = metrics.snapshot()
+    hist = snap["histograms"]
+    for stage in ("parse", "validation", "engine", "hashing", "response"):
+        assert hist[f"adn_v3.evaluate.{stage}"]["count"] == 10
+    assert hist["adn_v3.evaluate.total"]["count"] == 11
+    assert "adn_v3.evaluate.cache" not in hist
+    assert snap["counters"]["adn_v3.evaluate.outcome.ERROR"] == 1
+    assert sum(snap["counters"].values()) == 11
+    json.dumps(snap)
+
+    metrics.reset()
+    assert metrics.snapshot()["histograms"]["adn_v3.evaluate.total"]["count"] == 0
+
+
+def test_cache_stage_and_parallel_strip_metrics():
+    metrics = MetricsRegistry()
+    gate = ADNv3(metrics=metrics, cache=DecisionCache())
+    gate.evaluate(_req())
+    gate.evaluate(_req())
+    hist = metrics.snapshot()["histograms"]
+    assert hist["adn_v3.evaluate.cache"]["count"] == 2
+    assert hist["adn_v3.evaluate.engine"]["count"] == 1
+
+    requests = [_req(f"p{i}") for i in range(6)]
+    assert gate.evaluate_parallel(requests, max_workers=2, chunk_size=2) == ADNv3().evaluate_many(requests)
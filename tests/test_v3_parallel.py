@@ -0,0 +1,48 @@
+import json
+
+from adn_v2.models import NodeDefenseConfig
+from adn_v3 import ADNv3
+from adn_v3.audit import AuditSink
+from adn_v3.metrics import MetricsRegistry
+from adn_v3.parallel import evaluate_parallel
+
+
+def _requests(n):
+    return [
+        {
+            "contract_version": 3,
+            "component": "adn",
+            "request_id": f"par-{i}",
+            "events": [
+                {"event_type": "rpc_abuse", "severity": (i % 10) / 10, "source": "local"},
+            ],
+        }
+        for i in range(n)
+    ] + [{"contract_version": 2, "component": "adn", "request_id": "bad", "events": []}]
+
+
+def test_parallel_matches_serial_for_any_worker_count():
+    v3 = ADNv3(config=NodeDefenseConfig())
+    reqs = _requests(23)
+    expected = json.dumps(v3.evaluate_many(reqs), sort_keys=True)
+
+    for workers in (1, 2, 3):
+        got = evaluate_parallel(v3, reqs, max_workers=workers, chunk_size=4)
+        assert json.dumps(got, sort_keys=True) == expected
+
+
+def test_small_batch_runs_in_process():
+    v3 = ADNv3()
+    reqs = _requests(3)
+    assert v3.evaluate_parallel(reqs, max_workers=4) == v3.evaluate_many(reqs)
+
+
+def test_closed_audit_sink_does_not_lose_parallel_results(tmp_path):
+    sink = AuditSink(tmp_path)
+    sink.close()
+    metrics = MetricsRegistry()
+    reqs = _requests(10)
+    got = ADNv3(audit=sink, metrics=metrics).evaluate_parallel(reqs, max_workers=2, chunk_size=3)
+    assert got == ADNv3().evaluate_many(reqs)
+    assert sink.stats["rejected"] == len(reqs)
+    assert metrics.snapshot()["counters"]["adn_v3.evaluate.audit_rejected"] == len(reqs)
@@ -0,0 +1,68 @@
+import random
+from array import array
+
+import pytest
+
+from adn_v2 import validator as validator_mod
+from adn_v2.engine import ADNEngine
+from adn_v2.models import RiskLevel, RiskSignal, TelemetryPacket
+from adn_v2.validator import RiskValidator, signals_from_code
+
+
+def _columns(seed, n=500):
+    rng = random.Random(seed)
+    # Bias towards the thresholds so boundary rows are well covered.
+    peers = [rng.choice([0, 1, 2, 3, rng.randint(0, 50)]) for _ in range(n)]
+    mempool = [rng.choice([19_999, 20_000, 20_001, rng.randint(0, 60_000)]) for _ in range(n)]
+    heights = list(range(n))
+    return peers, mempool, heights
+
+
+def _assert_matches_scalar(v, codes, peers, mempool, heights):
+    assert len(codes) == len(peers)
+    for code, p, m, h in zip(codes, peers, mempool, heights, strict=True):
+        packet = TelemetryPacket(node_id="n", height=h, mempool_size=m, peer_count=p, timestamp=0.0)
+        assert signals_from_code(int(code)) == v.derive_signals(packet)
+
+
+def test_array_fallback_matches_scalar(monkeypatch):
+    monkeypatch.setattr(validator_mod, "np", None)
+    v = RiskValidator()
+    peers, mempool, heights = _columns(1)
+    codes = v.derive_signal_codes(array("q", peers), array("q", mempool), heights)
+    assert isinstance(codes, array) and codes.typecode == "B"
+    _assert_matches_scalar(v, codes, peers, mempool, heights)
+
+
+def test_numpy_path_matches_scalar():
+    np = pytest.importorskip("numpy")
+    v = RiskValidator()
+    peers, mempool, heights = _columns(2)
+    codes = v.derive_signal_codes(np.array(peers), np.array(mempool), np.array(heights))
+    assert codes.dtype == np.uint8
+    _assert_matches_scalar(v, codes, peers, mempool, heights)
+
+
+def test_mismatched_columns_rejected():
+    with pytest.raises(ValueError):
+        RiskValidator().derive_signal_codes([1, 2], [3])
+
+
+class _HeightValidator(RiskValidator):
+    """Overrides only the scalar heuristic, with a signal codes can't express."""
+
+    def derive_signals(self, packet):
+        if packet.height % 2:
+            return [RiskSignal("telemetry", RiskLevel.CRITICAL, 0.99, {"reason": "odd_height"})]
+        return super().derive_signals(packet)
+
+
+def test_batch_path_falls_back_to_overridden_derive_signals():
+    raws = [{"height": h, "peer_count": h % 4, "mempool_size": h * 5000} for h in range(12)]
+    batch_engine, scalar_engine = ADNEngine(node_id="n"), ADNEngine(node_id="n")
+    batch_engine.validator = scalar_engine.validator = _HeightValidator()
+
+    batched = batch_engine.process_raw_batch(raws)
+    scalar = [scalar_engine.process_raw_telemetry(r) for r in raws]
+    assert batched == scalar
+    assert [d.reason for d in batched].count("odd_height") == 6